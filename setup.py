@@ -57,7 +57,13 @@ setup(
     ],
     description=metadata['__description__'],
     download_url=metadata['__download_url__'],
-    extras_require={'dev': dev_packages, 'develop': dev_packages, 'development': dev_packages},
+    extras_require={
+        'async': ['aiohttp'],
+        'http2': ['httpx[http2]>=0.26'],
+        'dev': dev_packages,
+        'develop': dev_packages,
+        'development': dev_packages,
+    },
     include_package_data=True,
     install_requires=[
         'arrow',
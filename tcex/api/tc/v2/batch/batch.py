@@ -3,19 +3,22 @@
 import gzip
 import json
 import os
-import sys
+import pathlib
+import shutil
 import threading
 import time
 import traceback
-from collections import deque
-from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple, Union
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Iterator, List, Optional, Tuple, Union
 
 # third-party
 from requests import Response, Session
 
 # first-party
+from tcex.api.tc.v2.batch.batch_chunk import BatchChunk
+from tcex.api.tc.v2.batch.batch_journal import BatchJournal
 from tcex.api.tc.v2.batch.batch_submit import BatchSubmit
-from tcex.api.tc.v2.batch.batch_writer import BatchWriter, GroupType, IndicatorType
+from tcex.api.tc.v2.batch.batch_writer import BatchWriter
 from tcex.exit.error_codes import handle_error
 
 if TYPE_CHECKING:
@@ -77,8 +80,13 @@ class Batch(BatchWriter, BatchSubmit):
         self._batch_max_chunk = 5_000
         self._batch_max_size = 75_000_000  # max size in bytes
         self._file_merge_mode = None
-        self._file_threads = []
+        self._file_max_workers = 4
+        self._file_pool = None
+        self._file_semaphore = None
         self._hash_collision_mode = None
+        self._journal = None
+        self._journal_complete = False
+        self._max_in_flight = 1
         self._submit_thread = None
 
         # global overrides on batch/file errors
@@ -92,10 +100,13 @@ class Batch(BatchWriter, BatchSubmit):
         self._saved_indicators = None  # indicates indicators shelf file was provided
         self.enable_saved_file = False
 
+        # checkpoint journal for resuming submit_all after a restart
+        self.enable_journal = False
+        self.journal_fqfn = os.path.join(
+            self.inputs.model.tc_temp_path, f'''batch-journal-{owner.replace('/', ':')}.jsonl'''
+        )
+
         # default properties
-        self._batch_data_count = None
-        self._poll_interval = None
-        self._poll_interval_times = []
         self._poll_timeout = 3600
 
         # batch debug/replay variables
@@ -107,271 +118,280 @@ class Batch(BatchWriter, BatchSubmit):
         self.debug_path_files = os.path.join(self.debug_path, 'batch_files')
         self.debug_path_xids = os.path.join(self.debug_path, 'xids-saved')
 
-    def _group(
-        self, group_data: Union[dict, GroupType], store: Optional[bool] = True
-    ) -> Union[dict, GroupType]:
-        """Return previously stored group or new group.
+    def _dump_full(self) -> None:
+        """Batch data is submitted to the ThreatConnect API and never dumped to disk."""
 
-        Args:
-            group_data: An Group dict or instance of GroupType.
-            store: If True the group data will be stored in instance list.
+    @staticmethod
+    def _file_body(content: Any) -> Union[bytes, BinaryIO, Iterator[bytes]]:
+        """Return the request body for the file content.
 
-        Returns:
-            (dict|GroupType): The new Group dict/GroupType or the previously stored dict/GroupType.
+        Args:
+            content: The file content as bytes, str, a path, a file-like object, or an iterable.
         """
-        if store is False:
-            return group_data
+        if isinstance(content, (bytes, bytearray)):
+            return content
+        if isinstance(content, str):
+            return content.encode('utf-8')
+        if isinstance(content, os.PathLike):
+            return open(content, 'rb')  # pylint: disable=consider-using-with
+        if hasattr(content, 'read'):
+            return content
+        # stream the iterable (e.g., generator) in chunks
+        return (c.encode('utf-8') if isinstance(c, str) else c for c in content)
 
-        if isinstance(group_data, dict):
-            # get xid from dict
-            xid = group_data.get('xid')
-        else:
-            # get xid from GroupType
-            xid = group_data.xid
-
-        if self.groups.get(xid) is not None:
-            # return existing group from memory
-            group_data = self.groups.get(xid)
-        elif self.groups_shelf.get(xid) is not None:
-            # return existing group from shelf
-            group_data = self.groups_shelf.get(xid)
-        else:
-            # store new group
-            self.groups[xid] = group_data
-        return group_data
-
-    def _indicator(
-        self, indicator_data: Union[dict, IndicatorType], store: Optional[bool] = True
-    ) -> Union[dict, IndicatorType]:
-        """Return previously stored indicator or new indicator.
+    @staticmethod
+    def _file_close(body: Any) -> None:
+        """Close the request body if it is a file-like object or generator.
 
         Args:
-            indicator_data: An Indicator dict or instance of IndicatorType.
-            store: If True the indicator data will be stored in instance list.
+            body: The request body.
         """
-        if store is False:
-            return indicator_data
-
-        if isinstance(indicator_data, dict):
-            # get xid from dict
-            xid = indicator_data.get('xid')
-        else:
-            # get xid from IndicatorType
-            xid = indicator_data.xid
-
-        if self.indicators.get(xid) is not None:
-            # return existing indicator from memory
-            indicator_data = self.indicators.get(xid)
-        elif self.indicators_shelf.get(xid) is not None:
-            # return existing indicator from shelf
-            indicator_data = self.indicators_shelf.get(xid)
-        else:
-            # store new indicators
-            self.indicators[xid] = indicator_data
-        return indicator_data
-
-    def close(self) -> None:
-        """Cleanup batch job."""
-        # allow pol thread to complete before wrapping up
-        if hasattr(self._submit_thread, 'is_alive'):
-            self._submit_thread.join()
+        if hasattr(body, 'close'):
+            body.close()
 
-        # allow file threads to complete before wrapping up job
-        for t in self._file_threads:
-            t.join()
+    def _file_content(self, xid: str, content_data: dict) -> Any:
+        """Return the file content, calling the fileContent method if required.
 
-        self.groups_shelf.close()
-        self.indicators_shelf.close()
-        if not self.debug and not self.enable_saved_file:
-            # delete saved files
-            if os.path.isfile(self.group_shelf_fqfn):
-                os.remove(self.group_shelf_fqfn)
-            if os.path.isfile(self.group_shelf_fqfn):
-                os.remove(self.indicator_shelf_fqfn)
-
-    @property
-    def data(self) -> dict:
-        """Return the batch indicator/group and file data to be sent to the ThreatConnect API.
-
-        **Processing Order:**
-        * Process groups in memory up to max batch size.
-        * Process groups in shelf to max batch size.
-        * Process indicators in memory up to max batch size.
-        * Process indicators in shelf up to max batch size.
+        Args:
+            xid: The xid of the Document or Report.
+            content_data: The file data for the Document or Report.
+        """
+        content = content_data.get('fileContent')
+        if callable(content):
+            try:
+                content_callable_name = getattr(content, '__name__', repr(content))
+                self.log.trace(
+                    f'feature=batch-submit-files, method={content_callable_name}, xid={xid}'
+                )
+                content = content(xid)
+            except Exception as e:
+                self.log.warning(f'feature=batch, event=file-download-exception, err="""{e}"""')
+                content = None
+        return content
 
-        This method will remove the group/indicator from memory and/or shelf.
+    def _file_rewind(self, xid: str, content_data: dict, content: Any, body: Any) -> Any:
+        """Return a request body that can be sent again (e.g., for a PUT after a POST).
 
-        Returns:
-            dict: A dictionary of group, indicators, and/or file data.
+        Args:
+            xid: The xid of the Document or Report.
+            content_data: The file data for the Document or Report.
+            content: The file content.
+            body: The previously sent request body.
         """
-        data = {'file': {}, 'group': [], 'indicator': []}
-        tracker = {'count': 0, 'bytes': 0}
+        if isinstance(body, (bytes, bytearray)):
+            return body
+        if hasattr(body, 'seekable') and body.seekable():
+            body.seek(0)
+            return body
 
-        # process group from memory, returning if max values have been reached
-        if self.data_groups(data, self.groups, tracker) is True:
-            return data
+        self._file_close(body)
+        if isinstance(content, os.PathLike):
+            return self._file_body(content)
 
-        # process group from shelf file, returning if max values have been reached
-        if self.data_groups(data, self.groups_shelf, tracker) is True:
-            return data
+        # a one-shot stream can only be replayed by calling the fileContent method again
+        if callable(content_data.get('fileContent')):
+            content = self._file_content(xid, content_data)
+            if content is not None:
+                return self._file_body(content)
+        return None
 
-        # process indicator from memory, returning if max values have been reached
-        if self.data_indicators(data, self.indicators, tracker) is True:
-            return data
+    def _file_submit(self, target: Callable[..., Any], *args) -> Future:
+        """Submit a file task to the worker pool, blocking while the pool queue is full.
 
-        # process indicator from shelf file, returning if max values have been reached
-        if self.data_indicators(data, self.indicators_shelf, tracker) is True:
-            return data
-
-        return data
+        Blocking the caller (e.g., the submit_all loop) applies backpressure to the batch
+        pipeline so that file content is not downloaded faster than it can be uploaded.
 
-    def data_group_association(self, data: dict, tracker: dict, xid: str) -> None:
-        """Return group dict array following all associations.
+        Args:
+            target: The method to call for the file task.
+            args: The args to pass to the target method.
+        """
+        file_pool = self.file_pool
+        self._file_semaphore.acquire()  # pylint: disable=consider-using-with
+        try:
+            future = file_pool.submit(target, *args)
+        except Exception:
+            self._file_semaphore.release()
+            raise
+        future.add_done_callback(lambda _: self._file_semaphore.release())
+        return future
 
-        The *data* dict is passed by reference to make it easier to update both the group data
-        and file data inline versus passing the data all the way back up to the calling methods.
+    def _file_wait(self, futures: List[Future], halt_on_error: Optional[bool] = True) -> None:
+        """Wait for the queued file uploads and log any exceptions.
 
         Args:
-            data: The data dict to update with group and file data.
-            tracker: A dict containing total count of all entities collected and
-                the total size in bytes of all entities collected.
-            xid: The xid of the group to retrieve associations.
+            futures: The futures for the queued file uploads.
+            halt_on_error: If True the first exception is raised after all uploads are done.
         """
-        xids = deque()
-        xids.append(xid)
+        # check global setting for override
+        if self.halt_on_file_error is not None:
+            halt_on_error = self.halt_on_file_error
 
-        while xids:
-            xid = xids.popleft()  # remove current xid
-            group_data = None
+        exceptions = []
+        for future in futures:
+            exception = future.exception()
+            if exception is not None:
+                self.log.error(f'feature=batch, event=file-upload-exception, err="""{exception}"""')
+                exceptions.append(exception)
 
-            if xid in self.groups:
-                group_data = self.groups.get(xid)
-                del self.groups[xid]
-            elif xid in self.groups_shelf:
-                group_data = self.groups_shelf.get(xid)
-                del self.groups_shelf[xid]
+        if exceptions and halt_on_error:
+            raise exceptions[0]
 
-            if group_data:
-                file_data, group_data = self.data_group_type(group_data)
-                data['group'].append(group_data)
-                if file_data:
-                    data['file'][xid] = file_data
+    def _file_write(self, fqfn: str, content: Any) -> None:
+        """Stream the file content to disk.
 
-                # update entity trackers
-                tracker['count'] += 1
-                tracker['bytes'] += sys.getsizeof(json.dumps(group_data))
+        Args:
+            fqfn: The fully qualified filename to write.
+            content: The file content.
+        """
+        body = self._file_body(content)
+        try:
+            with open(fqfn, 'wb') as fh:
+                if isinstance(body, (bytes, bytearray)):
+                    fh.write(body)
+                elif hasattr(body, 'read'):
+                    shutil.copyfileobj(body, fh)
+                else:
+                    for chunk in body:
+                        fh.write(chunk)
+        finally:
+            self._file_close(body)
 
-                # extend xids with any groups associated with the same GroupType
-                xids.extend(group_data.get('associatedGroupXid', []))
+    def _submit_all_chunk(
+        self, chunk: BatchChunk, digest: Optional[str], halt_on_error: bool
+    ) -> Tuple[Optional[int], dict]:
+        """Submit a single chunk of batch data and return the batch id and batch data.
 
-    @staticmethod
-    def data_group_type(group_data: Union[dict, GroupType]) -> Tuple[dict, dict]:
-        """Return dict representation of group data and file data.
+        When the checkpoint journal is enabled, a chunk that was completed before a restart is
+        not submitted (the journaled batch status is returned with no batch id) and a chunk that
+        was in-flight before a restart is not submitted (the journaled batch id is returned so
+        that it can be polled).
 
         Args:
-            group_data: The group data dict or GroupType.
-
-        Returns:
-            Tuple[dict, dict]: A tuple containing file_data and group_data.
+            chunk: The chunk of serialized batch data.
+            digest: The journal digest of the chunk or None if the journal is disabled.
+            halt_on_error: If True any exception will raise an error.
         """
-        file_data = {}
-        if isinstance(group_data, dict):
-            # process file content
-            file_content = group_data.pop('fileContent', None)
-            if file_content is not None:
-                file_data = {
-                    'fileContent': file_content,
-                    'fileName': group_data.get('fileName'),
-                    'type': group_data.get('type'),
-                }
+        entry = self.journal.chunk(digest) if digest is not None else None
+        if entry is not None:
+            self.log.info(
+                f'feature=batch, event=resume, batch-id={entry.get("batch_id")}, '
+                f'status={entry.get("event")}'
+            )
+            if entry.get('event') == 'completed':
+                return None, entry.get('batch_status') or {}
+
+            batch_id = entry.get('batch_id')
+            self.poll_scheduler.register(batch_id, chunk.count)
+            return batch_id, {'id': batch_id}
+
+        batch_data = {}
+        if self.action.lower() == 'delete':
+            # while waiting of FR for delete support in createAndUpload submit delete request
+            # the old way (submit job + submit data), still using V2.
+            batch_id = self.submit_job(halt_on_error)
+            if batch_id is not None:
+                self.poll_scheduler.register(batch_id, chunk.count)
+                batch_data = self.submit_data(
+                    batch_id=batch_id, content=chunk, halt_on_error=halt_on_error
+                )
         else:
-            # get the file data from the GroupType and return dict format of GroupType
-            if group_data.data.get('type') in ['Document', 'Report']:
-                file_data = group_data.file_data
-            group_data = group_data.data
+            batch_data = (
+                self.submit_create_and_upload(content=chunk, halt_on_error=halt_on_error)
+                .get('data', {})
+                .get('batchStatus', {})
+            )
+            batch_id = batch_data.get('id')
 
-        return file_data, group_data
+        if digest is not None and batch_id is not None:
+            self.journal.submitted(digest, batch_id)
+        return batch_id, batch_data
 
-    def data_groups(self, data: dict, groups: list, tracker: dict) -> bool:
-        """Process Group data.
+    def _submit_all_complete(
+        self,
+        batch_id: Optional[int],
+        batch_data: dict,
+        file_data: dict,
+        errors: bool,
+        process_files: bool,
+        halt_on_error: bool,
+        digest: Optional[str] = None,
+    ) -> List[Future]:
+        """Retrieve errors and submit file data for a completed batch job.
 
         Args:
-            data: The data dict to update with group and file data.
-            groups: The list of groups to process.
-            tracker: A dict containing total count of all entities collected and
-                the total size in bytes of all entities collected.
+            batch_id: The batch id of the completed batch job.
+            batch_data: The batch status of the completed batch job.
+            file_data: The file data for the completed batch job.
+            errors: If True retrieve any batch errors.
+            process_files: If true send any document or report attachments to the API.
+            halt_on_error: If True any exception will raise an error.
+            digest: The journal digest of the chunk or None if the journal is disabled.
 
         Returns:
-            bool: True if max values have been hit, else False.
+            list: The futures for the queued file uploads.
         """
-        # convert groups.keys() to a list to prevent dictionary change error caused by
-        # the data_group_association function deleting items from the GroupType.
-
-        # process the group
-        for xid in list(groups.keys()):
-            # get association from group data
-            self.data_group_association(data, tracker, xid)
-
-            if tracker.get('count') % 2_500 == 0:
-                # log count/size at a sane level
-                self.log.info(
-                    '''feature=batch, action=data-groups, '''
-                    f'''count={tracker.get('count'):,}, bytes={tracker.get('bytes'):,}'''
-                )
+        if batch_id is not None and errors and batch_data:
+            # retrieve errors
+            error_count = batch_data.get('errorCount', 0)
+            error_groups = batch_data.get('errorGroupCount', 0)
+            error_indicators = batch_data.get('errorIndicatorCount', 0)
+            if error_count > 0 or error_groups > 0 or error_indicators > 0:
+                batch_data['errors'] = self.errors(batch_id)
+
+        # checkpoint the completed batch job (chunks resumed as completed are already journaled),
+        # a batch job without a status is polled again if the App is restarted.
+        if (
+            digest is not None
+            and batch_data
+            and (self.journal.chunk(digest) or {}).get('event') != 'completed'
+        ):
+            self.journal.completed(digest, batch_id, batch_data)
+
+        futures = []
+        if process_files:
+            # submit file data after batch job is complete
+            futures = self.queue_files(file_data, halt_on_error)
 
-            if (
-                tracker.get('count') >= self._batch_max_chunk
-                or tracker.get('bytes') >= self._batch_max_size
-            ):
-                # stop processing xid once max limit are reached
-                self.log.info(
-                    '''feature=batch, event=max-value-reached, '''
-                    f'''count={tracker.get('count'):,}, bytes={tracker.get('bytes'):,}'''
-                )
-                return True
-        return False
+        # write errors for debugging
+        self.write_error_json(batch_data.get('errors'))
+        return futures
 
-    def data_indicators(self, data: dict, indicators: list, tracker: dict) -> bool:
-        """Process Indicator data.
+    def _submit_all_ready(self, chunk: BatchChunk, in_flight: dict) -> bool:
+        """Return True if the chunk can be submitted.
 
         Args:
-            data: The data dict to update with group and file data.
-            indicators: The list of indicators to process.
-            tracker: A dict containing total count of all entities collected and
-                the total size in bytes of all entities collected.
-
-        Returns:
-            bool: True if max values have been hit, else False.
+            chunk: The next chunk of serialized batch data.
+            in_flight: The outstanding batch jobs.
         """
-        # process the indicators
-        for xid, indicator_data in list(indicators.items()):
-            if not isinstance(indicator_data, dict):
-                indicator_data = indicator_data.data
-            data['indicator'].append(indicator_data)
-            del indicators[xid]
-
-            # update entity trackers
-            tracker['count'] += 1
-            tracker['bytes'] += sys.getsizeof(json.dumps(indicator_data))
-
-            if tracker.get('count') % 2_500 == 0:
-                # log count/size at a sane level
-                self.log.info(
-                    '''feature=batch, action=data-indicators, '''
-                    f'''count={tracker.get('count'):,}, bytes={tracker.get('bytes'):,}'''
-                )
+        if len(in_flight) >= self.max_in_flight:
+            return False
 
-            if (
-                tracker.get('count') >= self._batch_max_chunk
-                or tracker.get('bytes') >= self._batch_max_size
-            ):
-                # stop processing xid once max limit are reached
-                self.log.info(
-                    '''feature=batch, event=max-value-reached, '''
-                    f'''count={tracker.get('count'):,}, bytes={tracker.get('bytes'):,}'''
-                )
-                return True
-        return False
+        # indicators may be associated to groups in an outstanding batch job
+        if chunk.indicator_count > 0:
+            return not any(batch_job.get('groups') for batch_job in in_flight.values())
+        return True
+
+    def close(self) -> None:
+        """Cleanup batch job."""
+        # allow pol thread to complete before wrapping up
+        if hasattr(self._submit_thread, 'is_alive'):
+            self._submit_thread.join()
+
+        # allow file uploads to complete before wrapping up job
+        if self._file_pool is not None:
+            self._file_pool.shutdown(wait=True)
+            self._file_pool = None
+
+        # the journal is only required until all batch jobs and file uploads are complete
+        if self._journal is not None and self._journal_complete:
+            self._journal.remove()
+
+        self.groups_shelf.close()
+        self.indicators_shelf.close()
+        if not self.debug and not self.enable_saved_file:
+            # delete saved files
+            self.groups_shelf.remove()
+            self.indicators_shelf.remove()
 
     @property
     def debug(self):
@@ -395,6 +415,27 @@ class Batch(BatchWriter, BatchSubmit):
                 self._debug = True
         return self._debug
 
+    @property
+    def file_max_workers(self) -> int:
+        """Return the max number of concurrent file uploads."""
+        return self._file_max_workers
+
+    @file_max_workers.setter
+    def file_max_workers(self, value: int):
+        """Set the max number of concurrent file uploads (before any file is uploaded)."""
+        self._file_max_workers = max(int(value), 1)
+
+    @property
+    def file_pool(self) -> ThreadPoolExecutor:
+        """Return the bounded worker pool for file uploads."""
+        if self._file_pool is None:
+            self._file_pool = ThreadPoolExecutor(
+                max_workers=self.file_max_workers, thread_name_prefix='submit-files'
+            )
+            # allow one queued file per worker before blocking the caller
+            self._file_semaphore = threading.BoundedSemaphore(self.file_max_workers * 2)
+        return self._file_pool
+
     @property
     def halt_on_file_error(self) -> bool:
         """Return halt on file post error value."""
@@ -406,79 +447,117 @@ class Batch(BatchWriter, BatchSubmit):
         if isinstance(value, bool):
             self._halt_on_file_error = value
 
+    @property
+    def journal(self) -> Optional[BatchJournal]:
+        """Return the checkpoint journal or None if the journal is not enabled."""
+        if self._journal is None and self.enable_journal:
+            self._journal = BatchJournal(self.journal_fqfn)
+        return self._journal
+
+    @property
+    def max_in_flight(self) -> int:
+        """Return the max number of outstanding batch jobs for submit_all."""
+        return self._max_in_flight
+
+    @max_in_flight.setter
+    def max_in_flight(self, value: int):
+        """Set the max number of outstanding batch jobs for submit_all."""
+        self._max_in_flight = max(int(value), 1)
+
     def process_all(self, process_files: Optional[bool] = True) -> None:
         """Process Batch request to ThreatConnect API.
 
         Args:
             process_files: Send any document or report attachments to the API.
         """
+        file_data = {}
         while True:
-            content = self.data
-            file_data = content.pop('file', {})
-            if not content.get('group') and not content.get('indicator'):
+            chunk = self.data_chunk
+            if not chunk:
                 break
+            file_data.update(chunk.file)
 
             # special code for debugging App using batchV2.
-            self.write_batch_json(content)
+            self.write_batch_json(chunk)
 
             # store the length of the batch data to use for poll interval calculations
             self.log.info(
-                '''feature=batch, event=process-all, type=group, '''
-                f'''count={len(content.get('group')):,}'''
+                f'''feature=batch, event=process-all, type=group, count={chunk.group_count:,}'''
             )
             self.log.info(
                 '''feature=batch, event=process-all, type=indicator, '''
-                f'''count={len(content.get('indicator')):,}'''
+                f'''count={chunk.indicator_count:,}'''
             )
 
         if process_files:
             self.process_files(file_data)
 
+    def process_file(self, xid: str, content_data: dict) -> None:
+        """Process a single File for a Document or Report.
+
+        Args:
+            xid: The xid of the Document or Report.
+            content_data: The file data for the Document or Report.
+        """
+        # define the saved filename
+        api_branch = 'reports' if content_data.get('type') == 'Report' else 'documents'
+        fqfn = os.path.join(
+            self.debug_path_files,
+            f'''{api_branch}--{xid}--{content_data.get('fileName').replace('/', ':')}''',
+        )
+
+        # used for debug/testing to prevent upload of previously uploaded file
+        if self.debug and xid in self.saved_xids:
+            self.log.debug(
+                f'feature=batch-submit-files, action=skip-previously-saved-file, xid={xid}'
+            )
+            return
+
+        if os.path.isfile(fqfn):
+            self.log.debug(
+                f'feature=batch-submit-files, action=skip-previously-saved-file, xid={xid}'
+            )
+            return
+
+        # process the file content
+        content = self._file_content(xid, content_data)
+        if content is None:
+            self.log.warning(f'feature=batch-submit-files, xid={xid}, event=content-null')
+            return
+
+        # stream the file to disk
+        self._file_write(fqfn, content)
+
     def process_files(self, file_data: dict) -> None:
         """Process Files for Documents and Reports to ThreatConnect API.
 
         Args:
             file_data: The file data to be processed.
         """
+        futures = []
         for xid, content_data in list(file_data.items()):
             del file_data[xid]  # win or loose remove the entry
+            futures.append(self._file_submit(self.process_file, xid, content_data))
+        wait(futures)
 
-            # define the saved filename
-            api_branch = 'documents' if content_data.get('type') == 'Report' else 'reports'
-            fqfn = os.path.join(
-                self.debug_path_files,
-                f'''{api_branch}--{xid}--{content_data.get('fileName').replace('/', ':')}''',
-            )
+    def queue_files(self, file_data: dict, halt_on_error: Optional[bool] = True) -> List[Future]:
+        """Queue Files for Documents and Reports to be submitted by the file worker pool.
 
-            # used for debug/testing to prevent upload of previously uploaded file
-            if self.debug and xid in self.saved_xids:
-                self.log.debug(
-                    f'feature=batch-submit-files, action=skip-previously-saved-file, xid={xid}'
-                )
-                continue
+        This method blocks while the worker pool queue is full.
 
-            if os.path.isfile(fqfn):
-                self.log.debug(
-                    f'feature=batch-submit-files, action=skip-previously-saved-file, xid={xid}'
-                )
-                continue
-
-            # process the file content
-            content = content_data.get('fileContent')
-            if callable(content):
-                content_callable_name = getattr(content, '__name__', repr(content))
-                self.log.trace(
-                    f'feature=batch-submit-files, method={content_callable_name}, xid={xid}'
-                )
-                content = content_data.get('fileContent')(xid)
-
-            if content is None:
-                self.log.warning(f'feature=batch-submit-files, xid={xid}, event=content-null')
-                continue
+        Args:
+            file_data: The file data to be submitted.
+            halt_on_error: If True any exception will raise an error.
 
-            # write the file to disk
-            with open(fqfn, 'wb') as fh:
-                fh.write(content)
+        Returns:
+            list: The futures for the queued file uploads.
+        """
+        self.log.info(f'feature=batch, action=queue-files, count={len(file_data)}')
+        futures = []
+        for xid, content_data in list(file_data.items()):
+            del file_data[xid]  # win or loose remove the entry
+            futures.append(self._file_submit(self.submit_file, xid, content_data, halt_on_error))
+        return futures
 
     @property
     def saved_groups(self) -> bool:
@@ -545,6 +624,12 @@ class Batch(BatchWriter, BatchSubmit):
         If any of the submit, poll, or error methods fail the entire submit will halt at the point
         of failure. The behavior can be changed by setting halt_on_error to False.
 
+        When **enable_journal** is True, the progress of each chunk is recorded in a checkpoint
+        journal (see BatchJournal). If the App is restarted and adds the same data to the batch,
+        chunks that were completed are skipped and chunks that were in-flight are polled using
+        the journaled batch id instead of being uploaded again. The journal is removed by close()
+        once all chunks have been submitted.
+
         Each of these methods can also be called on their own for greater control of the submit
         process.
 
@@ -558,12 +643,12 @@ class Batch(BatchWriter, BatchSubmit):
             dict: The Batch Status from the ThreatConnect API.
         """
         # get file, group, and indicator data
-        content = self.data
+        chunk = self.data_chunk
 
-        # pop any file content to pass to submit_files
-        file_data = content.pop('file', {})
+        # pass any file content to submit_files
+        file_data = chunk.file
         batch_data = (
-            self.submit_create_and_upload(content=content, halt_on_error=halt_on_error)
+            self.submit_create_and_upload(content=chunk, halt_on_error=halt_on_error)
             .get('data', {})
             .get('batchStatus', {})
         )
@@ -590,16 +675,7 @@ class Batch(BatchWriter, BatchSubmit):
 
         if process_files:
             # submit file data after batch job is complete
-            self._file_threads.append(
-                self.submit_thread(
-                    name='submit-files',
-                    target=self.submit_files,
-                    args=(
-                        file_data,
-                        halt_on_error,
-                    ),
-                )
-            )
+            self._file_wait(self.queue_files(file_data, halt_on_error), halt_on_error)
         return batch_data
 
     def submit_all(
@@ -617,6 +693,13 @@ class Batch(BatchWriter, BatchSubmit):
         than the value set the batch job will be queued.
         Errors are not retrieve automatically and need to be enabled.
 
+        The submission is pipelined. While submitted batch jobs are being processed by the
+        ThreatConnect API the next chunk of data is built and, up to the **max_in_flight** limit,
+        submitted. All outstanding batch jobs are checked in a single poll loop, with each batch
+        job polled near the completion time predicted by the BatchPollScheduler. Chunks containing
+        indicators are not submitted while a batch job containing groups is outstanding so that
+        associations to groups from previous chunks can be resolved.
+
         If any of the submit, poll, or error methods fail the entire submit will halt at the point
         of failure. The behavior can be changed by setting halt_on_error to False.
 
@@ -632,87 +715,105 @@ class Batch(BatchWriter, BatchSubmit):
         Returns.
             dict: The Batch Status from the ThreatConnect API.
         """
+        if self.action.lower() == 'delete':
+            # no need to process files on a delete batch job
+            process_files = False
+
         batch_data_array = []
-        file_data = {}
-        while True:
-            batch_data = {}
-            batch_id = None
+        futures = []  # the queued file uploads
+        in_flight = {}  # batch id -> outstanding batch job
 
-            # get file, group, and indicator data
-            content = self.data
+        # get file, group, and indicator data
+        chunk = self.data_chunk
+        while chunk or in_flight:
+            # submit chunks while there is capacity for another batch job
+            while chunk and self._submit_all_ready(chunk, in_flight):
+                digest = None
+                if self.journal is not None:
+                    digest = self.journal.digest(chunk.content, self.settings)
+                batch_id, batch_data = self._submit_all_chunk(chunk, digest, halt_on_error)
+                batch_data_array.append(batch_data)
+
+                if batch_id is not None and poll:
+                    self.log.info(f'feature=batch, event=status, batch-id={batch_id}')
+                    in_flight[batch_id] = {
+                        'digest': digest,
+                        'file_data': chunk.file,
+                        'groups': chunk.group_count > 0,
+                        'index': len(batch_data_array) - 1,
+                        'next_poll': time.time() + self.poll_scheduler.interval(batch_id),
+                        'submitted': time.time(),
+                    }
+                else:
+                    # can't process files if status is unknown (polling must be enabled)
+                    futures += self._submit_all_complete(
+                        batch_id=batch_id,
+                        batch_data=batch_data,
+                        file_data=chunk.file,
+                        errors=errors,
+                        process_files=process_files and batch_id is None,
+                        halt_on_error=halt_on_error,
+                        digest=digest if poll else None,
+                    )
 
-            # break loop when end of data is reached
-            if not content.get('group') and not content.get('indicator'):
-                break
+                # build the next chunk while the submitted batch jobs are being processed
+                chunk = self.data_chunk
 
-            if self.action.lower() == 'delete':
-                # no need to process files on a delete batch job
-                process_files = False
+            if not in_flight:
+                continue
 
-                # while waiting of FR for delete support in createAndUpload submit delete request
-                # the old way (submit job + submit data), still using V2.
-                if len(content) > 0:  # pylint: disable=len-as-condition
-                    batch_id = self.submit_job(halt_on_error)
-                    if batch_id is not None:
-                        batch_data = self.submit_data(
-                            batch_id=batch_id, content=content, halt_on_error=halt_on_error
-                        )
-                else:
-                    batch_data = {}
-            else:
-                # pop any file content to pass to submit_files
-                file_data = content.pop('file', {})
-                batch_data = (
-                    self.submit_create_and_upload(content=content, halt_on_error=halt_on_error)
-                    .get('data', {})
-                    .get('batchStatus', {})
-                )
-                batch_id = batch_data.get('id')
+            # wait for the next scheduled poll of any outstanding batch job
+            poll_interval = min(batch_job.get('next_poll') for batch_job in in_flight.values())
+            poll_interval = max(poll_interval - time.time(), 0)
+            time.sleep(poll_interval)
+            self.log.info(
+                f'feature=batch, event=progress, in-flight={len(in_flight)}, '
+                f'poll-interval={poll_interval:.2f}'
+            )
 
-            if batch_id is not None:
-                self.log.info(f'feature=batch, event=status, batch-id={batch_id}')
-                # job hit queue
-                if poll:
-                    # poll for status
-                    batch_data = (
-                        self.poll(batch_id, halt_on_error=halt_on_error)
-                        .get('data', {})
-                        .get('batchStatus')
-                    )
-                    if errors:
-                        # retrieve errors
-                        error_count = batch_data.get('errorCount', 0)
-                        error_groups = batch_data.get('errorGroupCount', 0)
-                        error_indicators = batch_data.get('errorIndicatorCount', 0)
-                        if error_count > 0 or error_groups > 0 or error_indicators > 0:
-                            batch_data['errors'] = self.errors(batch_id)
-                else:
-                    # can't process files if status is unknown (polling must be enabled)
-                    process_files = False
-
-            if process_files:
-                # submit file data after batch job is complete
-                self._file_threads.append(
-                    self.submit_thread(
-                        name='submit-files',
-                        target=self.submit_files,
-                        args=(
-                            file_data,
-                            halt_on_error,
-                        ),
+            # check the status of every outstanding batch job that is due
+            for batch_id, batch_job in list(in_flight.items()):
+                if batch_job.get('next_poll') > time.time():
+                    continue
+
+                batch_data = self.poll_status(batch_id, halt_on_error=halt_on_error)
+                if batch_data is not None and batch_data.get('status') != 'Completed':
+                    if time.time() - batch_job.get('submitted') >= self.poll_timeout:
+                        # time out poll to prevent App running indefinitely
+                        handle_error(code=550, message_values=[self.poll_timeout], raise_error=True)
+
+                    # schedule the next poll near the predicted completion time
+                    batch_job['next_poll'] = time.time() + self.poll_scheduler.update(
+                        batch_id, batch_data
                     )
+                    continue
+
+                # batch job is complete (or status could not be retrieved)
+                del in_flight[batch_id]
+                self.poll_scheduler.complete(batch_id, batch_data)
+                batch_data = batch_data or {}
+                batch_data_array[batch_job.get('index')] = batch_data
+                futures += self._submit_all_complete(
+                    batch_id=batch_id,
+                    batch_data=batch_data,
+                    file_data=batch_job.get('file_data'),
+                    errors=errors,
+                    process_files=process_files,
+                    halt_on_error=halt_on_error,
+                    digest=batch_job.get('digest'),
                 )
-            batch_data_array.append(batch_data)
 
-            # write errors for debugging
-            self.write_error_json(batch_data.get('errors'))
+        # wait for the file uploads before returning the batch status
+        self._file_wait(futures, halt_on_error)
 
+        # all chunks have been submitted, the journal can be removed on close
+        self._journal_complete = True
         return batch_data_array
 
     def submit_callback(
         self,
         callback: Callable[..., Any],
-        content: Optional[dict] = None,
+        content: Optional[Union[BatchChunk, dict]] = None,
         halt_on_error: Optional[bool] = True,
     ) -> bool:
         """Submit batch data to ThreatConnect and poll in a separate thread.
@@ -726,7 +827,8 @@ class Batch(BatchWriter, BatchSubmit):
         Args:
             callback: The callback method that will handle
                 the batch status when polling is complete.
-            content: The dict of groups and indicator data (e.g., {"group": [], "indiciator": []}).
+            content: The chunk of serialized batch data or the dict of groups and indicator
+                data (e.g., {"group": [], "indiciator": []}).
             halt_on_error: If True the process should halt if any errors are encountered.
 
         Raises:
@@ -736,15 +838,15 @@ class Batch(BatchWriter, BatchSubmit):
             bool: False when there is not data to process, else True
         """
         # user provided content or grab content from local group/indicator lists
-        if content is not None:
-            # process content
-            pass
-        else:
-            content = self.data
-        file_data = content.pop('file', {})
+        if isinstance(content, dict):
+            # serialize user provided content
+            content = BatchChunk.from_data(content)
+        elif content is None:
+            content = self.data_chunk
+        file_data = content.file
 
         # return False when end of data is reached
-        if not content.get('group') and not content.get('indicator'):
+        if not content:
             return False
 
         # block here is there is already a batch submission being processed
@@ -808,16 +910,7 @@ class Batch(BatchWriter, BatchSubmit):
         # submission thread is allowed, there is no limit on file upload threads. the upload
         # status returned by file upload will be ignored when running in a thread.
         if file_data:
-            self._file_threads.append(
-                self.submit_thread(
-                    name='submit-files',
-                    target=self.submit_files,
-                    args=(
-                        file_data,
-                        halt_on_error,
-                    ),
-                )
-            )
+            self.queue_files(file_data, halt_on_error)
 
         # send batch_status to callback
         if callable(callback):
@@ -827,12 +920,22 @@ class Batch(BatchWriter, BatchSubmit):
             except Exception as e:
                 self.log.warning(f'feature=batch, event=callback-error, err="""{e}"""')
 
-    def submit_create_and_upload(self, content: dict, halt_on_error: Optional[bool] = True) -> dict:
+    def submit_create_and_upload(
+        self,
+        content: Union[BatchChunk, dict],
+        halt_on_error: Optional[bool] = True,
+        gzip_upload: Optional[bool] = None,
+    ) -> dict:
         """Submit Batch request to ThreatConnect API.
 
+        When gzip_upload is enabled the chunk is compressed in a single pass directly from the
+        serialized buffers (the same compressed bytes are used for the debug batch file) and
+        sent as a gzip content part.
+
         Args:
-            content: The dict of groups and indicator data.
+            content: The chunk of serialized batch data or the dict of groups and indicator data.
             halt_on_error: If True the process should halt if any errors are encountered.
+            gzip_upload: If True upload the compressed chunk, defaults to the gzip_upload property.
 
         Returns.
             dict: The Batch Status from the ThreatConnect API.
@@ -841,125 +944,133 @@ class Batch(BatchWriter, BatchSubmit):
         if self.halt_on_batch_error is not None:
             halt_on_error = self.halt_on_batch_error
 
+        if isinstance(content, dict):
+            # serialize user provided content
+            content = BatchChunk.from_data(content)
+
         # special code for debugging App using batchV2.
         self.write_batch_json(content)
 
         # store the length of the batch data to use for poll interval calculations
         self.log.info(
             '''feature=batch, event=submit-create-and-upload, type=group, '''
-            f'''count={len(content.get('group')):,}'''
+            f'''count={content.group_count:,}'''
         )
         self.log.info(
             '''feature=batch, event=submit-create-and-upload, type=indicator, '''
-            f'''count={len(content.get('indicator')):,}'''
+            f'''count={content.indicator_count:,}, bytes={content.size:,}'''
         )
 
+        if gzip_upload is None:
+            gzip_upload = self.gzip_upload
+
         try:
-            files = (('config', json.dumps(self.settings)), ('content', json.dumps(content)))
-            params = {'includeAdditional': 'true'}
-            r = self.session_tc.post('/v2/batch/createAndUpload', files=files, params=params)
-            if not r.ok or 'application/json' not in r.headers.get('content-type', ''):
-                handle_error(
-                    code=10510,
-                    message_values=[r.status_code, r.text],
-                    raise_error=halt_on_error,
-                )
-            return r.json()
+            # the pre-serialized chunk content is sent as-is (no additional json.dumps)
+            data = self._submit_create_and_upload(
+                content.compressed() if gzip_upload else content.content,
+                gzip_upload,
+                halt_on_error,
+            )
         except Exception as e:
             handle_error(code=10505, message_values=[e], raise_error=halt_on_error)
+            return {}
 
-        return {}
+        # register queued batch jobs with the poll scheduler
+        batch_id = data.get('data', {}).get('batchStatus', {}).get('id')
+        if batch_id is not None:
+            self.poll_scheduler.register(batch_id, content.count)
+        return data
 
-    def submit_files(self, file_data: dict, halt_on_error: Optional[bool] = True) -> dict:
-        """Submit Files for Documents and Reports to ThreatConnect API.
+    def submit_file(
+        self, xid: str, content_data: dict, halt_on_error: Optional[bool] = True
+    ) -> Optional[dict]:
+        """Submit a single File for a Document or Report to ThreatConnect API.
 
-        Critical Errors
-
-        * There is insufficient document storage allocated to this account.
+        The fileContent can be bytes, a str, a path (os.PathLike), a file-like object, or an
+        iterable (e.g., generator) of bytes, or a callable that returns any of these values. Paths,
+        file-like objects, and iterables are streamed to the API without being held in memory.
 
         Args:
+            xid: The xid of the Document or Report.
+            content_data: The file data for the Document or Report.
             halt_on_error: If True any exception will raise an error.
-            file_data: The file data to be submitted.
 
         Returns:
-            dict: The upload status for each xid.
+            dict: The upload status for the xid or None if the file was skipped.
         """
         # check global setting for override
         if self.halt_on_file_error is not None:
             halt_on_error = self.halt_on_file_error
 
-        upload_status = []
-        self.log.info(f'feature=batch, action=submit-files, count={len(file_data)}')
-        for xid, content_data in list(file_data.items()):
-            del file_data[xid]  # win or loose remove the entry
-            status = True
+        # used for debug/testing to prevent upload of previously uploaded file
+        if self.debug and xid in self.saved_xids:
+            self.log.debug(
+                f'feature=batch-submit-files, action=skip-previously-saved-file, xid={xid}'
+            )
+            return None
 
-            # used for debug/testing to prevent upload of previously uploaded file
-            if self.debug and xid in self.saved_xids:
-                self.log.debug(
-                    f'feature=batch-submit-files, action=skip-previously-saved-file, xid={xid}'
-                )
-                continue
+        # prevent upload of a file that was uploaded before the App was restarted
+        if self.journal is not None and self.journal.file_uploaded(xid):
+            self.log.debug(f'feature=batch-submit-files, action=skip-journaled-file, xid={xid}')
+            return None
 
-            # process the file content
-            content = content_data.get('fileContent')
-            if callable(content):
-                try:
-                    content_callable_name = getattr(content, '__name__', repr(content))
-                    self.log.trace(
-                        f'feature=batch-submit-files, method={content_callable_name}, xid={xid}'
-                    )
-                    content = content_data.get('fileContent')(xid)
-                except Exception as e:
-                    self.log.warning(f'feature=batch, event=file-download-exception, err="""{e}"""')
+        # process the file content
+        content = self._file_content(xid, content_data)
+        if content is None:
+            self.log.warning(f'feature=batch-submit-files, xid={xid}, event=content-null')
+            return {'uploaded': False, 'xid': xid}
 
-            if content is None:
-                upload_status.append({'uploaded': False, 'xid': xid})
-                self.log.warning(f'feature=batch-submit-files, xid={xid}, event=content-null')
-                continue
+        api_branch = 'documents'
+        if content_data.get('type') == 'Report':
+            api_branch = 'reports'
 
-            api_branch = 'documents'
-            if content_data.get('type') == 'Report':
-                api_branch = 'reports'
+        if self.debug and content_data.get('fileName'):
+            # special code for debugging App using batchV2.
+            fqfn = os.path.join(
+                self.debug_path_files,
+                f'''{api_branch}--{xid}--{content_data.get('fileName').replace('/', ':')}''',
+            )
+            self._file_write(fqfn, content)
 
-            if self.debug and content_data.get('fileName'):
-                # special code for debugging App using batchV2.
-                fqfn = os.path.join(
-                    self.debug_path_files,
-                    f'''{api_branch}--{xid}--{content_data.get('fileName').replace('/', ':')}''',
-                )
-                with open(fqfn, 'wb') as fh:
-                    if not isinstance(content, bytes):
-                        content = content.encode()
-                    fh.write(content)
-
-            # Post File
-            url = f'/v2/groups/{api_branch}/{xid}/upload'
-            headers = {'Content-Type': 'application/octet-stream'}
-            params = {'owner': self._owner, 'updateIfExists': 'true'}
-            r = self.submit_file_content('POST', url, content, headers, params, halt_on_error)
-            if r.status_code == 401:
+            # stream the upload from the debug file
+            content = pathlib.Path(fqfn)
+
+        # Post File
+        status = True
+        url = f'/v2/groups/{api_branch}/{xid}/upload'
+        headers = {'Content-Type': 'application/octet-stream'}
+        params = {'owner': self._owner, 'updateIfExists': 'true'}
+        body = self._file_body(content)
+        try:
+            r = self.submit_file_content('POST', url, body, headers, params, halt_on_error)
+            if r is not None and r.status_code == 401:
                 # use PUT method if file already exists
                 self.log.info('feature=batch, event=401-from-post, action=switch-to-put')
-                r = self.submit_file_content('PUT', url, content, headers, params, halt_on_error)
-            if not r.ok:
-                status = False
-                handle_error(
-                    code=585,
-                    message_values=[r.status_code, r.text],
-                    raise_error=halt_on_error,
-                )
-            elif self.debug and self.enable_saved_file and xid not in self.saved_xids:
+                body = self._file_rewind(xid, content_data, content, body)
+                if body is not None:
+                    r = self.submit_file_content('PUT', url, body, headers, params, halt_on_error)
+        finally:
+            self._file_close(body)
+
+        if r is None or not r.ok:
+            status = False
+            handle_error(
+                code=585,
+                message_values=[getattr(r, 'status_code', None), getattr(r, 'text', None)],
+                raise_error=halt_on_error,
+            )
+        else:
+            if self.journal is not None:
+                self.journal.file(xid)
+            if self.debug and self.enable_saved_file and xid not in self.saved_xids:
                 # save xid "if" successfully uploaded and not already saved
                 self.saved_xids = xid
 
-            self.log.info(
-                f'feature=batch, event=file-upload, status={r.status_code}, '
-                f'xid={xid}, remaining={len(file_data)}'
-            )
-            upload_status.append({'uploaded': status, 'xid': xid})
-
-        return upload_status
+        self.log.info(
+            f'feature=batch, event=file-upload, status={getattr(r, "status_code", None)}, '
+            f'xid={xid}'
+        )
+        return {'uploaded': status, 'xid': xid}
 
     def submit_file_content(
         self,
@@ -990,6 +1101,30 @@ class Batch(BatchWriter, BatchSubmit):
             handle_error(code=580, message_values=[e], raise_error=halt_on_error)
         return r
 
+    def submit_files(self, file_data: dict, halt_on_error: Optional[bool] = True) -> list:
+        """Submit Files for Documents and Reports to ThreatConnect API.
+
+        The files are uploaded concurrently by the bounded file worker pool.
+
+        Critical Errors
+
+        * There is insufficient document storage allocated to this account.
+
+        Args:
+            halt_on_error: If True any exception will raise an error.
+            file_data: The file data to be submitted.
+
+        Returns:
+            list: The upload status for each xid.
+        """
+        futures = self.queue_files(file_data, halt_on_error)
+        upload_status = []
+        for future in futures:
+            status = future.result()
+            if status is not None:
+                upload_status.append(status)
+        return upload_status
+
     def submit_job(self, halt_on_error: Optional[bool] = True) -> int:
         """Submit Batch request to ThreatConnect API.
 
@@ -1064,24 +1199,36 @@ class Batch(BatchWriter, BatchSubmit):
             with gzip.open(error_json_file, mode='wt', encoding='utf-8') as fh:
                 json.dump(errors, fh)
 
-    def write_batch_json(self, content: dict) -> None:
-        """Write batch json data to a file."""
+    def write_batch_json(self, content: Union[BatchChunk, dict]) -> None:
+        """Write batch json data to a file.
+
+        Args:
+            content: The chunk of serialized batch data or a dict of groups and indicator data.
+        """
         if self.debug and content:
+            if isinstance(content, dict):
+                content = BatchChunk.from_data(content)
+
             # get timestamp as a string without decimal place and consistent length
             timestamp = str(int(time.time() * 10000000))
             batch_json_file = os.path.join(self.debug_path_batch, f'batch-{timestamp}.json.gz')
-            with gzip.open(batch_json_file, mode='wt', encoding='utf-8') as fh:
-                json.dump(content, fh)
+            with open(batch_json_file, mode='wb') as fh:
+                fh.write(content.compressed())
 
     @property
     def group_len(self) -> int:
         """Return the number of current groups."""
-        return len(self.groups) + len(self.groups_shelf)
+        return len(self.groups) + len(self.groups_shelf) + self._chunk_carry_len('group')
 
     @property
     def indicator_len(self) -> int:
         """Return the number of current indicators."""
-        return len(self.indicators) + len(self.indicators_shelf)
+        return (
+            len(self.indicators)
+            + len(self.indicators_shelf)
+            + len(self.indicators_bulk)
+            + self._chunk_carry_len('indicator')
+        )
 
     def __len__(self) -> int:
         """Return the number of groups and indicators."""
@@ -1112,6 +1259,8 @@ class Batch(BatchWriter, BatchSubmit):
                 indicators.append(indicator_data)
             else:
                 indicators.append(indicator_data.data)
+        for xid in self.indicators_bulk:
+            indicators.append(self.indicators_bulk.get(xid))
 
         data = {'group': groups, 'indicators': indicators}
         return json.dumps(data, indent=4, sort_keys=True)
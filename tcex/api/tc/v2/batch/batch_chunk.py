@@ -0,0 +1,215 @@
+"""ThreatConnect Batch Import Module"""
+# standard library
+import gzip
+import io
+import json
+from typing import Optional, Union
+
+
+class BatchChunk:
+    """ThreatConnect Batch Chunk Object
+
+    Streaming builder for a single batch JSON document. Each group and indicator is serialized
+    exactly once into a growing byte buffer and the exact byte length of the final document is
+    tracked as entities are added. The serialized bytes are passed directly to the upload and
+    the gzip writer without any additional serialization. The gzip compressed document is built
+    at most once and shared by the debug/batch file writers and the compressed upload.
+
+    Args:
+        max_count: The max number of entities (groups + indicators) for the chunk.
+        max_size: The max size in bytes of the serialized chunk.
+    """
+
+    __slots__ = [
+        '_compressed',
+        '_full',
+        '_groups',
+        '_indicators',
+        'file',
+        'group_count',
+        'indicator_count',
+        'max_count',
+        'max_size',
+    ]
+
+    # the static parts of the batch JSON document: {"group":[...],"indicator":[...]}
+    _prefix = b'{"group":['
+    _separator = b'],"indicator":['
+    _suffix = b']}'
+    _overhead = len(_prefix) + len(_separator) + len(_suffix)
+
+    def __init__(self, max_count: Optional[int] = None, max_size: Optional[int] = None) -> None:
+        """Initialize Class Properties."""
+        self.max_count = max_count
+        self.max_size = max_size
+
+        # properties
+        self._compressed = None
+        self._full = False
+        self._groups = bytearray()
+        self._indicators = bytearray()
+        self.file = {}
+        self.group_count = 0
+        self.indicator_count = 0
+
+    def _append(self, buffer: bytearray, entity_data: Union[bytes, dict]) -> bool:
+        """Serialize the entity and append it to the provided buffer if it fits in the chunk.
+
+        The first entity is always added, so that an entity larger than the max size is sent
+        in a chunk of its own.
+
+        Args:
+            buffer: The group or indicator buffer.
+            entity_data: The group or indicator data or the previously serialized data.
+        """
+        content = self.serialize(entity_data)
+        if self.count > 0 and not self._fits(buffer, content):
+            self._full = True
+            return False
+
+        if buffer:
+            buffer += b','
+        buffer += content
+        self._compressed = None
+        return True
+
+    def _fits(self, buffer: bytearray, content: bytes) -> bool:
+        """Return True if the serialized entity can be added without exceeding the limits.
+
+        Args:
+            buffer: The group or indicator buffer.
+            content: The serialized group or indicator data.
+        """
+        if self.max_count is not None and self.count + 1 > self.max_count:
+            return False
+        # the entity is preceded by a separator if the buffer is not empty
+        size = self.size + len(content) + (1 if buffer else 0)
+        if self.max_size is not None and size > self.max_size:
+            return False
+        return True
+
+    def _parts(self) -> tuple:
+        """Return the parts of the serialized batch JSON document."""
+        return self._prefix, self._groups, self._separator, self._indicators, self._suffix
+
+    def add_group(self, group_data: Union[bytes, dict]) -> bool:
+        """Add a group to the chunk.
+
+        Args:
+            group_data: The group data or the previously serialized group data.
+
+        Returns:
+            bool: False if the group would exceed the max count or max size (not added).
+        """
+        if not self._append(self._groups, group_data):
+            return False
+        self.group_count += 1
+        return True
+
+    def add_indicator(self, indicator_data: Union[bytes, dict]) -> bool:
+        """Add an indicator to the chunk.
+
+        Args:
+            indicator_data: The indicator data or the previously serialized indicator data.
+
+        Returns:
+            bool: False if the indicator would exceed the max count or max size (not added).
+        """
+        if not self._append(self._indicators, indicator_data):
+            return False
+        self.indicator_count += 1
+        return True
+
+    def compressed(self, compresslevel: Optional[int] = 6) -> bytes:
+        """Return the gzip compressed batch JSON document.
+
+        The document is compressed directly from the serialized buffers in a single pass and
+        cached until another entity is added to the chunk.
+
+        Args:
+            compresslevel: The gzip compression level (1-9).
+        """
+        if self._compressed is None or self._compressed[0] != compresslevel:
+            buffer = io.BytesIO()
+            # mtime is fixed so that the same content always produces the same bytes
+            with gzip.GzipFile(
+                fileobj=buffer, mode='wb', compresslevel=compresslevel, mtime=0
+            ) as fh:
+                for part in self._parts():
+                    fh.write(part)
+            self._compressed = (compresslevel, buffer.getvalue())
+        return self._compressed[1]
+
+    @property
+    def content(self) -> bytes:
+        """Return the serialized batch JSON document."""
+        return b''.join(self._parts())
+
+    @property
+    def count(self) -> int:
+        """Return the number of entities (groups + indicators) in the chunk."""
+        return self.group_count + self.indicator_count
+
+    @property
+    def data(self) -> dict:
+        """Return the chunk as a dict of group, indicator, and file data.
+
+        .. note:: This method is provided for backwards compatibility and parses the
+            serialized content. Prefer using the *content* property directly.
+        """
+        data = json.loads(self.content)
+        data['file'] = self.file
+        return data
+
+    @classmethod
+    def from_data(cls, data: dict) -> 'BatchChunk':
+        """Return a chunk built from a dict of group and indicator data.
+
+        Args:
+            data: The dict of groups and indicator data (e.g., {"group": [], "indicator": []}).
+        """
+        chunk = cls()
+        for group_data in data.get('group') or []:
+            chunk.add_group(group_data)
+        for indicator_data in data.get('indicator') or []:
+            chunk.add_indicator(indicator_data)
+        chunk.file = data.get('file') or {}
+        return chunk
+
+    @property
+    def is_full(self) -> bool:
+        """Return True if the max count or max size for the chunk has been reached.
+
+        The chunk is also full once an entity was not added because it would not fit.
+        """
+        if self._full:
+            return True
+        if self.max_count is not None and self.count >= self.max_count:
+            return True
+        if self.max_size is not None and self.size >= self.max_size:
+            return True
+        return False
+
+    @staticmethod
+    def serialize(entity_data: Union[bytes, dict]) -> bytes:
+        """Return the serialized group or indicator data.
+
+        Args:
+            entity_data: The group or indicator data or the previously serialized data.
+        """
+        if isinstance(entity_data, (bytes, bytearray)):
+            return entity_data
+        return json.dumps(entity_data, separators=(',', ':')).encode('utf-8')
+
+    @property
+    def size(self) -> int:
+        """Return the exact size in bytes of the serialized batch JSON document."""
+        return self._overhead + len(self._groups) + len(self._indicators)
+
+    def __bool__(self) -> bool:
+        """Return True if the chunk contains any groups or indicators."""
+        return self.count > 0
+
+    def __len__(self) -> int:
+        """Return the number of entities (groups + indicators) in the chunk."""
+        return self.count
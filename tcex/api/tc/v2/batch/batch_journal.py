@@ -0,0 +1,161 @@
+"""ThreatConnect Batch Import Module"""
+# standard library
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Optional
+
+# get tcex logger
+logger = logging.getLogger('tcex')
+
+
+class BatchJournal:
+    """ThreatConnect Batch Checkpoint Journal
+
+    Append-only journal (JSON lines) that records the progress of a batch job so that it can
+    be resumed after the App is restarted. Each chunk is identified by a digest of the batch
+    settings and the serialized chunk content, which is reproducible when the same data is
+    added to the batch in the same order with reproducible xids (see generate_xid).
+
+    Journal events:
+
+    * submitted - The chunk was uploaded and the batch id was returned.
+    * completed - The batch job for the chunk has completed (includes the batch status).
+    * file - The file for a Document or Report was uploaded.
+
+    Args:
+        fqfn: The fully qualified filename of the journal.
+    """
+
+    def __init__(self, fqfn: str) -> None:
+        """Initialize Class properties."""
+        self.fqfn = fqfn
+        self.log = logger
+
+        # properties
+        self._chunks = {}  # digest -> chunk state
+        self._files = set()  # xids of uploaded files
+        self._lock = threading.Lock()
+
+        # replay any existing journal
+        self._load()
+
+    def _load(self) -> None:
+        """Load the chunk and file state from an existing journal."""
+        if not os.path.isfile(self.fqfn):
+            return
+
+        with open(self.fqfn, encoding='utf-8') as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # the last entry may be incomplete if the App was terminated while writing
+                    continue
+                self._apply(entry)
+
+        self.log.info(
+            f'feature=batch-journal, event=resume, filename={self.fqfn}, '
+            f'chunks={len(self._chunks):,}, files={len(self._files):,}'
+        )
+
+    def _apply(self, entry: dict) -> None:
+        """Apply a journal entry to the chunk and file state.
+
+        Args:
+            entry: The journal entry.
+        """
+        event = entry.get('event')
+        if event == 'file':
+            self._files.add(entry.get('xid'))
+        elif event in ['completed', 'submitted']:
+            self._chunks[entry.get('digest')] = entry
+
+    def _write(self, entry: dict) -> None:
+        """Append an entry to the journal.
+
+        Args:
+            entry: The journal entry.
+        """
+        with self._lock:
+            self._apply(entry)
+            with open(self.fqfn, 'a', encoding='utf-8') as fh:
+                fh.write(f'{json.dumps(entry)}\n')
+                fh.flush()
+                os.fsync(fh.fileno())
+
+    def chunk(self, digest: str) -> Optional[dict]:
+        """Return the latest journal entry for the chunk.
+
+        Args:
+            digest: The digest of the chunk.
+        """
+        return self._chunks.get(digest)
+
+    def completed(self, digest: str, batch_id: Optional[int], batch_status: dict) -> None:
+        """Record that the batch job for the chunk has completed.
+
+        Args:
+            digest: The digest of the chunk.
+            batch_id: The batch id of the batch job.
+            batch_status: The final batch status.
+        """
+        self._write(
+            {
+                'batch_id': batch_id,
+                'batch_status': batch_status,
+                'digest': digest,
+                'event': 'completed',
+            }
+        )
+
+    @staticmethod
+    def digest(content: bytes, settings: dict) -> str:
+        """Return the digest for the chunk content and batch settings.
+
+        Args:
+            content: The serialized chunk content.
+            settings: The batch job settings.
+        """
+        digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8'))
+        digest.update(content)
+        return digest.hexdigest()
+
+    def file(self, xid: str) -> None:
+        """Record that the file for a Document or Report was uploaded.
+
+        Args:
+            xid: The xid of the Document or Report.
+        """
+        self._write({'event': 'file', 'xid': xid})
+
+    def file_uploaded(self, xid: str) -> bool:
+        """Return True if the file for a Document or Report was previously uploaded.
+
+        Args:
+            xid: The xid of the Document or Report.
+        """
+        return xid in self._files
+
+    def remove(self) -> None:
+        """Remove the journal once the batch job is complete."""
+        with self._lock:
+            self._chunks = {}
+            self._files = set()
+            try:
+                os.unlink(self.fqfn)
+            except FileNotFoundError:
+                pass
+            except OSError as ex:
+                self.log.warning(f'feature=batch-journal, filename={self.fqfn}, exception={ex}')
+
+    def submitted(self, digest: str, batch_id: int) -> None:
+        """Record that the chunk was uploaded.
+
+        Args:
+            digest: The digest of the chunk.
+            batch_id: The batch id returned by the ThreatConnect API.
+        """
+        self._write({'batch_id': batch_id, 'digest': digest, 'event': 'submitted'})
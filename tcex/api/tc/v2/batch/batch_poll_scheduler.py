@@ -0,0 +1,215 @@
+"""ThreatConnect Batch Import Module"""
+# standard library
+import logging
+import threading
+import time
+from typing import Optional
+
+# first-party
+from tcex.pleb.singleton import Singleton
+
+# get tcex logger
+logger = logging.getLogger('tcex')
+
+
+class BatchPollScheduler(metaclass=Singleton):
+    """ThreatConnect Batch Poll Scheduler
+
+    Schedules batch status polls near the predicted completion time of each batch job. The
+    processing rate (entities per second) of the ThreatConnect API is estimated from the
+    progress (successCount, errorCount, and unprocessCount) reported in successive batch status
+    responses and from the total duration of completed batch jobs. The delay before a queued
+    batch job starts processing is learned from completed batch jobs.
+
+    The scheduler is a process-wide singleton so that all Batch instances learn together.
+
+    Args:
+        min_interval: The minimum number of seconds between polls of a batch job.
+        max_interval: The maximum number of seconds between polls of a batch job.
+    """
+
+    # smoothing factor for the exponentially weighted moving averages
+    alpha = 0.3
+
+    # multiplier of the poll interval for each poll after the predicted completion time
+    back_off = 1.5
+
+    def __init__(self, min_interval: Optional[float] = 2, max_interval: Optional[float] = 20):
+        """Initialize Class properties."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.log = logger
+
+        # properties
+        self._jobs = {}  # batch id -> job progress
+        self._lock = threading.Lock()
+        self.overhead = 5.0  # seconds before a queued batch job starts processing
+        self.rate = 300.0  # entities processed per second
+
+    @staticmethod
+    def _job(count: Optional[int], now: float) -> dict:
+        """Return the initial progress of a batch job.
+
+        Args:
+            count: The number of entities (groups + indicators) in the batch job.
+            now: The current time.
+        """
+        return {
+            'back_off': None,
+            'count': count,
+            'misses': 0,
+            'polls': 0,
+            'processed': 0,
+            'rate': None,
+            'submitted': now,
+            'updated': now,
+        }
+
+    @staticmethod
+    def _processed(batch_status: dict) -> int:
+        """Return the number of processed entities from the batch status.
+
+        Args:
+            batch_status: The batch status from the ThreatConnect API.
+        """
+        return (
+            (batch_status.get('successCount') or 0)
+            + (batch_status.get('errorCount') or 0)
+            + (batch_status.get('unprocessCount') or 0)
+        )
+
+    def _ewma(self, current: float, sample: float) -> float:
+        """Return the updated exponentially weighted moving average.
+
+        Args:
+            current: The current average.
+            sample: The new sample.
+        """
+        return current + self.alpha * (sample - current)
+
+    def _interval(self, job: dict, now: float) -> float:
+        """Return the number of seconds until the predicted completion of the batch job.
+
+        Args:
+            job: The job progress.
+            now: The current time.
+        """
+        rate = job.get('rate') or self.rate
+        if job.get('count') is None:
+            # without a count assume the job will take as long as the learned overhead
+            remaining = self.overhead - (now - job.get('submitted'))
+        elif job.get('processed'):
+            remaining = (job.get('count') - job.get('processed')) / rate - (
+                now - job.get('updated')
+            )
+        else:
+            remaining = self.overhead + job.get('count') / rate - (now - job.get('submitted'))
+
+        if remaining <= 0:
+            # the predicted completion time has passed, back off from the min interval
+            remaining = self.min_interval * (job.get('back_off') or self.back_off) ** job.get(
+                'misses'
+            )
+            job['misses'] += 1
+        return min(max(remaining, self.min_interval), self.max_interval)
+
+    def complete(self, batch_id: int, batch_status: Optional[dict] = None) -> None:
+        """Record the completion of a batch job and update the learned rate and overhead.
+
+        Args:
+            batch_id: The ID returned from the ThreatConnect API for the batch job.
+            batch_status: The final batch status from the ThreatConnect API.
+        """
+        now = time.time()
+        with self._lock:
+            job = self._jobs.pop(batch_id, None)
+            if job is None:
+                return
+
+            duration = now - job.get('submitted')
+            count = job.get('count')
+            if count is None and batch_status:
+                count = self._processed(batch_status)
+            if not count:
+                return
+
+            # the completion time is only known within the last poll interval, only use the
+            # duration when the job was not completed on the first poll.
+            if job.get('polls') > 0:
+                processing = count / (job.get('rate') or self.rate)
+                self.overhead = self._ewma(self.overhead, max(duration - processing, 0))
+            elif duration < self.overhead + count / self.rate:
+                # completed sooner than predicted, shrink the overhead towards the duration
+                self.overhead = self._ewma(self.overhead, max(duration - count / self.rate, 0))
+
+            self.log.debug(
+                f'feature=batch-poll-scheduler, event=complete, batch-id={batch_id}, '
+                f'count={count}, duration={duration:.2f}, overhead={self.overhead:.2f}, '
+                f'rate={self.rate:.2f}'
+            )
+
+    def discard(self, batch_id: int) -> None:
+        """Remove a batch job without updating the learned rate and overhead.
+
+        Args:
+            batch_id: The ID returned from the ThreatConnect API for the batch job.
+        """
+        with self._lock:
+            self._jobs.pop(batch_id, None)
+
+    def interval(self, batch_id: int, back_off: Optional[float] = None) -> float:
+        """Return the seconds until the first poll of a batch job.
+
+        Args:
+            batch_id: The ID returned from the ThreatConnect API for the batch job.
+            back_off: The multiplier of the poll interval for each poll after the predicted
+                completion time (defaults to the back_off class attribute).
+        """
+        now = time.time()
+        with self._lock:
+            job = self._jobs.setdefault(batch_id, self._job(None, now))
+            job['back_off'] = back_off
+            return self._interval(job, now)
+
+    def register(self, batch_id: int, count: Optional[int] = None) -> None:
+        """Register a submitted batch job.
+
+        Args:
+            batch_id: The ID returned from the ThreatConnect API for the batch job.
+            count: The number of entities (groups + indicators) in the batch job.
+        """
+        now = time.time()
+        with self._lock:
+            self._jobs[batch_id] = self._job(count, now)
+
+    def update(self, batch_id: int, batch_status: dict) -> float:
+        """Record the progress of a batch job and return the seconds until the next poll.
+
+        Args:
+            batch_id: The ID returned from the ThreatConnect API for the batch job.
+            batch_status: The batch status from the ThreatConnect API.
+        """
+        now = time.time()
+        with self._lock:
+            # batch job may not be registered (e.g., poll called directly with a batch id)
+            job = self._jobs.setdefault(batch_id, self._job(None, now))
+            job['polls'] += 1
+
+            processed = self._processed(batch_status)
+            if processed > job.get('processed'):
+                if job.get('processed'):
+                    # progress between two polls provides a rate sample
+                    rate = (processed - job.get('processed')) / max(now - job.get('updated'), 1e-3)
+                    job['rate'] = rate if job.get('rate') is None else self._ewma(job['rate'], rate)
+                    self.rate = self._ewma(self.rate, rate)
+                job['misses'] = 0
+                job['processed'] = processed
+                job['updated'] = now
+
+            interval = self._interval(job, now)
+            self.log.debug(
+                f'feature=batch-poll-scheduler, event=update, batch-id={batch_id}, '
+                f'processed={processed}, count={job.get("count")}, '
+                f'rate={job.get("rate") or self.rate:.2f}, interval={interval:.2f}'
+            )
+            return interval
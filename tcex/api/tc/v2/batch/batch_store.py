@@ -0,0 +1,359 @@
+"""ThreatConnect Batch Import Module"""
+# standard library
+import glob
+import json
+import logging
+import os
+import struct
+import threading
+from typing import Any, Iterator, Optional, Tuple, Union
+
+# first-party
+from tcex.api.tc.v2.batch import group as group_module
+from tcex.api.tc.v2.batch import indicator as indicator_module
+from tcex.api.tc.v2.batch.group import Group
+from tcex.api.tc.v2.batch.indicator import Indicator
+
+# get tcex logger
+logger = logging.getLogger('tcex')
+
+
+class BatchStore:
+    """ThreatConnect Batch Entity Store
+
+    Append-only, indexed on-disk store for groups and indicators spilled out of memory by the
+    batch module. Each entity is serialized to JSON exactly once and appended to a segment file,
+    while an in-memory index maps the xid to the location of the serialized data. Deleting an
+    entity appends a tombstone record and once every entity in the oldest segment files has been
+    consumed the segment files are removed, reclaiming the disk space.
+
+    Existing segment files for the provided filename are replayed on open, which allows a
+    previous store to be copied into the tc_temp_path directory for testing/debugging.
+
+    .. note:: File content for Document and Report groups (e.g., a callback method) can not be
+        serialized and is held in memory, keyed by xid.
+
+    Args:
+        fqfn: The fully qualified filename (prefix) for the segment files.
+        segment_size: The size in bytes at which a new segment file is started.
+    """
+
+    # record header: flag, key length, class name length, value length
+    _header = struct.Struct('<BIHI')
+    _flag_put = 0
+    _flag_tombstone = 1
+
+    def __init__(self, fqfn: str, segment_size: Optional[int] = 64_000_000) -> None:
+        """Initialize Class properties."""
+        self.fqfn = fqfn
+        self.segment_size = segment_size
+        self.log = logger
+
+        # properties
+        self._classes = {}  # class name -> class, for entity classes stored in this process
+        self._file_content = {}  # xid -> file content
+        self._handles = {}  # segment -> open file handle
+        self._index = {}  # xid -> (segment, offset, length, class name)
+        self._live = {}  # segment -> number of live entities
+        self._lock = threading.Lock()
+        self._segment = 0  # active segment
+
+        # replay any existing segment files
+        self._load()
+
+    def _entity(self, key: str, value: bytes, class_name: str) -> Union[dict, Group, Indicator]:
+        """Return the dict or Group/Indicator object for the serialized entity.
+
+        Args:
+            key: The xid of the entity.
+            value: The serialized entity data.
+            class_name: The class name of the entity or an empty string for dict entities.
+        """
+        data = json.loads(value)
+        file_content = self._file_content.get(key)
+
+        entity_class = self._entity_class(class_name)
+        if entity_class is None:
+            if file_content is not None:
+                data['fileContent'] = file_content
+            return data
+
+        # rebuild the object from the serialized data without calling the subclass __init__,
+        # which have type specific signatures (e.g., File hashes or custom indicator values).
+        entity = entity_class.__new__(entity_class)
+        if issubclass(entity_class, Group):
+            Group.__init__(entity, data.pop('type'), data.pop('name'), **data)
+            if file_content is not None:
+                entity.add_file(data.get('fileName'), file_content)
+        else:
+            Indicator.__init__(entity, data.pop('type'), data.pop('summary'), **data)
+        return entity
+
+    def _entity_class(self, class_name: str) -> Optional[type]:
+        """Return the Group/Indicator class for the provided class name.
+
+        Args:
+            class_name: The class name of the entity.
+        """
+        if not class_name:
+            return None
+
+        entity_class = self._classes.get(class_name)
+        if entity_class is None:
+            # entity was replayed from a previous store
+            entity_class = getattr(group_module, class_name, None) or getattr(
+                indicator_module, class_name, None
+            )
+        if not isinstance(entity_class, type) or not issubclass(entity_class, (Group, Indicator)):
+            return None
+        return entity_class
+
+    def _handle(self, segment: int):
+        """Return the file handle for the provided segment, opening it if required.
+
+        Args:
+            segment: The segment number.
+        """
+        fh = self._handles.get(segment)
+        if fh is None:
+            fqfn = self._segment_fqfn(segment)
+            mode = 'r+b' if os.path.isfile(fqfn) else 'w+b'
+            fh = open(fqfn, mode)  # pylint: disable=consider-using-with
+            self._handles[segment] = fh
+        return fh
+
+    def _load(self) -> None:
+        """Rebuild the index from any existing segment files."""
+        segments = []
+        for fqfn in glob.glob(f'{glob.escape(self.fqfn)}-*.seg'):
+            try:
+                segments.append(int(fqfn.rsplit('-', 1)[-1][:-4]))
+            except ValueError:
+                continue
+
+        for segment in sorted(segments):
+            self._live.setdefault(segment, 0)
+            with open(self._segment_fqfn(segment), 'rb') as fh:
+                while True:
+                    header = fh.read(self._header.size)
+                    if len(header) < self._header.size:
+                        break
+                    flag, key_len, class_len, value_len = self._header.unpack(header)
+                    key = fh.read(key_len).decode('utf-8')
+                    class_name = fh.read(class_len).decode('utf-8')
+                    offset = fh.tell()
+                    fh.seek(value_len, os.SEEK_CUR)
+
+                    self._unindex(key)
+                    if flag == self._flag_put:
+                        self._index[key] = (segment, offset, value_len, class_name)
+                        self._live[segment] += 1
+
+        if segments:
+            # always append to a new segment
+            self._segment = max(segments) + 1
+            self.log.debug(
+                f'feature=batch-store, event=replay, filename={self.fqfn}, count={len(self):,}'
+            )
+
+    def _read(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """Return the serialized data and class name for the provided key.
+
+        Args:
+            key: The xid of the entity.
+        """
+        location = self._index.get(key)
+        if location is None:
+            return None
+
+        segment, offset, length, class_name = location
+        with self._lock:
+            fh = self._handle(segment)
+            fh.seek(offset)
+            return fh.read(length), class_name
+
+    def _reclaim(self) -> None:
+        """Remove the oldest segment files once all of their entities have been consumed.
+
+        Segment files are only removed from the head so that tombstones in newer segments are
+        never orphaned when the store is replayed.
+        """
+        for segment in sorted(self._live):
+            if segment == self._segment or self._live[segment] > 0:
+                break
+
+            with self._lock:
+                fh = self._handles.pop(segment, None)
+                if fh is not None:
+                    fh.close()
+            try:
+                os.unlink(self._segment_fqfn(segment))
+            except OSError:
+                pass
+            del self._live[segment]
+
+    def _segment_fqfn(self, segment: int) -> str:
+        """Return the fully qualified filename for the provided segment.
+
+        Args:
+            segment: The segment number.
+        """
+        return f'{self.fqfn}-{segment:05d}.seg'
+
+    def _unindex(self, key: str) -> None:
+        """Remove the key from the index updating the live count of its segment.
+
+        Args:
+            key: The xid of the entity.
+        """
+        location = self._index.pop(key, None)
+        if location is not None:
+            self._live[location[0]] -= 1
+
+    def _write(self, flag: int, key: str, class_name: str = '', value: bytes = b'') -> int:
+        """Append a record to the active segment and return the offset of the value.
+
+        Args:
+            flag: The record type (put or tombstone).
+            key: The xid of the entity.
+            class_name: The class name of the entity.
+            value: The serialized entity data.
+        """
+        key_bytes = key.encode('utf-8')
+        class_bytes = class_name.encode('utf-8')
+        with self._lock:
+            fh = self._handle(self._segment)
+            self._live.setdefault(self._segment, 0)
+            fh.seek(0, os.SEEK_END)
+            offset = fh.tell() + self._header.size + len(key_bytes) + len(class_bytes)
+            fh.write(self._header.pack(flag, len(key_bytes), len(class_bytes), len(value)))
+            fh.write(key_bytes)
+            fh.write(class_bytes)
+            fh.write(value)
+            return offset
+
+    def close(self) -> None:
+        """Close all segment files."""
+        with self._lock:
+            for fh in self._handles.values():
+                fh.close()
+            self._handles = {}
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        """Return the entity for the provided key or the default value.
+
+        Args:
+            key: The xid of the entity.
+            default: The value to return if the key is not found.
+        """
+        record = self._read(key)
+        if record is None:
+            return default
+        return self._entity(key, *record)
+
+    def items(self) -> Iterator[Tuple[str, Union[dict, Group, Indicator]]]:
+        """Yield the key and entity for all entities in the order they were stored."""
+        for key in self.keys():
+            entity = self.get(key)
+            if entity is not None:
+                yield key, entity
+
+    def keys(self) -> list:
+        """Return all keys in the order they were stored."""
+        return list(self._index)
+
+    def pop_content(self, key: str) -> Tuple[Optional[bytes], Any]:
+        """Remove the entity and return its serialized data and file content.
+
+        This method avoids rebuilding the entity and is used when building batch chunks.
+
+        Args:
+            key: The xid of the entity.
+
+        Returns:
+            Tuple[Optional[bytes], Any]: The serialized entity data and file content.
+        """
+        record = self._read(key)
+        if record is None:
+            return None, None
+        file_content = self._file_content.get(key)
+        del self[key]
+        return record[0], file_content
+
+    def remove(self) -> None:
+        """Close and remove all segment files."""
+        self.close()
+        for fqfn in glob.glob(f'{glob.escape(self.fqfn)}-*.seg'):
+            try:
+                os.unlink(fqfn)
+            except OSError as ex:
+                self.log.warning(f'feature=batch-store, filename={fqfn}, exception={ex}')
+        self._file_content = {}
+        self._index = {}
+        self._live = {}
+
+    def values(self) -> Iterator[Union[dict, Group, Indicator]]:
+        """Yield all entities in the order they were stored."""
+        for _, entity in self.items():
+            yield entity
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if the key is in the store."""
+        return key in self._index
+
+    def __delitem__(self, key: str) -> None:
+        """Remove the entity from the store by appending a tombstone."""
+        if key not in self._index:
+            raise KeyError(key)
+
+        self._write(self._flag_tombstone, key)
+        self._unindex(key)
+        self._file_content.pop(key, None)
+        self._reclaim()
+
+    def __getitem__(self, key: str) -> Union[dict, Group, Indicator]:
+        """Return the entity for the provided key."""
+        record = self._read(key)
+        if record is None:
+            raise KeyError(key)
+        return self._entity(key, *record)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over all keys in the order they were stored."""
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        """Return the number of entities in the store."""
+        return len(self._index)
+
+    def __setitem__(self, key: str, resource: Union[dict, Group, Indicator]) -> None:
+        """Serialize and append the entity to the store."""
+        class_name = ''
+        file_content = None
+        if isinstance(resource, dict):
+            file_content = resource.get('fileContent')
+            if file_content is not None:
+                # file content is not part of Group JSON
+                resource = {k: v for k, v in resource.items() if k != 'fileContent'}
+            data = resource
+        else:
+            class_name = type(resource).__name__
+            self._classes[class_name] = type(resource)
+            if isinstance(resource, Group):
+                file_content = resource.file_data.get('fileContent')
+            data = resource.data
+        value = json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+        offset = self._write(self._flag_put, key, class_name, value)
+        self._unindex(key)
+        self._index[key] = (self._segment, offset, len(value), class_name)
+        self._live[self._segment] += 1
+        if file_content is not None:
+            self._file_content[key] = file_content
+        else:
+            self._file_content.pop(key, None)
+        self._reclaim()
+
+        # start a new segment once the max segment size has been reached
+        if offset + len(value) >= self.segment_size:
+            self._segment += 1
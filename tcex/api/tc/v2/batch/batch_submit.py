@@ -3,15 +3,16 @@
 import gzip
 import json
 import logging
-import math
 import re
 import time
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, List, Optional, Union
 
 # third-party
 from requests import Session
 
 # first-party
+from tcex.api.tc.v2.batch.batch_chunk import BatchChunk
+from tcex.api.tc.v2.batch.batch_poll_scheduler import BatchPollScheduler
 from tcex.exit.error_codes import handle_error
 from tcex.input.input import Input
 
@@ -60,6 +61,7 @@ class BatchSubmit:
         # properties
         self._file_merge_mode = None
         self._hash_collision_mode = None
+        self.gzip_upload = False  # upload gzip compressed batch content
         self.log = logger
 
         # global overrides on batch/file errors
@@ -67,9 +69,6 @@ class BatchSubmit:
         self._halt_on_poll_error = None
 
         # default properties
-        self._batch_data_count = None
-        self._poll_interval = None
-        self._poll_interval_times = []
         self._poll_timeout = 3600
 
     @property
@@ -80,6 +79,61 @@ class BatchSubmit:
             'would exceed the number of allowed indicators',
         ]
 
+    def _poll_status(self, batch_id: int, halt_on_error: bool) -> Optional[dict]:
+        """Return the batch status response or None if the request failed.
+
+        Args:
+            batch_id: The ID returned from the ThreatConnect API for the current batch job.
+            halt_on_error: If True any exception will raise an error.
+        """
+        params = {'includeAdditional': 'true'}
+        data = {}
+        try:
+            r = self.session_tc.get(f'/v2/batch/{batch_id}', params=params)
+            if not r.ok or 'application/json' not in r.headers.get('content-type', ''):
+                handle_error(
+                    code=545,
+                    message_values=[r.status_code, r.text],
+                    raise_error=halt_on_error,
+                )
+                return None
+            data = r.json()
+            if data.get('status') != 'Success':
+                handle_error(
+                    code=545,
+                    message_values=[r.status_code, r.text],
+                    raise_error=halt_on_error,
+                )
+        except Exception as e:
+            handle_error(code=540, message_values=[e], raise_error=halt_on_error)
+        return data
+
+    def _submit_create_and_upload(
+        self, content: Union[bytes, BinaryIO], gzip_upload: bool, halt_on_error: bool
+    ) -> dict:
+        """Send the batch settings and content to the createAndUpload endpoint.
+
+        Args:
+            content: The serialized batch JSON document or the gzip compressed document.
+            gzip_upload: If True the content is gzip compressed.
+            halt_on_error: If True the process should halt if any errors are encountered.
+        """
+        content_part = content
+        if gzip_upload:
+            # the compressed document is sent as a gzip file part (no decode/re-encode)
+            content_part = ('batch.json.gz', content, 'application/gzip')
+
+        files = (('config', json.dumps(self.settings)), ('content', content_part))
+        params = {'includeAdditional': 'true'}
+        r = self.session_tc.post('/v2/batch/createAndUpload', files=files, params=params)
+        if not r.ok or 'application/json' not in r.headers.get('content-type', ''):
+            handle_error(
+                code=10510,
+                message_values=[r.status_code, r.text],
+                raise_error=halt_on_error,
+            )
+        return r.json()
+
     @property
     def action(self) -> str:
         """Return batch action."""
@@ -258,6 +312,9 @@ class BatchSubmit:
     ) -> dict:
         """Poll Batch status to ThreatConnect API.
 
+        The time between polls is scheduled by the process-wide BatchPollScheduler, which
+        predicts the completion time of the batch job from the progress reported by the API.
+
         .. code-block:: javascript
 
             {
@@ -275,9 +332,9 @@ class BatchSubmit:
 
         Args:
             batch_id: The ID returned from the ThreatConnect API for the current batch job.
-            retry_seconds: The base number of seconds used for retries when job is not completed.
-            back_off: A multiplier to use for backing off on
-                each poll attempt when job has not completed.
+            retry_seconds: The minimum number of seconds between polls when job is not completed.
+            back_off: A multiplier to use for backing off on each poll attempt after the
+                predicted completion time when job has not completed.
             timeout: The number of seconds before the poll should timeout.
             halt_on_error: If True any exception will raise an error.
 
@@ -288,90 +345,77 @@ class BatchSubmit:
         if self.halt_on_poll_error is not None:
             halt_on_error = self.halt_on_poll_error
 
-        # initial poll interval
-        if self._poll_interval is None and self._batch_data_count is not None:
-            # calculate poll_interval base off the number of entries in the batch data
-            # with a minimum value of 5 seconds.
-            self._poll_interval = max(math.ceil(self._batch_data_count / 300), 5)
-        elif self._poll_interval is None:
-            # if not able to calculate poll_interval default to 15 seconds
-            self._poll_interval = 15
-
-        # poll retry back_off factor
-        poll_interval_back_off = float(2.5 if back_off is None else back_off)
-
-        # poll retry seconds
-        poll_retry_seconds = int(5 if retry_seconds is None else retry_seconds)
-
         # poll timeout
         if timeout is None:
             timeout = self.poll_timeout
         else:
             timeout = int(timeout)
-        params = {'includeAdditional': 'true'}
 
-        poll_count = 0
+        poll_interval = self.poll_scheduler.interval(batch_id, back_off)
         poll_time_total = 0
         data = {}
-        while True:
-            poll_count += 1
-            poll_time_total += self._poll_interval
-            time.sleep(self._poll_interval)
-            self.log.info(f'feature=batch, event=progress, poll-time={poll_time_total}')
-            try:
+        try:
+            while True:
+                if retry_seconds is not None:
+                    poll_interval = max(poll_interval, int(retry_seconds))
+                poll_time_total += poll_interval
+                time.sleep(poll_interval)
+                self.log.info(
+                    f'feature=batch, event=progress, poll-time={poll_time_total:.2f}, '
+                    f'poll-interval={poll_interval:.2f}'
+                )
+
                 # retrieve job status
-                r = self.session_tc.get(f'/v2/batch/{batch_id}', params=params)
-                if not r.ok or 'application/json' not in r.headers.get('content-type', ''):
-                    handle_error(
-                        code=545,
-                        message_values=[r.status_code, r.text],
-                        raise_error=halt_on_error,
-                    )
+                response = self._poll_status(batch_id, halt_on_error)
+                if response is None:
                     return data
-                data = r.json()
-                if data.get('status') != 'Success':
-                    handle_error(
-                        code=545,
-                        message_values=[r.status_code, r.text],
-                        raise_error=halt_on_error,
-                    )
-            except Exception as e:
-                handle_error(code=540, message_values=[e], raise_error=halt_on_error)
-
-            if data.get('data', {}).get('batchStatus', {}).get('status') == 'Completed':
-                # store last 5 poll times to use in calculating average poll time
-                modifier = poll_time_total * 0.7
-                self._poll_interval_times = self._poll_interval_times[-4:] + [modifier]
-
-                weights = [1]
-                poll_interval_time_weighted_sum = 0
-                for poll_interval_time in self._poll_interval_times:
-                    poll_interval_time_weighted_sum += poll_interval_time * weights[-1]
-                    # weights will be [1, 1.5, 2.25, 3.375, 5.0625] for all 5 poll times depending
-                    # on how many poll times are available.
-                    weights.append(weights[-1] * 1.5)
-
-                # pop off the last weight so its not added in to the sum
-                weights.pop()
-
-                # calculate the weighted average of the last 5 poll times
-                self._poll_interval = math.floor(poll_interval_time_weighted_sum / sum(weights))
-
-                if poll_count == 1:
-                    # if completed on first poll, reduce poll interval.
-                    self._poll_interval = self._poll_interval * 0.85
-
-                self.log.debug(f'feature=batch, poll-time={poll_time_total}, status={data}')
-                return data
-
-            # update poll_interval for retry with max poll time of 20 seconds
-            self._poll_interval = min(
-                poll_retry_seconds + int(poll_count * poll_interval_back_off), 20
-            )
+                data = response
+
+                batch_status = data.get('data', {}).get('batchStatus', {})
+                if batch_status.get('status') == 'Completed':
+                    self.poll_scheduler.complete(batch_id, batch_status)
+                    self.log.debug(f'feature=batch, poll-time={poll_time_total:.2f}, status={data}')
+                    return data
+
+                # schedule the next poll near the predicted completion time
+                poll_interval = self.poll_scheduler.update(batch_id, batch_status)
+
+                # time out poll to prevent App running indefinitely
+                if poll_time_total >= timeout:
+                    handle_error(code=550, message_values=[timeout], raise_error=True)
+        finally:
+            # remove the job of a failed or timed out poll (no-op if completed)
+            self.poll_scheduler.discard(batch_id)
+
+    @property
+    def poll_scheduler(self) -> BatchPollScheduler:
+        """Return the process-wide batch poll scheduler."""
+        return BatchPollScheduler()
+
+    def poll_status(self, batch_id: int, halt_on_error: Optional[bool] = True) -> Optional[dict]:
+        """Return the current Batch status from the ThreatConnect API without waiting.
+
+        Args:
+            batch_id: The ID returned from the ThreatConnect API for the current batch job.
+            halt_on_error: If True any exception will raise an error.
+
+        Returns:
+            dict: The batch status or None if the status could not be retrieved.
+        """
+        # check global setting for override
+        if self.halt_on_poll_error is not None:
+            halt_on_error = self.halt_on_poll_error
 
-            # time out poll to prevent App running indefinitely
-            if poll_time_total >= timeout:
-                handle_error(code=550, message_values=[timeout], raise_error=True)
+        data = self._poll_status(batch_id, halt_on_error)
+        if data is None:
+            return None
+
+        batch_status = data.get('data', {}).get('batchStatus', {})
+        self.log.debug(
+            f'''feature=batch, event=poll-status, batch-id={batch_id}, '''
+            f'''status={batch_status.get('status')}'''
+        )
+        return batch_status
 
     @property
     def poll_timeout(self) -> int:
@@ -412,56 +456,59 @@ class BatchSubmit:
             _settings['fileMergeMode'] = self._file_merge_mode
         return _settings
 
-    def submit(self, batch_filename: str, halt_on_error: Optional[bool] = True) -> dict:
+    def submit(
+        self,
+        batch_filename: str,
+        halt_on_error: Optional[bool] = True,
+        gzip_upload: Optional[bool] = None,
+    ) -> dict:
         """Submit Batch request to ThreatConnect API.
 
+        The gzip compressed batch JSON file (e.g., the output of BatchWriter) is sent without
+        being parsed or re-serialized. When gzip_upload is enabled the compressed file is
+        streamed directly to the API as a gzip content part, otherwise it is decompressed once.
+
         Args:
             batch_filename: The filename for the batch JSON file.
             halt_on_error: If True the process should halt if any errors are encountered.
+            gzip_upload: If True upload the compressed file, defaults to the gzip_upload property.
 
         Returns.
             dict: The Batch Status from the ThreatConnect API.
         """
-        content = gzip.open(batch_filename, 'rt').read()
-
         # check global setting for override
         if self.halt_on_batch_error is not None:
             halt_on_error = self.halt_on_batch_error
 
-        # store the length of the batch data to use for poll interval calculations
-        self.log.info(
-            '''feature=batch, event=submit-create-and-upload, type=group, '''
-            f'''count={len(content.get('group')):,}'''
-        )
+        if gzip_upload is None:
+            gzip_upload = self.gzip_upload
+
         self.log.info(
-            '''feature=batch, event=submit-create-and-upload, type=indicator, '''
-            f'''count={len(content.get('indicator')):,}'''
+            '''feature=batch, event=submit-create-and-upload, '''
+            f'''filename={batch_filename}, gzip-upload={gzip_upload}'''
         )
 
-        files = (('config', json.dumps(self.settings)), ('content', json.dumps(content)))
-        params = {'includeAdditional': 'true'}
         try:
-            r = self.session_tc.post('/v2/batch/createAndUpload', files=files, params=params)
-            if not r.ok or 'application/json' not in r.headers.get('content-type', ''):
-                handle_error(
-                    code=10510,
-                    message_values=[r.status_code, r.text],
-                    raise_error=halt_on_error,
-                )
-            return r.json()
+            with open(batch_filename, 'rb') as fh:
+                content = fh if gzip_upload else gzip.GzipFile(fileobj=fh).read()
+                return self._submit_create_and_upload(content, gzip_upload, halt_on_error)
         except Exception as e:
             handle_error(code=10505, message_values=[e], raise_error=halt_on_error)
 
         return {}
 
     def submit_data(
-        self, batch_id: int, content: dict, halt_on_error: Optional[bool] = True
+        self,
+        batch_id: int,
+        content: Union[BatchChunk, bytes, dict],
+        halt_on_error: Optional[bool] = True,
     ) -> dict:
         """Submit Batch request to ThreatConnect API.
 
         Args:
             batch_id: The batch id of the current job.
-            content: The dict of groups and indicator data.
+            content: The chunk of serialized batch data (BatchChunk), the serialized batch JSON
+                document (e.g., BatchChunk.content), or the dict of groups and indicator data.
             halt_on_error (Optional[bool] = True): If True the process
                 should halt if any errors are encountered.
 
@@ -472,6 +519,13 @@ class BatchSubmit:
         if self.halt_on_batch_error is not None:
             halt_on_error = self.halt_on_batch_error
 
+        if isinstance(content, dict):
+            # serialize user provided content
+            content = BatchChunk.from_data(content)
+        if isinstance(content, BatchChunk):
+            # the pre-serialized chunk content is sent as-is
+            content = content.content
+
         # store the length of the batch data to use for poll interval calculations
         # self._batch_data_count = len(content.get('group')) + len(content.get('indicator'))
         # self.log.info(
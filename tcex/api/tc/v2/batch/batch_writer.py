@@ -1,23 +1,23 @@
 """ThreatConnect Batch Import Module."""
 # standard library
-import gzip
 import hashlib
 import json
 import logging
 import os
 import re
-import shelve  # nosec
-import sys
 import time
 import uuid
 from collections import deque
-from typing import Optional, Tuple, Union
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
 
 # third-party
 from requests import Session
 
 # first-party
 from tcex.api.tc.utils.threat_intel_utils import ThreatIntelUtils
+from tcex.api.tc.v2.batch.batch_chunk import BatchChunk
+from tcex.api.tc.v2.batch.batch_store import BatchStore
+from tcex.api.tc.v2.batch.bulk_indicator import BulkIndicators
 from tcex.api.tc.v2.batch.group import (
     Adversary,
     Campaign,
@@ -54,6 +54,9 @@ module = __import__(__name__)
 # get tcex logger
 logger = logging.getLogger('tcex')
 
+# local reference for xid generation
+_sha256 = hashlib.sha256
+
 # define GroupType
 GroupType = Union[
     Adversary,
@@ -106,8 +109,8 @@ class BatchWriter:
         # properties
         self._batch_files = []
         self._batch_max_chunk = 100_000
-        self._batch_size = 0  # track current batch size
         self._batch_max_size = 75_000_000  # max size in bytes
+        self._chunk_carry: Optional[dict] = None  # the entity that did not fit in the last chunk
         self.log = logger
         self.tic = ThreatIntelUtils(self.session_tc)
         self.utils = Utils()
@@ -120,11 +123,72 @@ class BatchWriter:
         self._groups = None
         self._groups_shelf = None
         self._indicators = None
+        self._indicators_bulk = None
         self._indicators_shelf = None
 
         # build custom indicator classes
         self._gen_indicator_class()
 
+    def _chunk_add(
+        self,
+        chunk: BatchChunk,
+        entity_type: str,
+        content: bytes,
+        xid: Optional[str] = None,
+        file_data: Optional[dict] = None,
+        xids: Optional[list] = None,
+    ) -> bool:
+        """Add the serialized entity to the chunk or carry it over to the next chunk.
+
+        Args:
+            chunk: The chunk to update with group or indicator and file data.
+            entity_type: The entity type (group or indicator).
+            content: The serialized group or indicator data.
+            xid: The xid of the group.
+            file_data: The file data of the group.
+            xids: The remaining group xids to follow (associations) after the group.
+
+        Returns:
+            bool: False if the entity did not fit in the chunk, else True.
+        """
+        if entity_type == 'group':
+            added = chunk.add_group(content)
+        else:
+            added = chunk.add_indicator(content)
+
+        if not added:
+            # the entity is the first entity of the next chunk
+            self._chunk_carry = {
+                'content': content,
+                'entity_type': entity_type,
+                'file_data': file_data,
+                'xid': xid,
+                'xids': xids,
+            }
+            return False
+
+        if file_data:
+            chunk.file[xid] = file_data
+        return True
+
+    def _chunk_carry_len(self, entity_type: str) -> int:
+        """Return 1 if the carried over entity is of the entity type, else 0.
+
+        Args:
+            entity_type: The entity type (group or indicator).
+        """
+        if self._chunk_carry is not None and self._chunk_carry.get('entity_type') == entity_type:
+            return 1
+        return 0
+
+    def _dump_full(self) -> None:
+        """Dump the batch data to disk once the max entity count has been reached."""
+        if (
+            len(self.groups) + len(self.indicators) + len(self.indicators_bulk)
+            >= self._batch_max_chunk
+        ):
+            self.dump()
+
     def _gen_indicator_class(self) -> None:  # pragma: no cover
         """Generate Custom Indicator Classes."""
         for entry in self.tic.indicator_types_data.values():
@@ -209,25 +273,20 @@ class BatchWriter:
             # get xid from GroupType
             xid = group_data.xid
 
-        if self.groups.get(xid) is not None:
+        # membership checks use the in-memory xid index of each container and never read or
+        # deserialize stored data unless the group already exists.
+        if xid in self.groups:
             # return existing group from memory
-            group_data = self.groups.get(xid)
-        elif self.groups_shelf.get(xid) is not None:
+            group_data = self.groups[xid]
+        elif xid in self.groups_shelf:
             # return existing group from shelf
-            group_data = self.groups_shelf.get(xid)
+            group_data = self.groups_shelf[xid]
         else:
             # store new group
             self.groups[xid] = group_data
 
-            # track total batch job data size as TI gets added
-            if isinstance(group_data, dict):
-                self._batch_size += sys.getsizeof(json.dumps(group_data))
-            else:
-                self._batch_size += sys.getsizeof(json.dumps(group_data.data))
-
-            # max size hit, dump TI to disk
-            if self._batch_size > self._batch_max_size:
-                self.dump()
+            # max entity count hit, dump TI to disk (size is tracked by the chunk builder)
+            self._dump_full()
         return group_data
 
     def _indicator(
@@ -249,27 +308,45 @@ class BatchWriter:
             # get xid from IndicatorType
             xid = indicator_data.xid
 
-        if self.indicators.get(xid) is not None:
+        # membership checks use the in-memory xid index of each container and never read or
+        # deserialize stored data unless the indicator already exists.
+        if xid in self.indicators:
             # return existing indicator from memory
-            indicator_data = self.indicators.get(xid)
-        elif self.indicators_shelf.get(xid) is not None:
+            indicator_data = self.indicators[xid]
+        elif xid in self.indicators_shelf:
             # return existing indicator from shelf
-            indicator_data = self.indicators_shelf.get(xid)
+            indicator_data = self.indicators_shelf[xid]
+        elif xid in self.indicators_bulk:
+            # return existing indicator data from bulk indicators
+            indicator_data = self.indicators_bulk.get(xid)
         else:
             # store new indicators
             self.indicators[xid] = indicator_data
 
-            # track total batch job data size as TI gets added
-            if isinstance(indicator_data, dict):
-                self._batch_size += sys.getsizeof(json.dumps(indicator_data))
-            else:
-                self._batch_size += sys.getsizeof(json.dumps(indicator_data.data))
-
-            # max size hit, dump TI to disk
-            if self._batch_size > self._batch_max_size:
-                self.dump()
+            # max entity count hit, dump TI to disk (size is tracked by the chunk builder)
+            self._dump_full()
         return indicator_data
 
+    @staticmethod
+    def _pop_list(row: dict, *names: str) -> list:
+        """Pop all of the provided fields from the row and return the merged values.
+
+        Args:
+            row: The indicator row.
+            names: The field names (e.g., tag and tags).
+        """
+        values = []
+        for name in names:
+            value = row.pop(name, None)
+            if value is None:
+                continue
+            if isinstance(value, (list, set, tuple)):
+                values.extend(value)
+            else:
+                # a single attribute, label, or tag
+                values.append(value)
+        return values
+
     @staticmethod
     def _indicator_values(indicator: str) -> list:
         """Process indicators expanding file hashes/custom indicators into multiple entries.
@@ -400,6 +477,127 @@ class BatchWriter:
                 indicator_data['flag2'] = whois_active
         return self._indicator(indicator_data, kwargs.get('store', True))
 
+    def add_indicators_bulk(
+        self,
+        indicators: Iterable[Union[dict, list, str, tuple]],
+        indicator_type: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> int:
+        """Add indicators in bulk to Batch Job.
+
+        The indicators are stored in the compact *indicators_bulk* container and the indicator
+        data is only built when the batch chunk is built. Indicators are deduplicated by xid
+        against all indicators already added to the Batch Job. When no xid is provided a
+        reproducible xid is generated from the indicator type and summary, so duplicate
+        indicators in the feed are only added once.
+
+        Example::
+
+            with open('feed.csv') as fh:
+                reader = csv.reader(fh)
+                batch.add_indicators_bulk(
+                    reader, indicator_type='Address', fields=['summary', 'rating', 'confidence']
+                )
+
+        Each row can be:
+
+        * A dict using the batch field names (e.g., "summary", "type", "xid", "rating",
+          "confidence", "attribute", "securityLabel", "tag") or any supported Indicator
+          kwargs (e.g., "date_added").
+        * A list or tuple of values in the order of the provided *fields*.
+        * A str containing the indicator summary (requires *indicator_type*).
+
+        Args:
+            indicators: An iterable (e.g., generator or csv reader) of indicator rows.
+            indicator_type: The indicator type for rows that do not include the type.
+            fields: The field names for list or tuple rows. Defaults to type, summary, xid,
+                rating, and confidence (summary, xid, rating, and confidence if the
+                *indicator_type* is provided).
+
+        Returns:
+            int: The number of indicators added.
+        """
+        if fields is None:
+            fields = ['type', 'summary', 'xid', 'rating', 'confidence']
+            if indicator_type is not None:
+                fields = fields[1:]
+
+        bulk = self.indicators_bulk
+        added = 0
+        duplicates = 0
+        invalid = 0
+        for row in indicators:
+            if isinstance(row, str):
+                row = {'summary': row}
+            elif not isinstance(row, dict):
+                row = dict(zip(fields, row))
+            else:
+                # do not update the user provided dict
+                row = dict(row)
+
+            # empty values (e.g., from a csv reader) are treated as missing values
+            row = {k: v for k, v in row.items() if v not in (None, '')}
+            row_type = row.pop('type', indicator_type)
+            summary = row.pop('summary', None)
+            if row_type is None or summary is None:
+                # skip rows without a type or summary (e.g., empty lines)
+                invalid += 1
+                continue
+
+            xid = row.pop('xid', None)
+            if xid is None:
+                xid = self.generate_xid([row_type, summary])
+
+            # dedupe against all indicators in the Batch Job
+            if xid in self.indicators or xid in self.indicators_shelf:
+                duplicates += 1
+                continue
+
+            if row_type not in ['Address', 'EmailAddress', 'File', 'Host', 'URL']:
+                # for custom indicator types the valueX fields are required.
+                for index, value in enumerate(self._indicator_values(summary), start=1):
+                    row[f'value{index}'] = value
+
+            rating = row.pop('rating', None)
+            confidence = row.pop('confidence', None)
+            try:
+                rating = None if rating is None else float(rating)
+                confidence = None if confidence is None else int(confidence)
+                if confidence is not None and not 0 <= confidence <= 100:
+                    raise ValueError('The confidence must be between 0 and 100.')
+            except (TypeError, ValueError):
+                # skip rows with an invalid rating or confidence (e.g., a bad value in a feed)
+                self.log.warning(
+                    f'feature=batch, event=invalid-indicator, xid={xid}, summary={summary}, '
+                    f'rating={rating}, confidence={confidence}'
+                )
+                invalid += 1
+                continue
+
+            if not bulk.add(
+                row_type,
+                summary,
+                xid=xid,
+                rating=rating,
+                confidence=confidence,
+                attributes=self._pop_list(row, 'attribute', 'attributes'),
+                labels=self._pop_list(row, 'securityLabel', 'labels'),
+                tags=self._pop_list(row, 'tag', 'tags'),
+                **row,
+            ):
+                duplicates += 1
+                continue
+            added += 1
+
+            # max entity count hit, dump TI to disk
+            self._dump_full()
+
+        self.log.info(
+            f'feature=batch, event=add-indicators-bulk, added={added:,}, '
+            f'duplicates={duplicates:,}, invalid={invalid:,}'
+        )
+        return added
+
     def address(self, ip: str, **kwargs) -> Address:
         """Add Address data to Batch.
 
@@ -496,15 +694,13 @@ class BatchWriter:
 
         # cleanup shelf files
         try:
-            self.groups_shelf.close()
-            os.unlink(self.group_shelf_fqfn)
+            self.groups_shelf.remove()
         except Exception as ex:
             self.log.warning(f'action=batch-close, filename={self.group_shelf_fqfn} exception={ex}')
 
         # cleanup shelf files
         try:
-            self.indicators_shelf.close()
-            os.unlink(self.indicator_shelf_fqfn)
+            self.indicators_shelf.remove()
         except Exception as ex:
             self.log.warning(
                 f'action=batch-close, filename={self.indicator_shelf_fqfn} exception={ex}'
@@ -514,74 +710,116 @@ class BatchWriter:
     def data(self) -> dict:
         """Return the batch indicator/group and file data to be sent to the ThreatConnect API.
 
+        .. note:: This property is provided for backwards compatibility. Prefer using the
+            *data_chunk* property, which returns the pre-serialized batch data.
+
+        This method will remove the group/indicator from memory and/or shelf.
+
+        Returns:
+            dict: A dictionary of group, indicators, and/or file data.
+        """
+        return self.data_chunk.data
+
+    @property
+    def data_chunk(self) -> BatchChunk:
+        """Return the next chunk of batch indicator/group and file data.
+
         **Processing Order:**
         * Process groups in memory up to max batch size.
         * Process groups in shelf to max batch size.
         * Process indicators in memory up to max batch size.
         * Process indicators in shelf up to max batch size.
+        * Process bulk indicators up to max batch size.
+
+        Each group/indicator is serialized exactly once into the chunk, which tracks the exact
+        byte size of the batch JSON document. A group/indicator that would exceed the max chunk
+        count or max size is carried over and becomes the first entity of the next chunk.
 
         This method will remove the group/indicator from memory and/or shelf.
 
         Returns:
-            dict: A dictionary of group, indicators, and/or file data.
+            BatchChunk: The serialized group and indicator data and the file data.
         """
-        data = {'file': {}, 'group': [], 'indicator': []}
-        tracker = {'count': 0}
+        chunk = BatchChunk(max_count=self._batch_max_chunk, max_size=self._batch_max_size)
+
+        # add the entity that did not fit in the previous chunk
+        carry, self._chunk_carry = self._chunk_carry, None
+        if carry is not None:
+            xids = carry.pop('xids') or []
+            self._chunk_add(chunk, **carry)
+            if carry.get('entity_type') == 'group':
+                self._data_group_association(chunk, deque(xids))
+            if chunk.is_full:
+                return chunk
 
         # process group from memory, returning if max values have been reached
-        if self.data_groups(data, self.groups, tracker) is True:
-            return data
+        if self.data_groups(chunk, self.groups) is True:
+            return chunk
 
         # process group from shelf file, returning if max values have been reached
-        if self.data_groups(data, self.groups_shelf, tracker) is True:
-            return data
+        if self.data_groups(chunk, self.groups_shelf) is True:
+            return chunk
 
         # process indicator from memory, returning if max values have been reached
-        if self.data_indicators(data, self.indicators, tracker) is True:
-            return data
+        if self.data_indicators(chunk, self.indicators) is True:
+            return chunk
 
         # process indicator from shelf file, returning if max values have been reached
-        if self.data_indicators(data, self.indicators_shelf, tracker) is True:
-            return data
+        if self.data_indicators(chunk, self.indicators_shelf) is True:
+            return chunk
+
+        # process bulk indicators, returning if max values have been reached
+        if self.data_indicators_bulk(chunk, self.indicators_bulk) is True:
+            return chunk
 
-        return data
+        return chunk
 
-    def data_group_association(self, data: dict, tracker: dict, xid: str) -> None:
-        """Return group dict array following all associations.
+    def data_group_association(self, chunk: BatchChunk, xid: str) -> None:
+        """Add group data to the chunk following all associations.
 
-        The *data* dict is passed by reference to make it easier to update both the group data
+        The *chunk* is passed by reference to make it easier to update both the group data
         and file data inline versus passing the data all the way back up to the calling methods.
 
         Args:
-            data: The data dict to update with group and file data.
-            tracker: A dict containing total count of all entities collected.
+            chunk: The chunk to update with group and file data.
             xid: The xid of the group to retrieve associations.
         """
-        xids = deque()
-        xids.append(xid)
+        self._data_group_association(chunk, deque([xid]))
+
+    def _data_group_association(self, chunk: BatchChunk, xids: deque) -> None:
+        """Add group data to the chunk following all associations.
 
+        Args:
+            chunk: The chunk to update with group and file data.
+            xids: The xids of the groups to add.
+        """
         while xids:
             xid = xids.popleft()  # remove current xid
-            group_data = None
 
             if xid in self.groups:
-                group_data = self.groups.get(xid)
-                del self.groups[xid]
+                file_data, group_data = self.data_group_type(self.groups.pop(xid))
+                group_content = BatchChunk.serialize(group_data)
             elif xid in self.groups_shelf:
-                group_data = self.groups_shelf.get(xid)
-                del self.groups_shelf[xid]
-
-            if group_data:
-                file_data, group_data = self.data_group_type(group_data)
-                data['group'].append(group_data)
-                if file_data:
-                    data['file'][xid] = file_data
+                # the serialized group data from the shelf is added to the chunk as-is
+                group_content, file_content = self.groups_shelf.pop_content(xid)
+                group_data = json.loads(group_content)
+                file_data = {}
+                if file_content is not None or group_data.get('type') in ['Document', 'Report']:
+                    file_data = {
+                        'fileContent': file_content,
+                        'fileName': group_data.get('fileName'),
+                        'type': group_data.get('type'),
+                    }
+            else:
+                # group was already processed or does not exist
+                continue
 
-                # update entity trackers
-                tracker['count'] += 1
+            # extend xids with any groups associated with the same GroupType
+            xids.extend(group_data.get('associatedGroupXid', []))
 
-                # extend xids with any groups associated with the same GroupType
-                xids.extend(group_data.get('associatedGroupXid', []))
+            if not self._chunk_add(chunk, 'group', group_content, xid, file_data, list(xids)):
+                # the associations are followed in the next chunk
+                return
 
     @staticmethod
     def data_group_type(group_data: Union[dict, GroupType]) -> Tuple[dict, dict]:
@@ -611,13 +849,12 @@ class BatchWriter:
 
         return file_data, group_data
 
-    def data_groups(self, data: dict, groups: list, tracker: dict) -> bool:
+    def data_groups(self, chunk: BatchChunk, groups: dict) -> bool:
         """Process Group data.
 
         Args:
-            data: The data dict to update with group and file data.
-            groups: The list of groups to process.
-            tracker: A dict containing total count of all entities collected.
+            chunk: The chunk to update with group and file data.
+            groups: The groups to process.
 
         Returns:
             bool: True if max values have been hit, else False.
@@ -628,44 +865,89 @@ class BatchWriter:
         # process the group
         for xid in list(groups.keys()):
             # get association from group data
-            self.data_group_association(data, tracker, xid)
+            self.data_group_association(chunk, xid)
 
-            if tracker.get('count') % 10_000 == 0:
+            if chunk.count % 2_500 == 0:
                 # log count/size at a sane level
                 self.log.debug(
-                    '''feature=batch, action=data-groups, ''' f'''count={tracker.get('count'):,}'''
+                    '''feature=batch, action=data-groups, '''
+                    f'''count={chunk.count:,}, bytes={chunk.size:,}'''
                 )
 
+            if chunk.is_full:
+                # stop processing xid once max limit are reached
+                self.log.info(
+                    '''feature=batch, event=max-value-reached, '''
+                    f'''count={chunk.count:,}, bytes={chunk.size:,}'''
+                )
+                return True
         return False
 
-    def data_indicators(self, data: dict, indicators: list, tracker: dict) -> bool:
+    def data_indicators(self, chunk: BatchChunk, indicators: dict) -> bool:
         """Process Indicator data.
 
         Args:
-            data: The data dict to update with group and file data.
-            indicators: The list of indicators to process.
-            tracker: A dict containing total count of all entities collected.
+            chunk: The chunk to update with indicator data.
+            indicators: The indicators to process.
 
         Returns:
             bool: True if max values have been hit, else False.
         """
         # process the indicator
-        for xid, indicator_data in list(indicators.items()):
-            if not isinstance(indicator_data, dict):
-                indicator_data = indicator_data.data
-            data['indicator'].append(indicator_data)
-            del indicators[xid]
-
-            # update entity trackers
-            tracker['count'] += 1
+        for xid in list(indicators.keys()):
+            if isinstance(indicators, BatchStore):
+                # the serialized indicator data from the shelf is added to the chunk as-is
+                indicator_data, _ = indicators.pop_content(xid)
+            else:
+                indicator_data = indicators.pop(xid)
+                if not isinstance(indicator_data, dict):
+                    indicator_data = indicator_data.data
+            self._chunk_add(chunk, 'indicator', BatchChunk.serialize(indicator_data))
 
-            if tracker.get('count') % 10_000 == 0:
+            if chunk.count % 2_500 == 0:
                 # log count/size at a sane level
                 self.log.debug(
                     '''feature=batch, action=data-indicators, '''
-                    f'''count={tracker.get('count'):,}'''
+                    f'''count={chunk.count:,}, bytes={chunk.size:,}'''
+                )
+
+            if chunk.is_full:
+                # stop processing xid once max limit are reached
+                self.log.info(
+                    '''feature=batch, event=max-value-reached, '''
+                    f'''count={chunk.count:,}, bytes={chunk.size:,}'''
+                )
+                return True
+        return False
+
+    def data_indicators_bulk(self, chunk: BatchChunk, indicators: BulkIndicators) -> bool:
+        """Process bulk Indicator data.
+
+        Args:
+            chunk: The chunk to update with indicator data.
+            indicators: The bulk indicators to process.
+
+        Returns:
+            bool: True if max values have been hit, else False.
+        """
+        while indicators:
+            # the indicator data dict is built when the indicator is removed from the container
+            self._chunk_add(chunk, 'indicator', BatchChunk.serialize(indicators.popleft()))
+
+            if chunk.count % 2_500 == 0:
+                # log count/size at a sane level
+                self.log.debug(
+                    '''feature=batch, action=data-indicators-bulk, '''
+                    f'''count={chunk.count:,}, bytes={chunk.size:,}'''
                 )
 
+            if chunk.is_full:
+                # stop processing xid once max limit are reached
+                self.log.info(
+                    '''feature=batch, event=max-value-reached, '''
+                    f'''count={chunk.count:,}, bytes={chunk.size:,}'''
+                )
+                return True
         return False
 
     def document(self, name: str, file_name: str, **kwargs) -> Document:
@@ -691,26 +973,20 @@ class BatchWriter:
 
     def dump(self) -> None:
         """Process Batch request to ThreatConnect API."""
-        content = self.data
-        content.pop('file', {})
-        if not content.get('group') and not content.get('indicator'):
-            return
-
-        # special code for debugging App using batchV2.
-        self.write_batch_json(content)
-
-        # store the length of the batch data to use for poll interval calculations
-        self.log.info(
-            '''feature=batch, event=dump, type=group, ''' f'''count={len(content.get('group')):,}'''
-        )
-        self.log.info(
-            '''feature=batch, event=dump, type=indicator, '''
-            f'''count={len(content.get('indicator')):,}'''
-        )
-        self.log.info(f'''feature=batch, event=dump, type=batch, size={self._batch_size:,}''')
-
-        # reset batch size after dump
-        self._batch_size = 0
+        while True:
+            chunk = self.data_chunk
+            if not chunk:
+                break
+
+            # special code for debugging App using batchV2.
+            self.write_batch_json(chunk)
+
+            # store the length of the batch data to use for poll interval calculations
+            self.log.info(f'''feature=batch, event=dump, type=group, count={chunk.group_count:,}''')
+            self.log.info(
+                f'''feature=batch, event=dump, type=indicator, count={chunk.indicator_count:,}'''
+            )
+            self.log.info(f'''feature=batch, event=dump, type=batch, size={chunk.size:,}''')
 
     def email(self, name: str, subject: str, header: str, body: str, **kwargs) -> Email:
         """Add Email data to Batch.
@@ -817,9 +1093,22 @@ class BatchWriter:
         if identifier is None:
             identifier = str(uuid.uuid4())
         elif isinstance(identifier, list):
-            identifier = '-'.join([str(i) for i in identifier])
-            identifier = hashlib.sha256(identifier.encode('utf-8')).hexdigest()
-        return hashlib.sha256(identifier.encode('utf-8')).hexdigest()
+            identifier = _sha256('-'.join(map(str, identifier)).encode('utf-8')).hexdigest()
+        return _sha256(identifier.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def generate_xids(identifiers: Iterable[Union[list, str]]) -> List[str]:
+        """Generate xids for a list of identifiers.
+
+        The xids are the same values returned by *generate_xid* for each identifier.
+
+        Args:
+            identifiers: The list of identifiers (a str or list of str values for each xid).
+
+        Returns:
+            list: The list of xids in the same order as the provided identifiers.
+        """
+        return [BatchWriter.generate_xid(identifier) for identifier in identifiers]
 
     def group(self, group_type: str, name: str, **kwargs) -> GroupType:
         """Add Group data to Batch.
@@ -861,10 +1150,10 @@ class BatchWriter:
         return self._groups
 
     @property
-    def groups_shelf(self) -> shelve.DbfilenameShelf:
-        """Return dictionary of all Groups data."""
+    def groups_shelf(self) -> BatchStore:
+        """Return the on-disk store of all saved Groups data."""
         if self._groups_shelf is None:
-            self._groups_shelf = shelve.open(self.group_shelf_fqfn, writeback=False)  # nosec
+            self._groups_shelf = BatchStore(self.group_shelf_fqfn)
         return self._groups_shelf
 
     def host(self, hostname: str, **kwargs) -> Host:
@@ -949,12 +1238,17 @@ class BatchWriter:
         return self._indicators
 
     @property
-    def indicators_shelf(self) -> shelve.DbfilenameShelf:
-        """Return dictionary of all Indicator data."""
+    def indicators_bulk(self) -> BulkIndicators:
+        """Return the compact container for bulk Indicator data."""
+        if self._indicators_bulk is None:
+            self._indicators_bulk = BulkIndicators()
+        return self._indicators_bulk
+
+    @property
+    def indicators_shelf(self) -> BatchStore:
+        """Return the on-disk store of all saved Indicator data."""
         if self._indicators_shelf is None:
-            self._indicators_shelf = shelve.open(  # nosec
-                self.indicator_shelf_fqfn, writeback=False
-            )
+            self._indicators_shelf = BatchStore(self.indicator_shelf_fqfn)
         return self._indicators_shelf
 
     def intrusion_set(self, name: str, **kwargs) -> IntrusionSet:
@@ -1036,7 +1330,7 @@ class BatchWriter:
         return self._group(group_obj, kwargs.get('store', True))
 
     def save(self, resource: Union[dict, GroupType, IndicatorType]) -> None:
-        """Save group|indicator dict, GroupType, or IndicatorTypes to shelve.
+        """Save group|indicator dict, GroupType, or IndicatorTypes to the on-disk store.
 
         Best effort to save group/indicator data to disk.  If for any reason the save fails
         the data will still be accessible from list in memory.
@@ -1169,8 +1463,15 @@ class BatchWriter:
         indicator_obj = URL(text, **kwargs)
         return self._indicator(indicator_obj, kwargs.get('store', True))
 
-    def write_batch_json(self, content: dict) -> None:
-        """Write batch json data to a file."""
+    def write_batch_json(self, content: Union[BatchChunk, dict]) -> None:
+        """Write batch json data to a file.
+
+        Args:
+            content: The chunk of serialized batch data or a dict of groups and indicator data.
+        """
+        if isinstance(content, dict):
+            content = BatchChunk.from_data(content)
+
         if content:
             # get timestamp as a string without decimal place and consistent length
             filename = f'{str(round(time.time() * 10000000))}.json.gz'
@@ -1180,8 +1481,8 @@ class BatchWriter:
             # TODO: is this needed
             self._batch_files.append(filename)
             fqfn = os.path.join(self.output_dir, filename)
-            with gzip.open(fqfn, mode='wt', encoding='utf-8') as fh:
-                json.dump(content, fh)
+            with open(fqfn, mode='wb') as fh:
+                fh.write(content.compressed())
 
             # send callback the filename
             if callable(self.write_callback):
@@ -0,0 +1,315 @@
+"""ThreatConnect Batch Import Module"""
+# standard library
+import math
+import uuid
+from array import array
+from typing import Iterable, Iterator, List, Optional, Union
+
+# first-party
+from tcex.api.tc.v2.batch.attribute import Attribute
+from tcex.api.tc.v2.batch.indicator import metadata_map
+from tcex.api.tc.v2.batch.security_label import SecurityLabel
+from tcex.api.tc.v2.batch.tag import Tag
+from tcex.utils import Utils
+
+
+class BulkIndicators:
+    """ThreatConnect Batch Bulk Indicators Object
+
+    Compact, column oriented container for large numbers of indicators. The type, summary,
+    rating, confidence, and xid of each indicator are stored in parallel arrays, while the
+    attributes, security labels, tags, and any other fields are stored in sparse side tables
+    keyed by row. The indicator data dict (the same dict returned by Indicator.data) is only
+    built when the indicator is removed from the container at chunk time.
+
+    Indicators are consumed in the order they were added. Consumed rows are removed from the
+    head of the arrays once they make up half of the container.
+    """
+
+    __slots__ = [
+        '_attributes',
+        '_confidences',
+        '_extra',
+        '_head',
+        '_index',
+        '_labels',
+        '_offset',
+        '_ratings',
+        '_summaries',
+        '_tags',
+        '_type_ids',
+        '_type_names',
+        '_types',
+        '_xids',
+        'utils',
+    ]
+
+    def __init__(self) -> None:
+        """Initialize Class Properties."""
+        # columns
+        self._confidences = array('h')  # -1 when not set
+        self._ratings = array('d')  # NaN when not set
+        self._summaries = []
+        self._types = array('H')  # index into _type_names
+        self._xids = []  # None when the row has been consumed
+
+        # sparse side tables (row -> value)
+        self._attributes = {}
+        self._extra = {}
+        self._labels = {}
+        self._tags = {}
+
+        # properties
+        self._head = 0  # the position of the first unconsumed entry in the columns
+        self._index = {}  # xid -> row
+        self._offset = 0  # the row of the first entry in the columns
+        self._type_ids = {}  # type name -> type id
+        self._type_names = []  # type id -> type name
+        self.utils = Utils()
+
+    @staticmethod
+    def _attribute_data(attributes: Iterable[Union[dict, Attribute]]) -> List[dict]:
+        """Return the valid attribute data.
+
+        Args:
+            attributes: The attributes as Attribute objects or dicts with type and value keys.
+        """
+        attribute_data = []
+        for attribute in attributes:
+            if isinstance(attribute, dict):
+                attribute = Attribute(
+                    attribute.get('type'),
+                    attribute.get('value'),
+                    attribute.get('displayed', False),
+                    attribute.get('source'),
+                )
+            if attribute.valid:
+                attribute_data.append(attribute.data)
+        return attribute_data
+
+    @staticmethod
+    def _label_data(labels: Iterable[Union[dict, str, SecurityLabel]]) -> List[dict]:
+        """Return the security label data.
+
+        Args:
+            labels: The security labels as SecurityLabel objects, names, or dicts.
+        """
+        label_data = []
+        for label in labels:
+            if isinstance(label, str):
+                label = SecurityLabel(label)
+            elif isinstance(label, dict):
+                label = SecurityLabel(
+                    label.get('name'), label.get('description'), label.get('color')
+                )
+            label_data.append(label.data)
+        return label_data
+
+    @staticmethod
+    def _tag_data(tags: Iterable[Union[dict, str, Tag]]) -> List[dict]:
+        """Return the valid tag data.
+
+        Args:
+            tags: The tags as Tag objects, names, or dicts with a name key.
+        """
+        tag_data = []
+        for tag in tags:
+            if isinstance(tag, str):
+                tag = Tag(tag)
+            elif isinstance(tag, dict):
+                tag = Tag(tag.get('name'))
+            if tag.valid:
+                tag_data.append(tag.data)
+        return tag_data
+
+    def _compact(self) -> None:
+        """Remove consumed rows from the head of the columns."""
+        head = 0
+        for xid in self._xids:
+            if xid is not None:
+                break
+            head += 1
+        if head == 0:
+            return
+
+        del self._confidences[:head]
+        del self._ratings[:head]
+        del self._summaries[:head]
+        del self._types[:head]
+        del self._xids[:head]
+        self._head = max(self._head - head, 0)
+        self._offset += head
+
+    def _data(self, row: int) -> dict:
+        """Return the indicator data dict for the provided row.
+
+        Args:
+            row: The row of the indicator.
+        """
+        i = row - self._offset
+        data = {
+            'summary': self._summaries[i],
+            'type': self._type_names[self._types[i]],
+            'xid': self._xids[i],
+        }
+        if self._confidences[i] >= 0:
+            data['confidence'] = self._confidences[i]
+        if not math.isnan(self._ratings[i]):
+            data['rating'] = self._ratings[i]
+
+        extra = self._extra.get(row)
+        if extra:
+            data.update(extra)
+        if row in self._attributes:
+            data['attribute'] = self._attributes.get(row)
+        if row in self._labels:
+            data['securityLabel'] = self._labels.get(row)
+        if row in self._tags:
+            data['tag'] = self._tags.get(row)
+        return data
+
+    def _remove(self, row: int) -> dict:
+        """Return the indicator data for the provided row and remove the row.
+
+        Args:
+            row: The row of the indicator.
+        """
+        data = self._data(row)
+        i = row - self._offset
+        del self._index[self._xids[i]]
+        self._summaries[i] = None
+        self._xids[i] = None
+        for table in (self._attributes, self._extra, self._labels, self._tags):
+            table.pop(row, None)
+
+        # remove consumed rows once they make up half of the columns
+        if len(self._index) * 2 < len(self._xids):
+            self._compact()
+        return data
+
+    def add(
+        self,
+        indicator_type: str,
+        summary: str,
+        xid: Optional[str] = None,
+        rating: Optional[float] = None,
+        confidence: Optional[int] = None,
+        attributes: Optional[Iterable[Union[dict, Attribute]]] = None,
+        labels: Optional[Iterable[Union[dict, str, SecurityLabel]]] = None,
+        tags: Optional[Iterable[Union[dict, str, Tag]]] = None,
+        **kwargs,
+    ) -> bool:
+        """Add an indicator to the container.
+
+        Args:
+            indicator_type: The ThreatConnect define Indicator type.
+            summary: The value for this Indicator.
+            xid: The external id for this Indicator.
+            rating: The threat rating for this Indicator.
+            confidence: The threat confidence for this Indicator.
+            attributes: The attributes as Attribute objects or dicts with type and value keys.
+            labels: The security labels as SecurityLabel objects, names, or dicts.
+            tags: The tags as Tag objects, names, or dicts with a name key.
+            active (bool, kwargs): If False the indicator is marked "inactive" in TC.
+            date_added (str, kwargs): The date timestamp the Indicator was created.
+            last_modified (str, kwargs): The date timestamp the Indicator was last modified.
+            private_flag (bool, kwargs): If True the indicator is marked as private in TC.
+
+        Returns:
+            bool: False if an indicator with the same xid already exists, else True.
+
+        Raises:
+            ValueError: If the confidence is not between 0 and 100.
+        """
+        confidence = -1 if confidence is None else int(confidence)
+        if confidence != -1 and not 0 <= confidence <= 100:
+            # validate before any column is updated (the confidence column is a short array)
+            raise ValueError(f'Invalid confidence ({confidence}), expected a value from 0 to 100.')
+
+        if xid is None:
+            # set xid to random and unique uuid4 value if not provided
+            xid = str(uuid.uuid4())
+        elif xid in self._index:
+            return False
+
+        type_id = self._type_ids.get(indicator_type)
+        if type_id is None:
+            type_id = self._type_ids[indicator_type] = len(self._type_names)
+            self._type_names.append(indicator_type)
+
+        row = self._offset + len(self._xids)
+        self._index[xid] = row
+        self._confidences.append(confidence)
+        self._ratings.append(math.nan if rating is None else float(rating))
+        self._summaries.append(summary)
+        self._types.append(type_id)
+        self._xids.append(xid)
+
+        # sparse fields
+        if attributes:
+            attribute_data = self._attribute_data(attributes)
+            if attribute_data:
+                self._attributes[row] = attribute_data
+        if labels:
+            self._labels[row] = self._label_data(labels)
+        if tags:
+            tag_data = self._tag_data(tags)
+            if tag_data:
+                self._tags[row] = tag_data
+        extra = {}
+        for key, value in kwargs.items():
+            if value is None:
+                continue
+            key = metadata_map.get(key, key)
+            if key in ['dateAdded', 'lastModified']:
+                value = self.utils.any_to_datetime(value).strftime('%Y-%m-%dT%H:%M:%SZ')
+            extra[key] = value
+        if extra:
+            self._extra[row] = extra
+        return True
+
+    def get(self, xid: str) -> Optional[dict]:
+        """Return the indicator data for the provided xid.
+
+        Args:
+            xid: The external id of the Indicator.
+        """
+        row = self._index.get(xid)
+        if row is None:
+            return None
+        return self._data(row)
+
+    def keys(self) -> list:
+        """Return the xid of all indicators in the order they were added."""
+        return list(self._index)
+
+    def pop(self, xid: str) -> dict:
+        """Remove the indicator and return the indicator data.
+
+        Args:
+            xid: The external id of the Indicator.
+        """
+        row = self._index.get(xid)
+        if row is None:
+            raise KeyError(xid)
+        return self._remove(row)
+
+    def popleft(self) -> dict:
+        """Remove the first indicator and return the indicator data."""
+        if not self._index:
+            raise IndexError('pop from an empty container')
+        while self._xids[self._head] is None:
+            self._head += 1
+        return self._remove(self._offset + self._head)
+
+    def __contains__(self, xid: str) -> bool:
+        """Return True if the xid is in the container."""
+        return xid in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the xid of all indicators in the order they were added."""
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        """Return the number of indicators in the container."""
+        return len(self._index)
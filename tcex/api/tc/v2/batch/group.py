@@ -84,7 +84,9 @@ class Group:
 
         Args:
             filename: The name of the file.
-            file_content: The contents of the file or callback to get contents.
+            file_content: The contents of the file or callback to get contents. The contents
+                can also be a path, a file-like object, or a generator, which are streamed on
+                upload.
         """
         self._group_data['fileName'] = filename
         self._file_content = file_content
@@ -13,6 +13,18 @@ from tcex.utils import Utils
 # import local modules for dynamic reference
 module = __import__(__name__)
 
+# metadata map for Indicator objects
+metadata_map = {
+    'date_added': 'dateAdded',
+    'dnsActive': 'flag1',
+    'dns_active': 'flag1',
+    'last_modified': 'lastModified',
+    'private_flag': 'privateFlag',
+    'size': 'intValue1',
+    'whoisActive': 'flag2',
+    'whois_active': 'flag2',
+}
+
 
 def custom_indicator_class_factory(indicator_type, base_class, class_dict, value_fields):
     """Return internal methods for dynamically building Custom Indicator Class."""
@@ -102,16 +114,7 @@ class Indicator:
     @property
     def _metadata_map(self) -> dict:
         """Return metadata map for Indicator objects."""
-        return {
-            'date_added': 'dateAdded',
-            'dnsActive': 'flag1',
-            'dns_active': 'flag1',
-            'last_modified': 'lastModified',
-            'private_flag': 'privateFlag',
-            'size': 'intValue1',
-            'whoisActive': 'flag2',
-            'whois_active': 'flag2',
-        }
+        return metadata_map
 
     def add_key_value(self, key: str, value: str) -> None:
         """Add custom field to Indicator object.
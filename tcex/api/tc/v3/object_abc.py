@@ -201,7 +201,7 @@ class ObjectABC(ABC):
     def fields(self) -> Dict[str, str]:
         """Return the field data for this object."""
         _fields = {}
-        r = self._session.options(f'{self._api_endpoint}/fields', params={})
+        r = self._session.options(f'{self._api_endpoint}/fields', params={}, cache_ttl=3600)
         if r.ok:
             _fields = r.json().get('data', {})
         return _fields
@@ -299,6 +299,7 @@ class ObjectABC(ABC):
                 self._api_endpoint,
                 params={'show': 'readOnly'},
                 headers={'content-type': 'application/json'},
+                cache_ttl=3600,
             )
             if r.ok:
                 _properties = r.json()
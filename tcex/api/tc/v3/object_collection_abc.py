@@ -268,7 +268,7 @@ class ObjectCollectionABC(ABC):
     def tql_options(self):
         """Return TQL data keywords."""
         _data = []
-        r = self._session.options(f'{self._api_endpoint}/tql', params={})
+        r = self._session.options(f'{self._api_endpoint}/tql', params={}, cache_ttl=3600)
         if r.ok:
             _data = r.json()['data']
         return _data
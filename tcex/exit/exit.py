@@ -9,6 +9,7 @@ from typing import Optional, Union
 # first-party
 from tcex.app_config import InstallJson
 from tcex.pleb.registry import registry
+from tcex.sessions.request_metrics import RequestMetrics
 
 # get tcex logger
 logger = logging.getLogger('tcex')
@@ -92,6 +93,9 @@ class ExitService:
         # exit token renewal thread
         registry.token.shutdown = True
 
+        # log the request metrics summary (latency, payload, retries per endpoint)
+        RequestMetrics().log_summary()
+
         # exit
         self._exit(code, msg)
 
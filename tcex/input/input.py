@@ -5,8 +5,9 @@ import logging
 import os
 import re
 from base64 import b64decode
+from contextlib import ExitStack
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 
 # third-party
 from pydantic import BaseModel, Extra
@@ -74,6 +75,7 @@ class Input:
 
         # properties
         self._models = []
+        self._resolved_tc_variables: Optional[Dict[str, Any]] = None
         self.ij = InstallJson()
         self.log = logger
         self.utils = Utils()
@@ -198,6 +200,47 @@ class Input:
 
         return file_content
 
+    def _resolve_contents(self, _inputs: dict) -> None:
+        """Resolve all file, keychain, playbook, and text variables in the inputs (in place)."""
+        for name, value in _inputs.items():
+            if name == 'tc_playbook_out_variables':
+                # for services, this input contains the name of the expected outputs.  If we don't
+                # skip this, we'll try to resolve the value (e.g.
+                # #Trigger:334:example.service_input!String), but that 1) won't work for services
+                # and 2) doesn't make sense.  Service configs will never have playbook variables.
+                continue
+
+            if self.utils.is_tc_variable(value):  # only matches playbook variables
+                value = self.resolve_variable(variable=value)
+            elif self.ij.model.runtime_level.lower() == 'playbook':
+                if isinstance(value, list):
+                    # list could contain playbook variables, try to resolve the value
+                    updated_value_array = []
+                    for v in value:
+                        if isinstance(v, str):
+                            v = registry.playbook.read.variable(v)
+                        # TODO: [high] does resolve variable need to be added here
+                        updated_value_array.append(v)
+                    value = updated_value_array
+                elif self.utils.is_playbook_variable(value):  # only matches playbook variables
+                    # when using Union[Bytes, String] in App input model the value
+                    # can be coerced to the wrong type. the BinaryVariable and
+                    # StringVariable custom types allows for the validator in Binary
+                    # and String types to raise a value error.
+                    value = registry.playbook.read.variable(value)
+                elif isinstance(value, str):
+                    value = registry.playbook.read._read_embedded(value)
+            else:
+                for match in re.finditer(self.utils.variable_tc_pattern, str(value)):
+                    variable = match.group(0)  # the full variable pattern
+                    if match.group('type').lower() == 'file':
+                        v = '<file>'
+                    else:
+                        v = self.resolve_variable(variable=variable)
+                    value = value.replace(variable, v)
+
+            _inputs[name] = value
+
     def add_model(self, model: BaseModel) -> None:
         """Add additional input models."""
         if model:
@@ -255,44 +298,19 @@ class Input:
         if not self.ij.fqfn.is_file():  # pragma: no cover
             return _inputs
 
-        for name, value in _inputs.items():
-            if name == 'tc_playbook_out_variables':
-                # for services, this input contains the name of the expected outputs.  If we don't
-                # skip this, we'll try to resolve the value (e.g.
-                # #Trigger:334:example.service_input!String), but that 1) won't work for services
-                # and 2) doesn't make sense.  Service configs will never have playbook variables.
-                continue
-
-            if self.utils.is_tc_variable(value):  # only matches playbook variables
-                value = self.resolve_variable(variable=value)
-            elif self.ij.model.runtime_level.lower() == 'playbook':
-                if isinstance(value, list):
-                    # list could contain playbook variables, try to resolve the value
-                    updated_value_array = []
-                    for v in value:
-                        if isinstance(v, str):
-                            v = registry.playbook.read.variable(v)
-                        # TODO: [high] does resolve variable need to be added here
-                        updated_value_array.append(v)
-                    value = updated_value_array
-                elif self.utils.is_playbook_variable(value):  # only matches playbook variables
-                    # when using Union[Bytes, String] in App input model the value
-                    # can be coerced to the wrong type. the BinaryVariable and
-                    # StringVariable custom types allows for the validator in Binary
-                    # and String types to raise a value error.
-                    value = registry.playbook.read.variable(value)
-                elif isinstance(value, str):
-                    value = registry.playbook.read._read_embedded(value)
-            else:
-                for match in re.finditer(self.utils.variable_tc_pattern, str(value)):
-                    variable = match.group(0)  # the full variable pattern
-                    if match.group('type').lower() == 'file':
-                        v = '<file>'
-                    else:
-                        v = self.resolve_variable(variable=variable)
-                    value = value.replace(variable, v)
-
-            _inputs[name] = value
+        # prefetch all playbook variables (single batch read) and resolve each tc variable once
+        self._resolved_tc_variables = {}
+        try:
+            with ExitStack() as stack:
+                if self.ij.model.runtime_level.lower() == 'playbook':
+                    stack.enter_context(
+                        registry.playbook.read.prefetch(
+                            v for k, v in _inputs.items() if k != 'tc_playbook_out_variables'
+                        )
+                    )
+                self._resolve_contents(_inputs)
+        finally:
+            self._resolved_tc_variables = None
 
         # update contents
         self.contents_update(_inputs)
@@ -364,6 +382,9 @@ class Input:
             "data": "value"
         }
         """
+        if self._resolved_tc_variables is not None and variable in self._resolved_tc_variables:
+            return self._resolved_tc_variables[variable]
+
         match = re.match(Utils().variable_tc_match, variable)
         key = match.group('key')
         provider = match.group('provider')
@@ -390,6 +411,8 @@ class Input:
                 f'Could not retrieve variable: provider={provider}, key={key}, type={type_}.'
             )
 
+        if self._resolved_tc_variables is not None:
+            self._resolved_tc_variables[variable] = data
         return data
 
     @staticmethod
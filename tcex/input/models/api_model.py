@@ -45,6 +45,56 @@ class ApiModel(BaseModel):
         inclusion_reason='runtimeLevel',
         requires_definition=True,
     )
+    tc_session_cache_persist: bool = Field(
+        False,
+        description=(
+            'Flag to persist the cached responses of the static ThreatConnect API metadata '
+            'endpoints to the tc_temp_path directory.'
+        ),
+        inclusion_reason='runtimeLevel',
+    )
+    tc_session_circuit_breaker: bool = Field(
+        False,
+        description=(
+            'Flag to stop sending requests for a short time after consecutive connection errors '
+            'or unavailable (5xx) responses from the ThreatConnect API or external sessions.'
+        ),
+        inclusion_reason='runtimeLevel',
+    )
+    tc_session_http2: bool = Field(
+        False,
+        description=(
+            'Flag to send ThreatConnect API requests over multiplexed HTTP/2 connections '
+            '(requires the httpx package).'
+        ),
+        inclusion_reason='runtimeLevel',
+    )
+    tc_session_pool_block: bool = Field(
+        False,
+        description=(
+            'Flag to block requests when all pooled connections for a host are in use, '
+            'instead of opening an additional connection that is not kept alive.'
+        ),
+        inclusion_reason='runtimeLevel',
+    )
+    tc_session_pool_connections: int = Field(
+        10,
+        description='The number of per-host HTTP connection pools to cache.',
+        inclusion_reason='runtimeLevel',
+    )
+    tc_session_pool_keep_alive: Optional[float] = Field(
+        None,
+        description=(
+            'The number of seconds a pooled HTTP connection can be idle before it is closed '
+            'instead of being reused.'
+        ),
+        inclusion_reason='runtimeLevel',
+    )
+    tc_session_pool_maxsize: int = Field(
+        10,
+        description='The max number of HTTP connections to keep alive in each per-host pool.',
+        inclusion_reason='runtimeLevel',
+    )
     tc_token: Optional[Sensitive] = Field(
         None,
         description='A ThreatConnect API token.',
@@ -1,4 +1,7 @@
 """Playbook Common Model"""
+# standard library
+from typing import Optional
+
 # third-party
 from pydantic import BaseModel, Field
 
@@ -18,6 +21,14 @@ class PlaybookCommonModel(BaseModel):
         description='The KV Store cache DB Id.',
         inclusion_reason='runtimeLevel',
     )
+    tc_kvstore_chunk_size: Optional[int] = Field(
+        None,
+        description=(
+            'The max size (in bytes) of a Redis KV Store value before it is stored in chunks '
+            '(downstream Apps must support chunked values).'
+        ),
+        inclusion_reason='runtimeLevel',
+    )
     tc_kvstore_host: str = Field(
         'localhost',
         alias='tc_playbook_db_path',
@@ -36,6 +47,14 @@ class PlaybookCommonModel(BaseModel):
         description='The KV Store type (Redis or TCKeyValueAPI).',
         inclusion_reason='runtimeLevel',
     )
+    tc_playbook_binary_raw: bool = Field(
+        False,
+        description=(
+            'Flag to write Binary and BinaryArray variables as raw bytes instead of base64 '
+            'encoded JSON (Redis KV store only, downstream Apps must support the raw format).'
+        ),
+        inclusion_reason='runtimeLevel',
+    )
     tc_playbook_kvstore_id: int = Field(
         0,
         description='The KV Store playbook DB Id.',
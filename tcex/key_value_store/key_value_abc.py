@@ -1,12 +1,15 @@
 """KeyValueABC class."""
 # standard library
 from abc import ABC
-from typing import Any
+from typing import Any, Dict, Iterator, List
 
 
 class KeyValueABC(ABC):
     """Abstract base class for all KeyValue clients."""
 
+    # True if the KV store stores bytes as is (required for raw binary playbook variables)
+    supports_raw_binary = False
+
     def create(self, context: str, key: str, value: Any) -> str:
         """Create key/value pair in remote KV store.
 
@@ -19,6 +22,21 @@ class KeyValueABC(ABC):
             (string): The response from the KV store provider.
         """
 
+    def create_many(self, context: str, data: Dict[str, Any]) -> List[Any]:
+        """Create multiple key/value pairs in remote KV store.
+
+        Providers that support batched writes override this method to write all
+        key/value pairs with as few round trips as possible.
+
+        Args:
+            context: A specific context for the create.
+            data: The key/value pairs to store in KV store.
+
+        Returns:
+            (list): The responses from the KV store provider.
+        """
+        return [self.create(context, key, value) for key, value in data.items()]
+
     def read(self, context: str, key: str) -> Any:
         """Read data from KV store for the provided key.
 
@@ -29,3 +47,35 @@ class KeyValueABC(ABC):
         Returns:
             (any): The response data from the  KV store provider.
         """
+
+    def read_chunks(self, context: str, key: str) -> Iterator[bytes]:
+        """Yield the data from KV store for the provided key in chunks.
+
+        Providers that support chunked or streamed reads override this method, so that large
+        values are not held in memory at once.
+
+        Args:
+            context: A specific context for the read.
+            key: The key to read in KV store.
+
+        Returns:
+            (Iterator[bytes]): The chunks of the response data from the KV store provider.
+        """
+        data = self.read(context, key)
+        if data is not None:
+            yield data.encode('utf-8') if isinstance(data, str) else data
+
+    def read_many(self, context: str, keys: List[str]) -> Dict[str, Any]:
+        """Read data from KV store for the provided keys.
+
+        Providers that support batched reads override this method to read all keys
+        with as few round trips as possible.
+
+        Args:
+            context: A specific context for the read.
+            keys: The keys to read in KV store.
+
+        Returns:
+            (dict): The response data from the KV store provider for each key.
+        """
+        return {key: self.read(context, key) for key in keys}
@@ -1,6 +1,7 @@
 """TcEx Framework Key Value API Module"""
 # standard library
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List
 from urllib.parse import quote
 
 # first-party
@@ -21,6 +22,23 @@ class KeyValueApi(KeyValueABC):
 
         # properties
         self.ij = InstallJson()
+        self.chunk_size = 1_048_576
+        self.max_workers = 8
+
+    def _url(self, context: str, key: str) -> str:
+        """Return the URL of the key."""
+        key = quote(key, safe='~')
+
+        # this conditional is only required while there are TC instances < 6.0.7 in the wild.
+        # once all TC instance are > 6.0.7 the context endpoint should work for PB Apps.
+        url = f'/internal/playbooks/keyValue/{key}'
+        if self.ij.model.runtime_level.lower() in [
+            'apiservice',
+            'triggerservice',
+            'webhooktriggerservice',
+        ]:
+            url = f'/internal/playbooks/keyValue/{context}/{key}'
+        return url
 
     def create(self, context: str, key: str, value: Any) -> str:
         """Create key/value pair in remote KV store.
@@ -33,20 +51,8 @@ class KeyValueApi(KeyValueABC):
         Returns:
             (string): The response from the API call.
         """
-        key: str = quote(key, safe='~')
         headers = {'content-type': 'application/octet-stream'}
-
-        # this conditional is only required while there are TC instances < 6.0.7 in the wild.
-        # once all TC instance are > 6.0.7 the context endpoint should work for PB Apps.
-        url = f'/internal/playbooks/keyValue/{key}'
-        if self.ij.model.runtime_level.lower() in [
-            'apiservice',
-            'triggerservice',
-            'webhooktriggerservice',
-        ]:
-            url = f'/internal/playbooks/keyValue/{context}/{key}'
-
-        r = self._session.put(url, data=value, headers=headers)
+        r = self._session.put(self._url(context, key), data=value, headers=headers)
         return r.content
 
     def read(self, context: str, key: str) -> Any:
@@ -59,21 +65,47 @@ class KeyValueApi(KeyValueABC):
         Returns:
             (any): The response data from the remote KV store.
         """
-        key = quote(key, safe='~')
-
-        # this conditional is only required while there are TC instances < 6.0.7 in the wild.
-        # once all TC instance are > 6.0.7 the context endpoint should work for PB Apps.
-        url = f'/internal/playbooks/keyValue/{key}'
-        if self.ij.model.runtime_level.lower() in [
-            'apiservice',
-            'triggerservice',
-            'webhooktriggerservice',
-        ]:
-            url = f'/internal/playbooks/keyValue/{context}/{key}'
-        r = self._session.get(url)
+        r = self._session.get(self._url(context, key))
         data = r.content
 
         # Binary data for PB Apps is base64 encoded, for service Apps it is not
         if data is not None and isinstance(data, bytes):
             data = data.decode('utf-8')
         return data
+
+    def read_chunks(self, context: str, key: str) -> Iterator[bytes]:
+        """Yield the data from remote KV store for the provided key in chunks.
+
+        The response is streamed, so only a single chunk of a large value is in memory at a time.
+
+        Args:
+            context: A specific context for the read.
+            key: The key to read in remote KV store.
+
+        Returns:
+            (Iterator[bytes]): The chunks of the response data from the remote KV store.
+        """
+        with self._session.get(self._url(context, key), stream=True) as r:
+            for chunk in r.iter_content(chunk_size=self.chunk_size):
+                if chunk:
+                    yield chunk
+
+    def read_many(self, context: str, keys: List[str]) -> Dict[str, Any]:
+        """Read data from remote KV store for the provided keys.
+
+        The API has no bulk read endpoint, so the keys are read concurrently using the
+        (thread-safe) session connection pool.
+
+        Args:
+            context: A specific context for the read.
+            keys: The keys to read in remote KV store.
+
+        Returns:
+            (dict): The response data from the remote KV store for each key.
+        """
+        if len(keys) < 2:
+            return super().read_many(context, keys)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(keys))) as executor:
+            values = executor.map(lambda key: self.read(context, key), keys)
+            return dict(zip(keys, values))
@@ -1,26 +1,104 @@
 """TcEx Framework Key Value Redis Module"""
 # standard library
-from typing import TYPE_CHECKING, Any, Optional
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 
 # first-party
 # first party
 from tcex.key_value_store.key_value_abc import KeyValueABC
 
 if TYPE_CHECKING:
+    # third-party
+    from redis.client import Pipeline
+
     # first-party
     from tcex.key_value_store.redis_client import RedisClient
 
+# the prefix of the manifest of a chunked value (a JSON serialized value never starts with a null)
+MAGIC_CHUNKED = b'\x00tcex-chunked\x00'
+
 
 class KeyValueRedis(KeyValueABC):
     """TcEx Key Value Redis Module.
 
+    Values larger than the chunk size (if provided) are split into fixed-size chunks that are
+    stored in separate fields ({key}:chunk:{index}) and the field of the key holds a manifest,
+    so that large values can be read incrementally (read_chunks).  All other read methods join
+    the chunks, so chunked values can be read like any other value by Apps using this module.
+
     Args:
         redis_client (redis.Client): An instance of redis client.
+        chunk_size: The max size of a value (in bytes) before it is stored in chunks.
     """
 
-    def __init__(self, redis_client: 'RedisClient'):
+    supports_raw_binary = True
+
+    def __init__(self, redis_client: 'RedisClient', chunk_size: Optional[int] = None):
         """Initialize the Class properties."""
         self._redis_client = redis_client
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def _chunk_field(key: str, index: int) -> str:
+        """Return the field name of a chunk of a value."""
+        return f'{key}:chunk:{index}'
+
+    def _chunk_fields(self, key: str, value: Optional[bytes]) -> List[str]:
+        """Return the chunk fields of the value, if the value is the manifest of a chunked value."""
+        manifest = self._manifest(value)
+        if manifest is None:
+            return []
+        return [self._chunk_field(key, i) for i in range(manifest.get('chunks'))]
+
+    def _hset(
+        self, pipeline: 'Pipeline', context: str, key: str, value: Any, previous: Optional[bytes]
+    ) -> None:
+        """Add the commands to create the key/value pair (in chunks if required) to the pipeline.
+
+        The chunks of the previous value (if chunked) are deleted in the same pipeline, so that
+        overwriting a chunked value does not leave orphaned chunks.
+        """
+        previous_fields = self._chunk_fields(key, previous)
+        if previous_fields:
+            pipeline.hdel(context, *previous_fields)
+
+        # the chunk size is in bytes, so str values are encoded before they are compared
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        if isinstance(value, bytes) and len(value) > self.chunk_size:
+            data = memoryview(value)
+            chunks = 0
+            for offset in range(0, len(data), self.chunk_size):
+                end = offset + self.chunk_size
+                pipeline.hset(context, self._chunk_field(key, chunks), data[offset:end])
+                chunks += 1
+
+            manifest = json.dumps({'chunks': chunks, 'size': len(data)}).encode('utf-8')
+            value = MAGIC_CHUNKED + manifest
+        pipeline.hset(context, key, value)
+
+    @staticmethod
+    def _manifest(value: Optional[bytes]) -> Optional[dict]:
+        """Return the manifest if the value is the manifest of a chunked value."""
+        if isinstance(value, bytes) and value.startswith(MAGIC_CHUNKED):
+            start = len(MAGIC_CHUNKED)
+            return json.loads(value[start:])
+        return None
+
+    def _read_chunked(self, context: str, key: str, value: Optional[bytes]) -> Optional[bytes]:
+        """Return the value, joining the chunks if the value is the manifest of a chunked value."""
+        manifest = self._manifest(value)
+        if manifest is None:
+            return value
+        return b''.join(self._read_chunks(context, key, manifest))
+
+    def _read_chunks(self, context: str, key: str, manifest: dict) -> Iterator[bytes]:
+        """Yield the chunks of a chunked value."""
+        for index in range(manifest.get('chunks')):
+            chunk = self._redis_client.hget(context, self._chunk_field(key, index))
+            if chunk is None:
+                raise RuntimeError(f'Missing chunk {index} of chunked value ({key}).')
+            yield chunk
 
     def create(self, context: str, key: str, value: Any) -> None:
         """Create key/value pair in Redis.
@@ -33,7 +111,39 @@ class KeyValueRedis(KeyValueABC):
         Returns:
             str: The response from Redis.
         """
-        return self._redis_client.hset(context, key, value)
+        if not self.chunk_size:
+            return self._redis_client.hset(context, key, value)
+
+        previous = self._redis_client.hget(context, key)
+        pipeline = self._redis_client.pipeline()
+        self._hset(pipeline, context, key, value, previous)
+        return pipeline.execute()[-1]
+
+    def create_many(self, context: str, data: Dict[str, Any]) -> List[int]:
+        """Create multiple key/value pairs in Redis using a single pipeline (MULTI/EXEC).
+
+        Args:
+            context: A specific context for the create.
+            data: The field names (keys) and values for the kv pairs in Redis.
+
+        Returns:
+            list: The responses from Redis.
+        """
+        if not data:
+            return []
+
+        if not self.chunk_size:
+            pipeline = self._redis_client.pipeline()
+            for key, value in data.items():
+                pipeline.hset(context, key, value)
+            return pipeline.execute()
+
+        keys = list(data)
+        previous = self._redis_client.hmget(context, keys)
+        pipeline = self._redis_client.pipeline()
+        for key, previous_value in zip(keys, previous):
+            self._hset(pipeline, context, key, data[key], previous_value)
+        return pipeline.execute()
 
     def delete(self, context: str, key: str) -> str:
         """Alias for hdel method.
@@ -45,18 +155,35 @@ class KeyValueRedis(KeyValueABC):
         Returns:
             str: The response from Redis.
         """
+        fields = self._chunk_fields(key, self._redis_client.hget(context, key))
+        if fields:
+            self._redis_client.hdel(context, *fields)
         return self._redis_client.hdel(context, key)
 
     def hgetall(self, context: str):
         """Read data from Redis for the current context.
 
+        The chunks of chunked values are joined, so the chunk fields are not returned.
+
         Args:
             context: A specific context for the create.
 
         Returns:
             list: The response data from Redis.
         """
-        return self._redis_client.hgetall(context)
+        data = self._redis_client.hgetall(context)
+        for field, value in list(data.items()):
+            key = field.decode('utf-8') if isinstance(field, bytes) else field
+            chunks = []
+            for chunk_field in self._chunk_fields(key, value):
+                if isinstance(field, bytes):
+                    chunk_field = chunk_field.encode('utf-8')
+                if chunk_field not in data:
+                    raise RuntimeError(f'Missing chunk {chunk_field} of chunked value ({key}).')
+                chunks.append(data.pop(chunk_field))
+            if chunks:
+                data[field] = b''.join(chunks)
+        return data
 
     def read(self, context: str, key: str) -> Any:
         """Read data from Redis for the provided key.
@@ -68,7 +195,26 @@ class KeyValueRedis(KeyValueABC):
         Returns:
             str: The response data from Redis.
         """
-        return self.hget(context, key)
+        return self._read_chunked(context, key, self.hget(context, key))
+
+    def read_chunks(self, context: str, key: str) -> Iterator[bytes]:
+        """Yield the value from Redis for the provided key in chunks.
+
+        Only the manifest and a single chunk of a chunked value are in memory at a time.
+
+        Args:
+            context: A specific context for the read.
+            key: The field name (key) for the kv pair in Redis.
+
+        Returns:
+            Iterator[bytes]: The chunks of the raw value (a single chunk if not chunked).
+        """
+        value = self.hget(context, key)
+        manifest = self._manifest(value)
+        if manifest is not None:
+            yield from self._read_chunks(context, key, manifest)
+        elif value is not None:
+            yield value
 
     def hget(self, context: str, key: str) -> Optional[bytes]:
         """Read data from redis for the provided key.
@@ -83,3 +229,18 @@ class KeyValueRedis(KeyValueABC):
             Optional[bytes]: the raw value from redis, if any
         """
         return self._redis_client.hget(context, key)
+
+    def read_many(self, context: str, keys: List[str]) -> Dict[str, Optional[bytes]]:
+        """Read data from Redis for the provided keys using a single HMGET.
+
+        Args:
+            context: A specific context for the read.
+            keys: The field names (keys) for the kv pairs in Redis.
+
+        Returns:
+            dict: The raw values from redis for each key (None for missing keys).
+        """
+        if not keys:
+            return {}
+        values = self._redis_client.hmget(context, keys)
+        return {k: self._read_chunked(context, k, v) for k, v in zip(keys, values)}
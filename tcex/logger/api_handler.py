@@ -50,11 +50,11 @@ class ApiHandler(logging.Handler):
         """Override base handle method to add logic that prevents threading deadlocks"""
         # append log entries from child threads to _entries to avoid deadlocks within handle method.
         # Otherwise, token monitor thread would try to acquire I/O lock within super().handle
-        # when attempting to log messages (meaning token barrier is enabled in tokens.py).
+        # when attempting to log messages (meaning a token is being renewed in tokens.py).
         # if the main thread currently has the I/O lock from within super().handle and is trying
         # to retrieve a token from tokens.py to log to API, then a deadlock occurs because the
-        # main thread is waiting for the barrier to be disabled, and the token thread is waiting
-        # for the I/O lock from super().handle.
+        # main thread is waiting for the token renewal to complete, and the token thread is
+        # waiting for the I/O lock from super().handle.
         if threading.current_thread().name != 'MainThread':
             with self._entries_lock:
                 self._entries.append(record)
@@ -0,0 +1,104 @@
+"""Playbook Binary Codec"""
+# standard library
+import struct
+from typing import Iterable, List, Optional, Union
+
+# the prefixes of raw binary values (a JSON serialized value never starts with a null byte)
+MAGIC_BINARY = b'\x00tcex-binary\x00'
+MAGIC_BINARY_ARRAY = b'\x00tcex-binary-array\x00'
+
+# the frame header (length of the item) of array items, the max value is a null item
+FRAME_HEADER = struct.Struct('>Q')
+FRAME_NONE = 0xFFFFFFFFFFFFFFFF
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+class BinaryCodec:
+    """Raw binary transport for Binary and BinaryArray playbook variables.
+
+    By default Binary variables are base64 encoded and JSON serialized before they are written
+    to the KV store, which copies the data several times on every write and read.  In raw mode
+    a Binary value is stored as a prefix followed by the raw bytes, and a BinaryArray value is
+    stored as a prefix followed by length prefixed frames.  Reads return memoryview slices of
+    the stored value, so the data is not copied again.
+
+    Raw values can only be read by Apps that support the raw format and can only be stored in
+    KV stores that store bytes (Redis), so raw mode is opt-in.
+    """
+
+    @staticmethod
+    def decode(data: BytesLike) -> memoryview:
+        """Return the raw bytes of a Binary value (without copying the data).
+
+        Args:
+            data: The stored value.
+        """
+        start = len(MAGIC_BINARY)
+        return memoryview(data)[start:]
+
+    @staticmethod
+    def decode_array(data: BytesLike) -> List[Optional[memoryview]]:
+        """Return the raw bytes of the items of a BinaryArray value (without copying the data).
+
+        Args:
+            data: The stored value.
+        """
+        view = memoryview(data)
+        offset = len(MAGIC_BINARY_ARRAY)
+        values = []
+        while offset < len(view):
+            (length,) = FRAME_HEADER.unpack_from(view, offset)
+            offset += FRAME_HEADER.size
+            if length == FRAME_NONE:
+                values.append(None)
+                continue
+            end = offset + length
+            if end > len(view):
+                raise RuntimeError('Invalid data provided for BinaryArray (truncated frame).')
+            values.append(view[offset:end])
+            offset = end
+        return values
+
+    @staticmethod
+    def encode(value: BytesLike) -> bytes:
+        """Return the stored value for a Binary value.
+
+        Args:
+            value: The binary data.
+        """
+        return b''.join([MAGIC_BINARY, value])
+
+    @staticmethod
+    def encode_array(values: Iterable[Optional[BytesLike]]) -> bytes:
+        """Return the stored value for a BinaryArray value.
+
+        Args:
+            values: The binary data items.
+        """
+        parts = [MAGIC_BINARY_ARRAY]
+        for value in values:
+            if value is None:
+                parts.append(FRAME_HEADER.pack(FRAME_NONE))
+            else:
+                parts.append(FRAME_HEADER.pack(memoryview(value).nbytes))
+                parts.append(value)
+        return b''.join(parts)
+
+    @staticmethod
+    def is_raw(data: Optional[BytesLike]) -> bool:
+        """Return True if the stored value is a raw Binary value.
+
+        Args:
+            data: The stored value.
+        """
+        return isinstance(data, (bytes, bytearray)) and data.startswith(MAGIC_BINARY)
+
+    @staticmethod
+    def is_raw_array(data: Optional[BytesLike]) -> bool:
+        """Return True if the stored value is a raw BinaryArray value.
+
+        Args:
+            data: The stored value.
+        """
+        return isinstance(data, (bytes, bytearray)) and data.startswith(MAGIC_BINARY_ARRAY)
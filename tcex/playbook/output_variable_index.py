@@ -0,0 +1,85 @@
+"""Playbook Output Variable Index"""
+# standard library
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+# first-party
+from tcex.utils.utils import Utils
+
+if TYPE_CHECKING:
+    # first-party
+    from tcex.utils.models import PlaybookVariableModel
+
+
+class OutputVariableIndex:
+    """Index of the requested output variables.
+
+    The output variables are parsed once and indexed by variable and by key, so looking up
+    the variable for a key (e.g., app.output -> #App:1234:app.output!String), checking if a
+    variable was requested, and getting the type of a variable don't parse the variables on
+    every write. The index is a snapshot of the output variables, changes to the provided list
+    are not reflected (PlaybookCreate creates a new index when output_variables is assigned).
+
+    Args:
+        output_variables: The requested output variables.
+    """
+
+    def __init__(self, output_variables: Iterable[str]):
+        """Initialize the class properties."""
+        self.output_variables: Tuple[str, ...] = tuple(output_variables or [])
+
+        # properties
+        self._keys: Dict[str, List[str]] = {}
+        self._models: Dict[str, 'PlaybookVariableModel'] = {}
+        self._variables: Set[str] = set(self.output_variables)
+        self.utils = Utils()
+
+        # build the index
+        for variable in self.output_variables:
+            model = self.utils.get_playbook_variable_model(variable)
+            if model is not None:
+                self._models[variable] = model
+                self._keys.setdefault(model.key, []).append(variable)
+
+    def __contains__(self, variable: str) -> bool:
+        """Return True if the variable was requested by downstream App."""
+        return variable in self._variables
+
+    def get(self, key: str, variable_type: Optional[str] = None) -> Optional[str]:
+        """Return the first requested variable for the key (and variable type if provided).
+
+        Args:
+            key: The variable key (e.g., app.output).
+            variable_type: The variable type (e.g., String).
+        """
+        for variable in self._keys.get(key, []):
+            if variable_type is None or self._models[variable].type == variable_type:
+                return variable
+        return None
+
+    def has_key(self, key: str) -> bool:
+        """Return True if a variable with the key was requested by downstream App.
+
+        Args:
+            key: The variable key (e.g., app.output).
+        """
+        return key in self._keys
+
+    def model(self, variable: str) -> Optional['PlaybookVariableModel']:
+        """Return the parsed variable model (parsing variables that are not outputs).
+
+        Args:
+            variable: The playbook variable (e.g., #App:1234:app.output!String).
+        """
+        model = self._models.get(variable)
+        if model is None:
+            model = self.utils.get_playbook_variable_model(variable)
+        return model
+
+    def variable_type(self, variable: str) -> str:
+        """Return the type of the variable or String if not a variable.
+
+        Args:
+            variable: The playbook variable (e.g., #App:1234:app.output!String).
+        """
+        model = self.model(variable)
+        return 'String' if model is None else model.type
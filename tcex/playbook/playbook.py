@@ -25,6 +25,7 @@ class Playbook:
             startup, but for service Apps each request gets a different context.
         output_variables: The requested output variables. For PB Apps outputs are provided on
             startup, but for service Apps each request gets different outputs.
+        binary_raw: If True, write Binary and BinaryArray variables as raw bytes (Redis only).
     """
 
     def __init__(
@@ -32,8 +33,10 @@ class Playbook:
         key_value_store: Union[KeyValueApi, KeyValueRedis],
         context: Optional[str] = None,
         output_variables: Optional[list] = None,
+        binary_raw: Optional[bool] = False,
     ) -> None:
         """Initialize the class properties."""
+        self.binary_raw = binary_raw
         self.context = context
         self.key_value_store = key_value_store
         self.output_variables = output_variables or []
@@ -47,17 +50,14 @@ class Playbook:
 
         Provide key should be in format "app.output".
         """
-        return key in [
-            self.utils.get_playbook_variable_model(variable).key
-            for variable in self.output_variables
-        ]
+        return self.create.output_variable_index.has_key(key)
 
     def check_variable_requested(self, variable: str) -> bool:
         """Return True if output variable was requested by downstream app.
 
         Provide variable should be in format of "#App:1234:app.output!String".
         """
-        return variable in self.create.output_variables
+        return variable in self.create.output_variable_index
 
     def get_variable_type(self, variable: str) -> str:
         """Get the Type from the variable string or default to String type.
@@ -73,12 +73,14 @@ class Playbook:
 
         "My Data" returns **String**
         """
-        return self.utils.get_playbook_variable_type(variable)
+        return self.create.output_variable_index.variable_type(variable)
 
     @cached_property
     def create(self) -> 'PlaybookCreate':
         """Return instance of PlaybookCreate"""
-        return PlaybookCreate(self.context, self.key_value_store, self.output_variables)
+        return PlaybookCreate(
+            self.context, self.key_value_store, self.output_variables, self.binary_raw
+        )
 
     @cached_property
     def delete(self) -> 'PlaybookDelete':
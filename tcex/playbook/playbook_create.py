@@ -3,6 +3,7 @@
 import base64
 import json
 import logging
+from contextlib import contextmanager
 from typing import Any, Dict, Iterable, List, Optional, Union
 
 # third-party
@@ -10,6 +11,8 @@ from pydantic import BaseModel
 
 # first-party
 from tcex.key_value_store import KeyValueApi, KeyValueRedis
+from tcex.playbook.binary_codec import BinaryCodec
+from tcex.playbook.output_variable_index import OutputVariableIndex
 from tcex.utils.utils import Utils
 
 # get tcex logger
@@ -17,23 +20,52 @@ logger = logging.getLogger('tcex')
 
 
 class PlaybookCreate:
-    """Playbook Write ABC"""
+    """Playbook Write ABC
+
+    Args:
+        context: The KV Store context/session_id.
+        key_value_store: A KV store instance.
+        output_variables: The requested output variables.
+        binary_raw: If True, write Binary and BinaryArray variables as raw bytes instead of
+            base64 encoded JSON (only for KV stores that support raw binary, e.g., Redis).
+    """
 
     def __init__(
         self,
         context: str,
         key_value_store: Union[KeyValueApi, KeyValueRedis],
         output_variables: list,
+        binary_raw: Optional[bool] = False,
     ):
         """Initialize the class properties."""
+        self.binary_raw = binary_raw
         self.context = context
         self.key_value_store = key_value_store
-        self.output_variables = output_variables
 
         # properties
+        self._batch: Optional[Dict[str, Any]] = None
         self.log = logger
         self.utils = Utils()
 
+        # the setter builds the output variable index
+        self.output_variables = output_variables
+
+    @property
+    def _binary_raw(self) -> bool:
+        """Return True if binary variables should be written as raw bytes."""
+        return bool(self.binary_raw and getattr(self.key_value_store, 'supports_raw_binary', False))
+
+    @property
+    def output_variables(self) -> list:
+        """Return the requested output variables."""
+        return self._output_variables
+
+    @output_variables.setter
+    def output_variables(self, output_variables: list) -> None:
+        """Set the requested output variables and rebuild the output variable index."""
+        self._output_variables = output_variables
+        self.output_variable_index = OutputVariableIndex(output_variables or [])
+
     @staticmethod
     def _check_iterable(value: str, validate: bool) -> None:
         """Raise an exception if value is not an Iterable.
@@ -68,7 +100,7 @@ class PlaybookCreate:
 
     def _check_variable_type(self, variable: str, type_: str) -> bool:
         """Validate the correct type was passed to the method."""
-        if self.utils.get_playbook_variable_type(variable).lower() != type_.lower():
+        if self.output_variable_index.variable_type(variable).lower() != type_.lower():
             raise RuntimeError(
                 f'Invalid variable provided ({variable}), variable must be of type {type_}.'
             )
@@ -88,7 +120,11 @@ class PlaybookCreate:
         return value
 
     def _create_data(self, key: str, value: Any) -> None:
-        """Write data to key value store."""
+        """Write data to key value store (or stage the data when batching)."""
+        if self._batch is not None:
+            self._batch[key.strip()] = value
+            return None
+
         self.log.debug(f'writing variable {key.strip()}')
         try:
             return self.key_value_store.create(self.context, key.strip(), value)
@@ -96,6 +132,18 @@ class PlaybookCreate:
             self.log.error(e)
             return None
 
+    def _flush_batch(self) -> None:
+        """Write all staged data to key value store in a single batch."""
+        data, self._batch = self._batch, None
+        if not data:
+            return
+
+        self.log.debug(f'writing {len(data)} variables in batch')
+        try:
+            self.key_value_store.create_many(self.context, data)
+        except RuntimeError as e:  # pragma: no cover
+            self.log.error(e)
+
     def _get_variable(self, key: str, variable_type: Optional[str] = None) -> str:
         """Return properly formatted variable.
 
@@ -111,16 +159,9 @@ class PlaybookCreate:
         any downstream Apps or could possible be formatted incorrectly.
         """
         if not self.utils.is_playbook_variable(key):
-            # try to lookup the variable in the requested output variables.
-            for output_variable in self.output_variables:
-                variable_model = self.utils.get_playbook_variable_model(output_variable)
-                if variable_model.key == key and (
-                    variable_type is None or variable_model.type == variable_type
-                ):
-                    # either an exact match, or first match
-                    return output_variable
-            # not requested by downstream App or misconfigured
-            return None
+            # lookup the variable in the requested output variables, either an exact match, or
+            # first match. None if not requested by downstream App or misconfigured.
+            return self.output_variable_index.get(key, variable_type)
         # key was already a properly formatted variable
         return key
 
@@ -151,6 +192,29 @@ class PlaybookCreate:
 
         return value
 
+    @contextmanager
+    def batch(self):
+        """Stage all variables created in the context and write them in a single batch.
+
+        Values are validated and serialized when created, but are written to the key value
+        store on exit of the context (e.g., a single Redis pipeline instead of a round trip
+        per variable). Staged values are written even when the context exits on an exception.
+
+        with playbook.create.batch():
+            playbook.create.string('#App:1234:app.output1!String', 'one')
+            playbook.create.string('#App:1234:app.output2!String', 'two')
+        """
+        if self._batch is not None:
+            # already batching (nested context)
+            yield
+            return
+
+        self._batch = {}
+        try:
+            yield
+        finally:
+            self._flush_batch()
+
     @staticmethod
     def is_key_value(data: dict) -> bool:
         """Return True if provided data has proper structure for Key Value."""
@@ -160,7 +224,7 @@ class PlaybookCreate:
 
     def is_requested(self, variable: str) -> bool:
         """Return True if provided variable was requested by downstream App."""
-        return variable in self.output_variables
+        return variable in self.output_variable_index
 
     @staticmethod
     def is_tc_entity(data: dict) -> bool:
@@ -201,7 +265,7 @@ class PlaybookCreate:
             return None
 
         # get the type from the variable
-        variable_type = self.utils.get_playbook_variable_type(variable).lower()
+        variable_type = self.output_variable_index.variable_type(variable).lower()
 
         # map type to create method
         variable_type_map = {
@@ -238,6 +302,12 @@ class PlaybookCreate:
         # quick check to ensure an invalid type was not provided
         self._check_variable_type(variable, 'Binary')
 
+        # raw binary transport - the bytes are stored as is
+        if self._binary_raw:
+            if validate and not isinstance(value, (bytes, bytearray, memoryview)):
+                raise RuntimeError('Invalid data provided for Binary.')
+            return self._create_data(variable, BinaryCodec.encode(value))
+
         # basic validation of value
         if validate and not isinstance(value, bytes):
             raise RuntimeError('Invalid data provided for Binary.')
@@ -269,6 +339,14 @@ class PlaybookCreate:
         # quick check to ensure an invalid type was not provided
         self._check_variable_type(variable, 'BinaryArray')
 
+        # raw binary transport - the bytes are stored as length prefixed frames
+        if self._binary_raw:
+            value = list(value)
+            for v in value:
+                if validate and not isinstance(v, (type(None), bytes, bytearray, memoryview)):
+                    raise RuntimeError('Invalid data provided for Binary.')
+            return self._create_data(variable, BinaryCodec.encode_array(value))
+
         # basic validation and prep of value
         value_encoded = []
         for v in value:
@@ -521,7 +599,7 @@ class PlaybookCreate:
         # the entire (e.g., #App:1234:app.output!String). we need the
         # full variable to proceed.
         variable = self._get_variable(key, variable_type)
-        if variable is None or variable not in self.output_variables:
+        if variable is None or variable not in self.output_variable_index:
             self.log.debug(f'Variable {key} was NOT requested by downstream app.')
             return None
 
@@ -24,6 +24,7 @@ class PlaybookOutput(dict):
         self.playbook = playbook
 
     def process(self):
-        """Create all stored output data to storage."""
-        for key, value in self.items():
-            self.playbook.create.variable(key, value)
+        """Create all stored output data to storage in a single batch."""
+        with self.playbook.create.batch():
+            for key, value in self.items():
+                self.playbook.create.variable(key, value)
@@ -1,14 +1,17 @@
 """Playbook ABC"""
 # standard library
 import base64
+import codecs
 import json
 import logging
 import re
 from collections import OrderedDict
-from typing import Any, List, Optional, Union
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Union
 
 # first-party
 from tcex.key_value_store import KeyValueApi, KeyValueRedis
+from tcex.playbook.binary_codec import BinaryCodec
 from tcex.pleb.registry import registry
 from tcex.utils.utils import Utils
 from tcex.utils.variables import BinaryVariable, StringVariable
@@ -38,6 +41,7 @@ class PlaybookRead:
         self.key_value_store = key_value_store
 
         # properties
+        self._prefetched: Optional[Dict[str, Any]] = None
         self.log = logger
         self.utils = Utils()
 
@@ -74,6 +78,9 @@ class PlaybookRead:
 
     def _get_data(self, key: str) -> Any:
         """Get the value from Redis if applicable."""
+        if self._prefetched is not None and key.strip() in self._prefetched:
+            return self._prefetched[key.strip()]
+
         value = None
         try:
             value = self.key_value_store.read(self.context, key.strip())
@@ -81,6 +88,62 @@ class PlaybookRead:
             self.log.error(e)
         return value
 
+    @staticmethod
+    def _iter_json_array(chunks: Iterable[Union[bytes, str]]) -> Iterator[Any]:
+        """Yield the elements of a JSON serialized array from the chunks of the serialized data.
+
+        Only the current chunk and the element being parsed are held in memory.
+        """
+        decoder = json.JSONDecoder(object_pairs_hook=OrderedDict)
+        utf8_decoder = codecs.getincrementaldecoder('utf-8')()
+        buffer = ''
+        started = False
+        chunks = iter(chunks)
+        while True:
+            chunk = next(chunks, None)
+            final = chunk is None
+            if isinstance(chunk, str):
+                buffer += chunk
+            else:
+                buffer += utf8_decoder.decode(chunk or b'', final=final)
+
+            position = 0
+            while True:
+                # skip whitespace and separators
+                while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                    position += 1
+                if position == len(buffer):
+                    break
+
+                if not started:
+                    if buffer[position] != '[':
+                        raise RuntimeError('Invalid data provided, the value is not an array.')
+                    started = True
+                    position += 1
+                    continue
+
+                if buffer[position] == ']':
+                    return
+
+                try:
+                    element, end = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    # the element continues in the next chunk
+                    break
+
+                if not final and (end == len(buffer) or buffer[end] not in ' \t\r\n,]'):
+                    # a number at the end of the chunk could continue in the next chunk
+                    break
+                yield element
+                position = end
+
+            buffer = buffer[position:]
+            if final:
+                if started or buffer:
+                    raise RuntimeError('Invalid data provided, failed to load array.')
+                # no data (e.g., the variable does not exist)
+                return
+
     @staticmethod
     def _load_data(value: str) -> dict:
         """Return the loaded JSON value or raise an error."""
@@ -100,6 +163,44 @@ class PlaybookRead:
             self.log.debug(f'read variable {key}')
         return False
 
+    def _playbook_variables(self, values: Iterable[Any]) -> Set[str]:
+        """Return all playbook variables in the values (including embedded variables)."""
+        variables = set()
+        for value in values:
+            if isinstance(value, (dict, list)):
+                items = value.values() if isinstance(value, dict) else value
+                variables.update(self._playbook_variables(items))
+                continue
+
+            if BinaryCodec.is_raw(value) or BinaryCodec.is_raw_array(value):
+                # raw binary data can't have embedded variables
+                continue
+            if isinstance(value, bytes):
+                value = self._decode_binary(value)
+            if isinstance(value, str) and '#' in value:
+                variables.update(
+                    m.group(0) for m in self.utils.variable_playbook_parse.finditer(value)
+                )
+        return variables
+
+    def _prefetch(self, values: Iterable[Any]) -> None:
+        """Read the playbook variables in the values (and one level of embedded variables)."""
+        variables = self._playbook_variables(values)
+        for _ in range(2):
+            keys = sorted(v for v in variables if v not in self._prefetched)
+            if not keys:
+                break
+
+            self.log.debug(f'prefetching {len(keys)} variables')
+            try:
+                data = self.key_value_store.read_many(self.context, keys)
+            except RuntimeError as e:
+                self.log.error(e)
+                return
+
+            self._prefetched.update(data)
+            variables = self._playbook_variables(data.values())
+
     def _process_binary(
         self, data: str, b64decode: bool, decode: bool, serialized: bool
     ) -> Optional[Union[str, bytes]]:
@@ -121,6 +222,22 @@ class PlaybookRead:
 
         return data
 
+    def _process_binary_raw(
+        self, data: Optional[memoryview], b64decode: bool, decode: bool, zero_copy: bool
+    ) -> Optional[Union[bytes, memoryview, str]]:
+        """Process the provided raw binary data."""
+        if data is None:
+            return None
+
+        if b64decode is False:
+            # the App expects the base64 encoded data
+            return base64.b64encode(data).decode()
+        if decode is True:
+            return self._decode_binary(bytes(data))
+        if zero_copy is True:
+            return data
+        return BinaryVariable(data)
+
     def _process_key_value(
         self, data: str, resolve_embedded: bool, serialized: bool
     ) -> Optional[dict]:
@@ -344,10 +461,13 @@ class PlaybookRead:
         value = variable_type_map.get(variable_type, self.raw)(key)
 
         if value is not None:
-            if variable_type == 'binary':
+            if variable_type == 'binary' and not isinstance(value, BinaryVariable):
                 value = BinaryVariable(value)
             elif variable_type == 'binaryarray':
-                value = [v if v is None else BinaryVariable(v) for v in value]
+                value = [
+                    v if v is None or isinstance(v, BinaryVariable) else BinaryVariable(v)
+                    for v in value
+                ]
             elif variable_type == 'string':
                 value = StringVariable(value)
             elif variable_type == 'stringarray':
@@ -360,10 +480,17 @@ class PlaybookRead:
         key: str,
         b64decode: Optional[bool] = True,
         decode: Optional[bool] = False,
-    ) -> Optional[Union[str, bytes]]:
+        zero_copy: Optional[bool] = False,
+    ) -> Optional[Union[str, bytes, memoryview]]:
         """Read the value from key value store.
 
-        Binary data should be stored as base64 encoded string.
+        Binary data should be stored as base64 encoded string or as raw binary.
+
+        Args:
+            key: The variable to read from the KV store.
+            b64decode: If False, return the base64 encoded data.
+            decode: If True, return the data decoded to a string.
+            zero_copy: If True, return raw binary data as a memoryview of the stored data.
         """
         if self._null_key_check(key) is True:
             return None
@@ -372,6 +499,8 @@ class PlaybookRead:
         self._check_variable_type(key, 'Binary')
 
         data: Optional[str] = self._get_data(key)
+        if BinaryCodec.is_raw(data):
+            return self._process_binary_raw(BinaryCodec.decode(data), b64decode, decode, zero_copy)
         return self._process_binary(data, b64decode=b64decode, decode=decode, serialized=True)
 
     def binary_array(
@@ -379,10 +508,18 @@ class PlaybookRead:
         key: str,
         b64decode: Optional[bool] = True,
         decode: Optional[bool] = False,
-    ) -> Optional[List[Union[bytes, str]]]:
+        zero_copy: Optional[bool] = False,
+    ) -> Optional[List[Union[bytes, str, memoryview]]]:
         """Read the value from key value store.
 
-        BinaryArray data should be stored as base64 encoded serialized string.
+        BinaryArray data should be stored as base64 encoded serialized string or as raw binary
+        frames.
+
+        Args:
+            key: The variable to read from the KV store.
+            b64decode: If False, return the base64 encoded data.
+            decode: If True, return the data decoded to a string.
+            zero_copy: If True, return raw binary data as memoryviews of the stored data.
         """
         if self._null_key_check(key) is True:
             return None
@@ -391,6 +528,12 @@ class PlaybookRead:
         self._check_variable_type(key, 'BinaryArray')
 
         data: Optional[str] = self._get_data(key)
+        if BinaryCodec.is_raw_array(data):
+            return [
+                self._process_binary_raw(d, b64decode, decode, zero_copy)
+                for d in BinaryCodec.decode_array(data)
+            ]
+
         if data is not None:
             # data should be base64 encoded bytes string
 
@@ -463,6 +606,75 @@ class PlaybookRead:
 
         return data
 
+    def iter_array(self, key: str) -> Iterator[Optional[Union[bytes, dict, str]]]:
+        """Yield the elements of an array variable incrementally.
+
+        The serialized array is read from the key value store in chunks (e.g., a chunked Redis
+        value or a streamed API response) and each element is yielded as soon as it is parsed,
+        so large arrays are never fully held in memory.
+
+        for indicator in playbook.read.iter_array('#App:1234:app.indicators!TCEntityArray'):
+            ...
+        """
+        if self._null_key_check(key) is True:
+            return
+
+        key = key.strip()
+        variable_type = self.utils.get_playbook_variable_type(key)
+        if variable_type == 'BinaryArray':
+            # binary arrays are stored as a single (base64 or raw) value
+            yield from self.binary_array(key) or []
+            return
+
+        process = {
+            'KeyValueArray': lambda d: self._process_key_value(
+                d, resolve_embedded=True, serialized=False
+            ),
+            'StringArray': lambda d: self._process_string(
+                d, resolve_embedded=False, serialized=False
+            ),
+            'TCEntityArray': lambda d: self._process_tc_entity(d, serialized=False),
+        }.get(variable_type)
+        if process is None:
+            raise RuntimeError(
+                f'Invalid variable provided ({key}), variable must be of an array type.'
+            )
+
+        if self._prefetched is not None and key in self._prefetched:
+            data = self._prefetched[key]
+            chunks = [] if data is None else [data]
+        else:
+            chunks = self.key_value_store.read_chunks(self.context, key)
+
+        for element in self._iter_json_array(chunks):
+            yield process(element)
+
+    @contextmanager
+    def prefetch(self, values: Iterable[Any]):
+        """Prefetch all playbook variables in the values and read them from memory in the context.
+
+        The values (e.g., the App inputs) are scanned for playbook variables, including
+        variables embedded in strings and arrays, and the variables are read from the key value
+        store in a single batch (e.g., a single Redis HMGET).  Embedded variables are supported
+        one level deep, so the variables embedded in the prefetched data are prefetched in a
+        second batch.
+
+        with playbook.read.prefetch(inputs.values()):
+            value = playbook.read.variable('#App:1234:app.output!String')
+        """
+        if self._prefetched is not None:
+            # already prefetching (nested context)
+            self._prefetch(values)
+            yield
+            return
+
+        self._prefetched = {}
+        try:
+            self._prefetch(values)
+            yield
+        finally:
+            self._prefetched = None
+
     def raw(self, key: str) -> Optional[any]:
         """Read method of CRUD operation for raw data.
 
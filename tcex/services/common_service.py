@@ -11,6 +11,7 @@ from typing import Callable, Optional, Union
 
 # first-party
 from tcex.services.mqtt_message_broker import MqttMessageBroker
+from tcex.sessions.request_metrics import RequestMetrics
 
 # get tcex logger
 logger = logging.getLogger('tcex')
@@ -39,6 +40,7 @@ class CommonService:
         self.args: object = tcex.inputs.model
         self.configs = {}
         self.heartbeat_max_misses = 3
+        self.heartbeat_request_metrics = False
         self.heartbeat_sleep_time = 1
         self.heartbeat_watchdog = 0
         self.ij = tcex.ij
@@ -289,12 +291,17 @@ class CommonService:
         """
         self.heartbeat_watchdog = 0
 
+        # optionally add the request metrics (e.g., HTTP Requests, HTTP Time (ms), HTTP Top 1)
+        metrics = self.metrics
+        if self.heartbeat_request_metrics:
+            metrics = {**metrics, **RequestMetrics().heartbeat_metrics()}
+
         # send heartbeat -acknowledge- command
-        response = {'command': 'Heartbeat', 'metric': self.metrics}
+        response = {'command': 'Heartbeat', 'metric': metrics}
         self.message_broker.publish(
             message=json.dumps(response), topic=self.args.tc_svc_client_topic
         )
-        self.log.info(f'feature=service, event=heartbeat-sent, metrics={self.metrics}')
+        self.log.info(f'feature=service, event=heartbeat-sent, metrics={metrics}')
 
     def process_logging_change_command(self, message: dict) -> None:
         """Process the LoggingChange command.
@@ -0,0 +1,284 @@
+"""ThreatConnect asyncio Session"""
+# standard library
+import asyncio
+import functools
+import io
+import logging
+import ssl
+from datetime import timedelta
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, Optional, Union
+
+# third-party
+from requests import PreparedRequest, Request, Response
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.structures import CaseInsensitiveDict
+from requests.utils import default_headers, get_encoding_from_headers
+
+# first-party
+from tcex.utils.requests_to_curl import RequestsToCurl
+from tcex.utils.utils import Utils
+
+try:
+    # third-party
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+if TYPE_CHECKING:
+    # first-party
+    from tcex.sessions.auth.hmac_auth import HmacAuth
+    from tcex.sessions.auth.tc_auth import TcAuth
+    from tcex.sessions.auth.token_auth import TokenAuth
+
+# get tcex logger
+logger = logging.getLogger('tcex')
+
+
+class AsyncTcSession:
+    """ThreatConnect REST API asyncio Session
+
+    Mirrors the behavior of TcSession (base URL handling, auth, 401 retry, retry with backoff,
+    and curl logging) using a single event loop instead of a thread per request. Requests are
+    prepared with requests so that the HMAC signature and encoding of params, data, json, and
+    files are identical to TcSession, and responses are returned as requests.Response objects
+    so that existing response handling code can be reused.
+
+    Requires the aiohttp package (pip install tcex[async]).
+
+    Args:
+        auth: The ThreatConnect API authentication handler.
+        base_url: The base URL for all requests.
+        log_curl: If True, log all requests as curl commands.
+        proxies: The proxy settings.
+        proxies_enabled: If True, use the proxy settings.
+        user_agent: The User-Agent header.
+        verify: A boolean to enable/disable SSL verification or the path to a CA bundle.
+        pool_maxsize: The max number of concurrent connections.
+        retries: The number of retry attempts for connection errors and retry status codes.
+        backoff_factor: The backoff factor for retries.
+        status_forcelist: The status codes to retry.
+        timeout: The total timeout in seconds for a request.
+    """
+
+    def __init__(
+        self,
+        auth: Union['HmacAuth', 'TokenAuth', 'TcAuth'],
+        base_url: str = None,
+        log_curl: Optional[bool] = False,
+        proxies: Optional[Dict[str, str]] = None,
+        proxies_enabled: Optional[bool] = False,
+        user_agent: Optional[dict] = None,
+        verify: Optional[Union[bool, str]] = True,
+        pool_maxsize: Optional[int] = 100,
+        retries: Optional[int] = 3,
+        backoff_factor: Optional[float] = 0.3,
+        status_forcelist: Optional[tuple] = (500, 502, 504),
+        timeout: Optional[float] = None,
+    ):
+        """Initialize the Class properties."""
+        if aiohttp is None:  # pragma: no cover
+            raise RuntimeError('The aiohttp package is required for AsyncTcSession.')
+
+        self.auth = auth
+        self.base_url = base_url.strip('/')
+        self.log = logger
+        self.log_curl = log_curl
+        self.pool_maxsize = pool_maxsize
+        self.proxies = proxies if proxies and proxies_enabled else {}
+        self.verify = verify
+        self.timeout = timeout
+
+        # retry settings
+        self.backoff_factor = backoff_factor
+        self.retries = retries
+        self.status_forcelist = status_forcelist
+
+        # properties
+        self._client = None
+        self.headers = default_headers()
+        self.requests_to_curl = RequestsToCurl()
+        self.utils = Utils()
+
+        # configure optional headers
+        if user_agent:
+            self.headers.update(user_agent)
+
+    async def __aenter__(self) -> 'AsyncTcSession':
+        """Return the session for use as an async context manager."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the session on exit of the async context manager."""
+        await self.close()
+
+    @property
+    def _ssl(self) -> Union[bool, ssl.SSLContext]:
+        """Return the aiohttp ssl setting for the verify setting."""
+        if isinstance(self.verify, str):
+            return ssl.create_default_context(cafile=self.verify)
+        return bool(self.verify)
+
+    def _log_curl(self, response: Response) -> None:
+        """Log the curl equivalent command."""
+        # APP-79 - adding logging of request as curl commands
+        if not response.ok or self.log_curl:
+            try:
+                self.log.debug(
+                    self.requests_to_curl.convert(
+                        response.request, proxies=self.proxies, verify=self.verify
+                    )
+                )
+            except Exception:  # nosec
+                pass  # logging curl command is best effort
+
+    def _prepare(self, method: str, url: str, **kwargs) -> PreparedRequest:
+        """Return the prepared (encoded and authenticated) request.
+
+        The request is prepared on every attempt so that a new timestamp and signature (or a
+        renewed token) is used for each retry. The auth is synchronous and can block (e.g., a
+        token renewal), so the request is prepared in the default executor (see _send_with_retry).
+        """
+        headers = CaseInsensitiveDict(self.headers)
+        headers.update(kwargs.get('headers') or {})
+        return Request(
+            method=method.upper(),
+            url=self.url(url),
+            headers=headers,
+            files=kwargs.get('files'),
+            data=kwargs.get('data'),
+            json=kwargs.get('json'),
+            params=kwargs.get('params'),
+            auth=self.auth,
+        ).prepare()
+
+    async def _send(self, prepared: PreparedRequest, timeout: Optional[float]) -> Response:
+        """Send the prepared request and return a requests Response."""
+        client = await self.client()
+        start = perf_counter()
+        async with client.request(
+            prepared.method,
+            prepared.url,
+            data=prepared.body,
+            headers={k: str(v) for k, v in prepared.headers.items()},
+            proxy=self.proxies.get(prepared.url.split(':', 1)[0]),
+            ssl=self._ssl,
+            timeout=aiohttp.ClientTimeout(total=timeout or self.timeout),
+        ) as client_response:
+            content = await client_response.read()
+
+        response = Response()
+        # the content was already read, raw allows iter_content/stream=True to read it again
+        response._content = content  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        response.elapsed = timedelta(seconds=perf_counter() - start)
+        response.headers = CaseInsensitiveDict(client_response.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(content)
+        response.reason = client_response.reason
+        response.request = prepared
+        response.status_code = client_response.status
+        response.url = str(client_response.url)
+        return response
+
+    async def _send_with_retry(self, method: str, url: str, **kwargs) -> Response:
+        """Send the request, retrying on connection errors and retry status codes."""
+        loop = asyncio.get_event_loop()
+        response = None
+        for attempt in range(self.retries + 1):
+            if attempt > 0:
+                await asyncio.sleep(self.backoff_factor * (2 ** (attempt - 1)))
+
+            # prepare the request (auth) in a thread so a token renewal doesn't block the loop
+            prepared = await loop.run_in_executor(
+                None, functools.partial(self._prepare, method, url, **kwargs)
+            )
+            try:
+                response = await self._send(prepared, kwargs.get('timeout'))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as ex:
+                if attempt >= self.retries:
+                    raise RequestsConnectionError(ex) from ex
+                self.log.debug(
+                    f'feature=async-tc-session, event=retry, attempt={attempt + 1}, error={ex}'
+                )
+                continue
+
+            if response.status_code not in self.status_forcelist:
+                break
+        return response
+
+    async def client(self) -> 'aiohttp.ClientSession':
+        """Return the aiohttp client session, creating it in the running event loop."""
+        if self._client is None or self._client.closed:
+            self._client = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize),
+                # requests handles cookies on TcSession, the TC API does not require them
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the aiohttp client session."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def delete(self, url: str, **kwargs) -> Response:
+        """Send a DELETE request."""
+        return await self.request('DELETE', url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> Response:
+        """Send a GET request."""
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> Response:
+        """Send a POST request."""
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> Response:
+        """Send a PUT request."""
+        return await self.request('PUT', url, **kwargs)
+
+    async def request(self, method: str, url: str, **kwargs) -> Response:
+        """Send a request to the ThreatConnect API.
+
+        Args:
+            method: The HTTP method.
+            url: The URL path or the full URL.
+            data (kwargs): The body of the request.
+            files (kwargs): The multipart files of the request.
+            headers (kwargs): The headers of the request.
+            json (kwargs): The JSON body of the request.
+            params (kwargs): The query parameters of the request.
+            timeout (kwargs): The total timeout in seconds for the request.
+        """
+        response = await self._send_with_retry(method, url, **kwargs)
+
+        # retry request in case we encountered a race condition with token renewal monitor
+        if response.status_code == 401:
+            self.log.debug(
+                f'Unexpected response received while attempting to send a request using internal '
+                f'session object. Retrying request. feature=async-tc-session, '
+                f'request-url={response.request.url}, status-code={response.status_code}'
+            )
+            response = await self._send_with_retry(method, url, **kwargs)
+
+        # optionally log the curl command
+        self._log_curl(response)
+
+        # log request and response data
+        self.log.debug(
+            f'feature=async-tc-session, request-url={response.request.url}, '
+            f'status-code={response.status_code}, elapsed={response.elapsed}'
+        )
+
+        return response
+
+    def url(self, url: str) -> str:
+        """Return appropriate URL string.
+
+        The method allows the session to accept the URL Path or the full URL.
+        """
+        if not url.startswith('https'):
+            return f'{self.base_url}{url}'
+        return url
@@ -4,7 +4,7 @@ import hmac
 import time
 from base64 import b64encode
 from hashlib import sha256
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 # third-party
 from requests import auth, request
@@ -17,6 +17,9 @@ if TYPE_CHECKING:  # pragma: no cover
 class HmacAuth(auth.AuthBase):
     """ThreatConnect HMAC Authorization"""
 
+    # the max number of signatures memoized for the current timestamp
+    signature_cache_size = 1_024
+
     def __init__(self, tc_api_access_id: str, tc_api_secret_key: 'Sensitive') -> None:
         """Initialize the Class properties."""
         # super().__init__()
@@ -24,18 +27,52 @@ class HmacAuth(auth.AuthBase):
         self.tc_api_access_id = tc_api_access_id
         self.tc_api_secret_key = tc_api_secret_key
 
+    @property
+    def _hmac(self) -> 'hmac.HMAC':
+        """Return the HMAC object keyed with the tc secret key.
+
+        Keying the HMAC (hashing the key into the inner and outer pads) is done once, each
+        signature uses a copy of the keyed object.
+        """
+        if self._hmac_keyed is None:
+            self._hmac_keyed = hmac.new(self.tc_api_secret_key.value.encode(), digestmod=sha256)
+        return self._hmac_keyed
+
     def _hmac_header(self, r: 'request', timestamp: 'time.time'):
         """Return HMAC Authorization header value."""
         # define the signature using "full" path, HTTP method, and current timestamp
         signature = f'{r.path_url}:{r.method}:{timestamp}'
 
+        # signatures are only valid for the current timestamp (second), identical requests in the
+        # same second (e.g., retries or the API log handler) reuse the header value
+        cache = self._signature_cache
+        if cache[0] != (timestamp, self.tc_api_access_id):
+            cache = self._signature_cache = ((timestamp, self.tc_api_access_id), {})
+        header = cache[1].get(signature)
+        if header is not None:
+            return header
+
         # generate the sha256 signature using the tc secret key, encoded signature
-        hmac_signature = hmac.new(
-            self.tc_api_secret_key.value.encode(), signature.encode(), digestmod=sha256
-        ).digest()
+        hmac_signature = self._hmac.copy()
+        hmac_signature.update(signature.encode())
 
         # return the header value with access_id and b64 signature value
-        return f'TC {self.tc_api_access_id}:{b64encode(hmac_signature).decode()}'
+        header = f'TC {self.tc_api_access_id}:{b64encode(hmac_signature.digest()).decode()}'
+        if len(cache[1]) < self.signature_cache_size:
+            cache[1][signature] = header
+        return header
+
+    @property
+    def tc_api_secret_key(self) -> Optional['Sensitive']:
+        """Return the tc secret key."""
+        return self._tc_api_secret_key
+
+    @tc_api_secret_key.setter
+    def tc_api_secret_key(self, tc_api_secret_key: Optional['Sensitive']) -> None:
+        """Set the tc secret key, resetting the keyed HMAC and the signature cache."""
+        self._tc_api_secret_key = tc_api_secret_key
+        self._hmac_keyed = None
+        self._signature_cache = (None, {})
 
     def __call__(self, r: 'request') -> request:
         """Add the authorization headers to the request."""
@@ -6,12 +6,17 @@ from typing import Callable, Optional
 
 # third-party
 import urllib3
-from requests import Response, Session, adapters, exceptions
+from requests import Response, Session, exceptions
 from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, DEFAULT_RETRIES
 from urllib3.util.retry import Retry
 
 # first-party
+from tcex.sessions.pool_adapter import PoolAdapter, PoolMetrics
 from tcex.sessions.rate_limit_handler import RateLimitHandler
+from tcex.sessions.request_metrics import RequestMetrics
+from tcex.sessions.response_cache import ResponseCache
+from tcex.sessions.retry_policy import CircuitBreaker, RetryPolicy
+from tcex.sessions.single_flight import SingleFlight
 from tcex.utils.requests_to_curl import RequestsToCurl
 from tcex.utils.utils import Utils
 
@@ -40,6 +45,9 @@ def default_too_many_requests_handler(response: Response) -> float:
     except RuntimeError:
         # retry_after must be in seconds
         seconds = retry_after
+    except ValueError:
+        # retry_after must be an HTTP date
+        seconds = RetryPolicy.retry_after(response) or 0
 
     # handle negative values
     if seconds < 0:
@@ -48,7 +56,7 @@ def default_too_many_requests_handler(response: Response) -> float:
     return float(seconds)
 
 
-class CustomAdapter(adapters.HTTPAdapter):
+class CustomAdapter(PoolAdapter):
     """Custom Adapter to properly handle retries."""
 
     def __init__(
@@ -58,6 +66,7 @@ class CustomAdapter(adapters.HTTPAdapter):
         pool_maxsize=DEFAULT_POOLSIZE,
         max_retries=DEFAULT_RETRIES,
         pool_block=DEFAULT_POOLBLOCK,
+        pool_keep_alive=None,
     ):
         """Initialize CustomAdapter.
 
@@ -67,14 +76,19 @@ class CustomAdapter(adapters.HTTPAdapter):
             pool_maxsize: passed to super
             max_retries: passed to super
             pool_block: passed to super
+            pool_keep_alive: passed to super
         """
-        super().__init__(pool_connections, pool_maxsize, max_retries, pool_block)
+        super().__init__(pool_connections, pool_maxsize, max_retries, pool_block, pool_keep_alive)
         self._rate_limit_handler = rate_limit_handler
 
     def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
         """Send PreparedRequest object. Returns Response object."""
         if self.rate_limit_handler:
+            start = time.perf_counter()
             self.rate_limit_handler.pre_send(request)
+            sleep = time.perf_counter() - start
+            if sleep > 0.001:
+                RequestMetrics().record_rate_limit_sleep(request, sleep)
 
         try:
             response = super().send(request, stream, timeout, verify, cert, proxies)
@@ -113,6 +127,13 @@ class ExternalSession(Session):
     Args:
         base_url (Optional[str] = None): The base URL for all requests.
         logger (Optional[object] = None): An instance of Logger.
+        pool_block (Optional[bool] = False): If True, block when all pooled connections are in use.
+        pool_connections (Optional[int] = 10): The number of per-host connection pools to cache.
+        pool_keep_alive (Optional[float] = None): The number of seconds a pooled connection can be
+            idle before it is closed.
+        pool_maxsize (Optional[int] = 10): The max number of connections in each per-host pool.
+        circuit_breaker (Optional[bool] = False): If True, stop sending requests after
+            consecutive failures.
     """
 
     __attrs__ = [
@@ -133,15 +154,34 @@ class ExternalSession(Session):
         '_mask_headers',
         '_mask_patterns',
         'log',
+        'pool_block',
+        'pool_connections',
+        'pool_keep_alive',
+        'pool_maxsize',
         'utils',
     ]
 
-    def __init__(self, base_url: Optional[str] = None, logger: Optional[object] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        logger: Optional[object] = None,
+        pool_block: Optional[bool] = False,
+        pool_connections: Optional[int] = DEFAULT_POOLSIZE,
+        pool_keep_alive: Optional[float] = None,
+        pool_maxsize: Optional[int] = DEFAULT_POOLSIZE,
+        circuit_breaker: Optional[bool] = False,
+    ):
         """Initialize the Class properties."""
         super().__init__()
         self._base_url: str = base_url
         self.log: object = logger or logging.getLogger('session')
 
+        # connection pool settings
+        self.pool_block = pool_block
+        self.pool_connections = pool_connections
+        self.pool_keep_alive = pool_keep_alive
+        self.pool_maxsize = pool_maxsize
+
         self._custom_adapter: Optional[CustomAdapter] = None
         self.utils: object = Utils()
 
@@ -152,7 +192,13 @@ class ExternalSession(Session):
         self._mask_patterns = None
         self._rate_limit_handler = RateLimitHandler()
         self._too_many_requests_handler = None
+        self.request_metrics = RequestMetrics()
         self.requests_to_curl = RequestsToCurl()
+        self.response_cache = ResponseCache()
+        self.retry_policy = RetryPolicy(
+            circuit_breaker=CircuitBreaker() if circuit_breaker else None
+        )
+        self.single_flight = SingleFlight()
 
         # Add default Retry
         self.retry()
@@ -207,6 +253,13 @@ class ExternalSession(Session):
         """Set property"""
         self._mask_patterns = patterns
 
+    @property
+    def pool_metrics(self) -> Optional[PoolMetrics]:
+        """Return the connection pool metrics (pool wait time and connection reuse)."""
+        if self._custom_adapter:
+            return self._custom_adapter.pool_metrics
+        return None
+
     @property
     def too_many_requests_handler(self) -> Callable[[Response], float]:
         """Get the too_many_requests_handler.
@@ -254,32 +307,17 @@ class ExternalSession(Session):
         if self._custom_adapter:
             self._custom_adapter.rate_limit_handler = rate_limit_handler
 
-    def request(  # pylint: disable=arguments-differ
-        self, method: str, url: str, **kwargs
-    ) -> object:
-        """Override request method disabling verify on token renewal if disabled on session.
-
-        Args:
-            method (str): The HTTP method
-            url (str): The URL or path for the request.
-
-        Returns:
-            object: The requests Response object .
-        """
-        if self.base_url is not None and not url.startswith('https'):
-            url = f'{self.base_url}{url}'
-
-        # this kwargs value is used to signal 429 handling that this is a retry, but the super
-        # method doesn't expect it so it needs to be removed.
-        tc_is_retry = kwargs.pop('tc_is_retry', False)
+    def _request(self, method: str, url: str, **kwargs) -> Response:
+        """Send the request, retrying throttled and unavailable responses."""
+        start = time.perf_counter()
 
-        response: Response = super().request(method, url, **kwargs)
-
-        if response.status_code == 429 and not tc_is_retry:
-            too_many_requests_handler = self.too_many_requests_handler
-            time.sleep(too_many_requests_handler(response))
-            kwargs['tc_is_retry'] = True
-            return self.request(method, url, **kwargs)
+        # retry throttled (429) and unavailable (503) responses using the retry policy
+        send = super().request
+        response: Response = self.retry_policy.send(
+            lambda: send(method, url, **kwargs),
+            retry_after_handler=self.too_many_requests_handler,
+            body=kwargs.get('data'),
+        )
 
         # APP-79 - adding logging of request as curl commands
         if not response.ok or self.log_curl:
@@ -302,8 +340,65 @@ class ExternalSession(Session):
             f'status_code={response.status_code}, elapsed={response.elapsed}'
         )
 
+        # record the request latency and payload (don't read the content of streamed responses)
+        self.request_metrics.record_response(
+            response,
+            time.perf_counter() - start,
+            int(response.headers.get('Content-Length') or 0) if kwargs.get('stream') else None,
+        )
+
         return response
 
+    def request(  # pylint: disable=arguments-differ
+        self, method: str, url: str, **kwargs
+    ) -> object:
+        """Override request method disabling verify on token renewal if disabled on session.
+
+        Args:
+            method (str): The HTTP method
+            url (str): The URL or path for the request.
+            cache_ttl (Optional[float], kwargs): If provided, the response of an idempotent
+                request is cached for this number of seconds in the process wide response cache.
+
+        Returns:
+            object: The requests Response object .
+        """
+        if self.base_url is not None and not url.startswith('https'):
+            url = f'{self.base_url}{url}'
+
+        cache_ttl = kwargs.pop('cache_ttl', None)
+        params = kwargs.get('params')
+        headers = kwargs.get('headers')
+
+        def _send_conditional(conditional_headers: dict) -> Response:
+            request_headers = dict(headers or {}, **conditional_headers)
+            return self._request(method, url, **dict(kwargs, headers=request_headers))
+
+        def _send() -> Response:
+            if cache_ttl is None:
+                return self._request(method, url, **kwargs)
+            return self.response_cache.send(
+                _send_conditional,
+                method,
+                url,
+                cache_ttl,
+                params,
+                dict(self.headers, **(headers or {})),
+                kwargs.get('auth') or self.auth,
+            )
+
+        # concurrent identical requests matching the single flight patterns share one request
+        if kwargs.get('stream'):
+            return _send()
+        return self.single_flight.send(
+            _send,
+            method,
+            url,
+            params,
+            dict(self.headers, **(headers or {})),
+            kwargs.get('auth') or self.auth,
+        )
+
     def rate_limit_config(
         self,
         limit_remaining_header: str = 'X-RateLimit-Remaining',
@@ -355,7 +450,12 @@ class ExternalSession(Session):
             self._custom_adapter.max_retries = retry_object
         else:
             self._custom_adapter = CustomAdapter(
-                rate_limit_handler=self.rate_limit_handler, max_retries=retry_object
+                rate_limit_handler=self.rate_limit_handler,
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                max_retries=retry_object,
+                pool_block=self.pool_block,
+                pool_keep_alive=self.pool_keep_alive,
             )
 
         # mount the custom adapter
@@ -0,0 +1,261 @@
+"""ThreatConnect HTTP/2 Requests Adapter"""
+# standard library
+import asyncio
+import io
+import logging
+import ssl
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple, Union
+
+# third-party
+from requests import PreparedRequest, Response
+from requests.adapters import DEFAULT_POOLSIZE, DEFAULT_RETRIES, BaseAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import ConnectTimeout, ProxyError, ReadTimeout, RetryError
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy
+from urllib3.util.retry import Retry
+
+# first-party
+from tcex.sessions.retry_policy import body_position, rewind_body
+
+try:
+    # third-party
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+# get tcex logger
+logger = logging.getLogger('tcex')
+
+
+class Http2Adapter(BaseAdapter):
+    """Requests adapter that sends requests over multiplexed HTTP/2 connections.
+
+    Concurrent requests from all threads using the session share a single HTTP/2 connection per
+    origin (negotiated with ALPN, servers without HTTP/2 support fall back to HTTP/1.1).  The
+    requests are prepared by the session, so auth, hooks, and the session level retry policy are
+    unchanged, and the response is returned as a requests Response.
+
+    The connection state (stream ids and HPACK header compression) is not thread-safe, so the
+    connections are driven by an event loop in a single background thread and the calling thread
+    waits for the result.
+
+    Requires the httpx package with HTTP/2 support (pip install tcex[http2]).
+
+    Args:
+        max_retries: The retry configuration for connection errors and retry status codes.
+        pool_maxsize: The max number of connections per client.
+        http1: If False, use HTTP/2 with prior knowledge (e.g., for a h2c server).
+    """
+
+    def __init__(
+        self,
+        max_retries: Optional[Union[int, Retry]] = DEFAULT_RETRIES,
+        pool_maxsize: Optional[int] = DEFAULT_POOLSIZE,
+        http1: Optional[bool] = True,
+    ):
+        """Initialize Class properties."""
+        if httpx is None:  # pragma: no cover
+            raise RuntimeError('The httpx package is required for HTTP/2 support.')
+
+        super().__init__()
+        self.http1 = http1
+        self.log = logger
+        self.max_retries = (
+            max_retries if isinstance(max_retries, Retry) else Retry(max_retries, read=False)
+        )
+        self.pool_maxsize = pool_maxsize
+
+        # properties
+        self._clients: Dict[Tuple, 'httpx.AsyncClient'] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def _raise(ex: Exception, request: PreparedRequest) -> None:
+        """Raise the requests exception for the httpx exception."""
+        if isinstance(ex, httpx.ProxyError):
+            raise ProxyError(ex, request=request) from ex
+        if isinstance(ex, httpx.ConnectTimeout):
+            raise ConnectTimeout(ex, request=request) from ex
+        if isinstance(ex, httpx.TimeoutException):
+            raise ReadTimeout(ex, request=request) from ex
+        raise RequestsConnectionError(ex, request=request) from ex
+
+    @staticmethod
+    def _ssl_context(
+        verify: Union[bool, str], cert: Optional[Union[str, tuple]]
+    ) -> Union[bool, ssl.SSLContext]:
+        """Return the httpx verify setting for the requests verify and cert settings."""
+        if verify is True and not cert:
+            return True
+
+        context = ssl.create_default_context(cafile=verify if isinstance(verify, str) else None)
+        if verify is False:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        if cert:
+            context.load_cert_chain(*(cert if isinstance(cert, tuple) else (cert,)))
+        return context
+
+    @staticmethod
+    def _timeout(timeout: Optional[Union[float, tuple]]) -> 'httpx.Timeout':
+        """Return the httpx timeout for the requests timeout (total or (connect, read))."""
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    @staticmethod
+    def _content(body: Any) -> Any:
+        """Return the httpx content for the request body (file and iterator bodies are streamed)."""
+        if body is None or isinstance(body, (bytes, str)):
+            return body
+
+        async def _stream():
+            chunks = iter(lambda: body.read(65536), b'') if hasattr(body, 'read') else body
+            for chunk in chunks:
+                yield chunk.encode() if isinstance(chunk, str) else chunk
+
+        return _stream()
+
+    @staticmethod
+    async def _send(client: 'httpx.AsyncClient', request: 'httpx.Request') -> Tuple:
+        """Send the request and read the response content."""
+        response = await client.send(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        return response, content
+
+    def client(
+        self,
+        verify: Union[bool, str],
+        cert: Optional[Union[str, tuple]] = None,
+        proxy: Optional[str] = None,
+    ) -> 'httpx.AsyncClient':
+        """Return the (shared) HTTP/2 client for the verify, cert, and proxy settings.
+
+        Args:
+            verify: A boolean to enable/disable SSL verification or the path to a CA bundle.
+            cert: The client certificate.
+            proxy: The proxy URL.
+        """
+        key = (verify, cert, proxy)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._clients[key] = httpx.AsyncClient(
+                        http1=self.http1,
+                        http2=True,
+                        limits=httpx.Limits(max_connections=self.pool_maxsize),
+                        proxy=proxy,
+                        trust_env=False,
+                        verify=self._ssl_context(verify, cert),
+                    )
+        return client
+
+    def close(self) -> None:
+        """Close all clients and their connections and stop the event loop."""
+        with self._lock:
+            clients, self._clients = self._clients, {}
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            for client in clients.values():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Return the event loop that drives the HTTP/2 connections."""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(
+                        target=loop.run_forever, name='tcex-http2', daemon=True
+                    ).start()
+                    self._loop = loop
+        return self._loop
+
+    def send(  # pylint: disable=arguments-differ,unused-argument
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: Optional[Union[float, tuple]] = None,
+        verify: Union[bool, str] = True,
+        cert: Optional[Union[str, tuple]] = None,
+        proxies: Optional[dict] = None,
+    ) -> Response:
+        """Send the PreparedRequest over HTTP/2 and return a Response."""
+        client = self.client(verify, cert, select_proxy(request.url, proxies or {}))
+        loop = self.loop
+
+        # only a body that can be rewound (e.g., bytes or a seekable file) is sent again
+        position = body_position(request.body)
+        retries = self.max_retries
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            httpx_request = client.build_request(
+                request.method,
+                request.url,
+                content=self._content(request.body),
+                headers={k: str(v) for k, v in request.headers.items()},
+                timeout=self._timeout(timeout),
+            )
+            try:
+                httpx_response, content = asyncio.run_coroutine_threadsafe(
+                    self._send(client, httpx_request), loop
+                ).result()
+            except (httpx.TransportError, httpx.ProxyError) as ex:
+                attempt += 1
+                if attempt > (retries.total or 0) or not rewind_body(request.body, position):
+                    self._raise(ex, request)
+                self.log.debug(
+                    f'feature=http2-adapter, event=retry, attempt={attempt}, error={ex}, '
+                    f'request-url={request.url}'
+                )
+                time.sleep(retries.backoff_factor * (2 ** (attempt - 1)))
+                continue
+
+            if retries.is_retry(request.method, httpx_response.status_code):
+                attempt += 1
+                if not rewind_body(request.body, position):
+                    self.log.warning(
+                        f'feature=http2-adapter, event=body-not-replayable, '
+                        f'status-code={httpx_response.status_code}, request-url={request.url}'
+                    )
+                    break
+                if attempt <= (retries.total or 0):
+                    time.sleep(retries.backoff_factor * (2 ** (attempt - 1)))
+                    continue
+                if retries.raise_on_status:
+                    raise RetryError(
+                        f'Max retries exceeded with url: {request.path_url} '
+                        f'(too many {httpx_response.status_code} error responses)',
+                        request=request,
+                    )
+            break
+
+        response = Response()
+        # the content was already read, raw allows iter_content/stream=True to read it again
+        response._content = content  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        response.connection = self
+        response.elapsed = timedelta(seconds=time.perf_counter() - start)
+        response.headers = CaseInsensitiveDict(httpx_response.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.http_version = httpx_response.http_version
+        response.raw = io.BytesIO(content)
+        response.reason = httpx_response.reason_phrase
+        response.request = request
+        response.status_code = httpx_response.status_code
+        response.url = str(httpx_response.url)
+        return response
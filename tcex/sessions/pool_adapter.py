@@ -0,0 +1,217 @@
+"""ThreatConnect Requests Session"""
+# standard library
+import threading
+import time
+from typing import Optional
+
+# third-party
+from requests import adapters
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, DEFAULT_RETRIES
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager, ProxyManager
+
+
+class PoolMetrics:
+    """Connection Pool Metrics
+
+    Thread safe counters for the connection pools of an adapter. Every checkout of a connection
+    from a pool records the time spent waiting for the connection (only non-zero when the pool
+    is blocking and all connections are in use) and whether an existing (kept-alive) connection
+    was reused or a new connection (TCP/TLS handshake) was required.
+    """
+
+    def __init__(self):
+        """Initialize Class properties."""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record(self, wait_time: float, reused: bool, expired: bool = False) -> None:
+        """Record a connection checkout.
+
+        Args:
+            wait_time: The number of seconds spent waiting for a connection.
+            reused: If True an existing connection was reused.
+            expired: If True an idle connection was closed by the keep-alive timeout.
+        """
+        with self._lock:
+            if reused:
+                self.connections_reused += 1
+            else:
+                self.connections_new += 1
+            if expired:
+                self.connections_expired += 1
+            self.wait_time += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+
+    def reset(self) -> None:
+        """Reset all counters."""
+        with self._lock:
+            self.connections_expired = 0
+            self.connections_new = 0
+            self.connections_reused = 0
+            self.wait_time = 0.0
+            self.wait_time_max = 0.0
+
+    @property
+    def reuse_rate(self) -> float:
+        """Return the percentage (0.0-1.0) of connection checkouts that reused a connection."""
+        checkouts = self.connections_new + self.connections_reused
+        return self.connections_reused / checkouts if checkouts else 0.0
+
+    @property
+    def summary(self) -> dict:
+        """Return the metrics as a dict (e.g., for logging)."""
+        with self._lock:
+            checkouts = self.connections_new + self.connections_reused
+            return {
+                'checkouts': checkouts,
+                'connections_expired': self.connections_expired,
+                'connections_new': self.connections_new,
+                'connections_reused': self.connections_reused,
+                'reuse_rate': round(self.reuse_rate, 4),
+                'wait_time_avg': round(self.wait_time / checkouts, 6) if checkouts else 0.0,
+                'wait_time_max': round(self.wait_time_max, 6),
+                'wait_time_total': round(self.wait_time, 6),
+            }
+
+
+class _ConnectionPoolMixin:
+    """Connection pool that records metrics and enforces the idle keep-alive timeout."""
+
+    keep_alive: Optional[float] = None
+    metrics: Optional[PoolMetrics] = None
+
+    def _get_conn(self, timeout: Optional[float] = None):
+        """Return a connection from the pool recording the wait time and reuse."""
+        start = time.perf_counter()
+        conn = super()._get_conn(timeout)  # pylint: disable=no-member
+        wait_time = time.perf_counter() - start
+
+        # a connection with an open socket was kept alive from a previous request
+        reused = getattr(conn, 'sock', None) is not None
+        expired = False
+        if (
+            reused
+            and self.keep_alive is not None
+            and time.monotonic() - getattr(conn, 'tcex_idle_since', 0) > self.keep_alive
+        ):
+            # the server (or a proxy/load balancer) has likely closed the idle connection
+            conn.close()
+            reused = False
+            expired = True
+
+        if self.metrics is not None:
+            self.metrics.record(wait_time, reused, expired)
+        return conn
+
+    def _put_conn(self, conn) -> None:
+        """Return the connection to the pool recording the start of the idle time."""
+        if conn is not None:
+            conn.tcex_idle_since = time.monotonic()
+        super()._put_conn(conn)  # pylint: disable=no-member
+
+
+class _HTTPConnectionPool(_ConnectionPoolMixin, HTTPConnectionPool):
+    """HTTP connection pool with metrics and idle keep-alive timeout."""
+
+
+class _HTTPSConnectionPool(_ConnectionPoolMixin, HTTPSConnectionPool):
+    """HTTPS connection pool with metrics and idle keep-alive timeout."""
+
+
+class _PoolManagerMixin:
+    """Pool manager that creates connection pools with metrics and idle keep-alive timeout."""
+
+    def __init__(
+        self,
+        *args,
+        keep_alive: Optional[float] = None,
+        metrics: Optional[PoolMetrics] = None,
+        **kwargs,
+    ):
+        """Initialize Class properties."""
+        super().__init__(*args, **kwargs)
+        self.keep_alive = keep_alive
+        self.metrics = metrics
+        self.pool_classes_by_scheme = {'http': _HTTPConnectionPool, 'https': _HTTPSConnectionPool}
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        """Return a new connection pool configured with the metrics and keep-alive timeout."""
+        pool = super()._new_pool(scheme, host, port, request_context)  # pylint: disable=no-member
+        pool.keep_alive = self.keep_alive
+        pool.metrics = self.metrics
+        return pool
+
+
+class _PoolManager(_PoolManagerMixin, PoolManager):
+    """Pool manager with metrics and idle keep-alive timeout."""
+
+
+class _ProxyManager(_PoolManagerMixin, ProxyManager):
+    """Proxy manager with metrics and idle keep-alive timeout."""
+
+
+class PoolAdapter(adapters.HTTPAdapter):
+    """Adapter with configurable connection pooling and connection pool metrics.
+
+    Args:
+        pool_connections: The number of per-host connection pools to cache.
+        pool_maxsize: The max number of connections to keep in each per-host pool.
+        max_retries: The retry configuration.
+        pool_block: If True, block when all connections of a pool are in use instead of
+            opening an additional connection that is discarded after the request.
+        pool_keep_alive: The number of seconds a connection can be idle before it is closed
+            instead of being reused (None to reuse idle connections indefinitely).
+    """
+
+    __attrs__ = adapters.HTTPAdapter.__attrs__ + ['pool_keep_alive']
+
+    def __init__(
+        self,
+        pool_connections: Optional[int] = DEFAULT_POOLSIZE,
+        pool_maxsize: Optional[int] = DEFAULT_POOLSIZE,
+        max_retries: Optional[int] = DEFAULT_RETRIES,
+        pool_block: Optional[bool] = DEFAULT_POOLBLOCK,
+        pool_keep_alive: Optional[float] = None,
+    ):
+        """Initialize Class properties."""
+        self.pool_keep_alive = pool_keep_alive
+        self.pool_metrics = PoolMetrics()
+        super().__init__(pool_connections, pool_maxsize, max_retries, pool_block)
+
+    def init_poolmanager(self, connections, maxsize, block=DEFAULT_POOLBLOCK, **pool_kwargs):
+        """Initialize the urllib3 PoolManager with metrics and idle keep-alive timeout."""
+        if not hasattr(self, 'pool_metrics'):
+            # adapter was unpickled
+            self.pool_metrics = PoolMetrics()
+
+        # save these values for pickling
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+
+        self.poolmanager = _PoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            keep_alive=self.pool_keep_alive,
+            metrics=self.pool_metrics,
+            **pool_kwargs,
+        )
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        """Return the urllib3 ProxyManager with metrics and idle keep-alive timeout."""
+        if proxy in self.proxy_manager or proxy.lower().startswith('socks'):
+            return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+        manager = self.proxy_manager[proxy] = _ProxyManager(
+            proxy_url=proxy,
+            proxy_headers=self.proxy_headers(proxy),
+            num_pools=self._pool_connections,
+            maxsize=self._pool_maxsize,
+            block=self._pool_block,
+            keep_alive=self.pool_keep_alive,
+            metrics=self.pool_metrics,
+            **proxy_kwargs,
+        )
+        return manager
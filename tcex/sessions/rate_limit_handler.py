@@ -3,6 +3,7 @@
 See https://tools.ietf.org/id/draft-polli-ratelimit-headers-00.html for implementation details.
 """
 # standard library
+import threading
 import time
 from typing import Optional
 
@@ -38,6 +39,7 @@ class RateLimitHandler:
         self._limit_reset_header = limit_reset_header
         self._remaining_threshold = remaining_threshold
 
+        self._last_limit_lock = threading.Lock()
         self._last_limit_remaining_value = None
         self._last_limit_reset_value = None
 
@@ -91,10 +93,12 @@ class RateLimitHandler:
             and self.limit_remaining_header in response.headers
             and self.limit_reset_header in response.headers
         ):
-            self._last_limit_remaining_value = int(
-                response.headers.get(self.limit_remaining_header, 0)
-            )
-            self._last_limit_reset_value = response.headers.get(self.limit_reset_header)
+            # update both values together as the handler is shared by all session threads
+            with self._last_limit_lock:
+                self._last_limit_remaining_value = int(
+                    response.headers.get(self.limit_remaining_header, 0)
+                )
+                self._last_limit_reset_value = response.headers.get(self.limit_reset_header)
 
     def pre_send(self, request: PreparedRequest) -> None:
         """Call before request is sent and provides an opportunity to pause for rate limiting.
@@ -105,11 +109,11 @@ class RateLimitHandler:
         Args:
             request: The request to be sent.  Should not be modified in any way.
         """
-        if (
-            self.last_limit_remaining_value is not None
-            and self.last_limit_reset_value
-            and self.last_limit_remaining_value <= self.remaining_threshold
-        ):
+        with self._last_limit_lock:
+            remaining = self.last_limit_remaining_value
+            reset = self.last_limit_reset_value
+
+        if remaining is not None and reset and remaining <= self.remaining_threshold:
             self.sleep(request)
 
     def sleep(self, request: PreparedRequest) -> None:  # pylint: disable=unused-argument
@@ -0,0 +1,267 @@
+"""Process wide request instrumentation for the TcEx sessions."""
+# standard library
+import bisect
+import logging
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+# third-party
+from requests import PreparedRequest, Response
+
+# first-party
+from tcex.pleb.singleton import Singleton
+
+# get tcex logger
+logger = logging.getLogger('tcex')
+
+# path segments that are ids (e.g., /v3/groups/123 or /v2/indicators/files/<md5>)
+ID_SEGMENT = re.compile(r'^(\d+|[0-9a-fA-F-]{32,}|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27})$')
+
+
+class LatencyHistogram:
+    """Latency histogram with fixed buckets (milliseconds)."""
+
+    buckets = [5, 10, 25, 50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 30_000, 60_000]
+
+    def __init__(self):
+        """Initialize Class properties."""
+        self.count = 0
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.max = 0.0
+        self.total = 0.0
+
+    def add(self, ms: float) -> None:
+        """Add a latency value.
+
+        Args:
+            ms: The latency in milliseconds.
+        """
+        self.count += 1
+        self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+        self.max = max(self.max, ms)
+        self.total += ms
+
+    def percentile(self, percent: float) -> float:
+        """Return the upper bound of the bucket that contains the percentile.
+
+        Args:
+            percent: The percentile (0-100).
+        """
+        if self.count == 0:
+            return 0.0
+
+        threshold = self.count * percent / 100
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= threshold:
+                return float(self.buckets[index]) if index < len(self.buckets) else self.max
+        return self.max  # pragma: no cover
+
+
+class EndpointMetrics:
+    """Metrics for an endpoint (method and normalized path)."""
+
+    def __init__(self):
+        """Initialize Class properties."""
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self.rate_limit_sleep = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.retries = 0
+
+    @property
+    def summary(self) -> dict:
+        """Return the endpoint metrics as a dict."""
+        count = self.latency.count
+        return {
+            'count': count,
+            'errors': self.errors,
+            'latency_avg_ms': round(self.latency.total / count, 2) if count else 0.0,
+            'latency_max_ms': round(self.latency.max, 2),
+            'latency_p50_ms': self.latency.percentile(50),
+            'latency_p95_ms': self.latency.percentile(95),
+            'latency_total_ms': round(self.latency.total, 2),
+            'rate_limit_sleep_s': round(self.rate_limit_sleep, 3),
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+            'retries': self.retries,
+        }
+
+
+class RequestMetrics(metaclass=Singleton):
+    """Process wide request metrics.
+
+    The sessions record the latency (including retries and rate limit sleeps), the request and
+    response size, the number of retries, and the rate limit sleep time of every request per
+    endpoint.  Endpoints are the request method and the URL path with the ids replaced (e.g.,
+    GET /v3/groups/{id}) so that the number of endpoints is bounded.
+
+    Callbacks added with add_hook are called with the metrics of each request, e.g., to
+    forward them to an external metrics system.
+    """
+
+    def __init__(self):
+        """Initialize Class properties."""
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+        self._hooks: List[Callable[[dict], None]] = []
+        self._lock = threading.Lock()
+        self.enabled = True
+        self.log = logger
+
+    def _endpoint_metrics(self, endpoint: str) -> EndpointMetrics:
+        """Return the metrics for the endpoint (lock must be held)."""
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def add_hook(self, hook: Callable[[dict], None]) -> None:
+        """Add a callback that is called with the metrics of each request.
+
+        Args:
+            hook: The callback.
+        """
+        self._hooks.append(hook)
+
+    @staticmethod
+    def endpoint(method: str, url: str) -> str:
+        """Return the endpoint name for the request.
+
+        Args:
+            method: The HTTP method.
+            url: The request URL.
+        """
+        parts = urlsplit(url or '')
+        path = '/'.join(
+            '{id}' if ID_SEGMENT.match(segment) else segment for segment in parts.path.split('/')
+        )
+        return f'{method} {parts.netloc}{path}'
+
+    def heartbeat_metrics(self, top: int = 3) -> Dict[str, Union[int, str]]:
+        """Return the request metrics for the service heartbeat.
+
+        Args:
+            top: The number of endpoints with the most total latency to include.
+        """
+        summary = self.summary()
+        metrics = {
+            'HTTP Requests': summary.get('count'),
+            'HTTP Errors': summary.get('errors'),
+            'HTTP Retries': summary.get('retries'),
+            'HTTP Time (ms)': int(summary.get('latency_total_ms')),
+        }
+        for index, (endpoint, data) in enumerate(list(summary.get('endpoints').items())[:top]):
+            metrics[f'HTTP Top {index + 1}'] = (
+                f"{endpoint} ({data.get('count')} requests, "
+                f"{int(data.get('latency_total_ms'))} ms)"
+            )
+        return metrics
+
+    def log_summary(self) -> None:
+        """Log the summary of the request metrics (e.g., on exit)."""
+        summary = self.summary()
+        if not summary.get('count'):
+            return
+
+        self.log.info(
+            f'feature=request-metrics, requests={summary.get("count")}, '
+            f'errors={summary.get("errors")}, retries={summary.get("retries")}, '
+            f'time-ms={summary.get("latency_total_ms")}, '
+            f'rate-limit-sleep-s={summary.get("rate_limit_sleep_s")}'
+        )
+        for endpoint, data in summary.get('endpoints').items():
+            self.log.info(f'feature=request-metrics, endpoint={endpoint}, metrics={data}')
+
+    def record_rate_limit_sleep(self, request: PreparedRequest, seconds: float) -> None:
+        """Record the time spent waiting for the rate limit handler.
+
+        Args:
+            request: The request.
+            seconds: The number of seconds spent waiting.
+        """
+        if self.enabled:
+            with self._lock:
+                endpoint = self.endpoint(request.method, request.url)
+                self._endpoint_metrics(endpoint).rate_limit_sleep += seconds
+
+    def record_response(
+        self, response: Response, elapsed: float, response_bytes: Optional[int] = None
+    ) -> None:
+        """Record the latency and payload size of the request.
+
+        Args:
+            response: The response.
+            elapsed: The number of seconds for the request (including retries).
+            response_bytes: The size of the response (defaults to the size of the content).
+        """
+        if not self.enabled:
+            return
+
+        request = response.request
+        body = request.body
+        request_bytes = len(body) if isinstance(body, (bytes, str)) else 0
+        if response_bytes is None:
+            response_bytes = len(response.content or b'')
+
+        endpoint = self.endpoint(request.method, request.url)
+        with self._lock:
+            metrics = self._endpoint_metrics(endpoint)
+            metrics.latency.add(elapsed * 1_000)
+            metrics.request_bytes += request_bytes
+            metrics.response_bytes += response_bytes
+            if response.status_code >= 400:
+                metrics.errors += 1
+
+        for hook in self._hooks:
+            try:
+                hook(
+                    {
+                        'elapsed': elapsed,
+                        'endpoint': endpoint,
+                        'request_bytes': request_bytes,
+                        'response_bytes': response_bytes,
+                        'status_code': response.status_code,
+                    }
+                )
+            except Exception as ex:  # pragma: no cover
+                self.log.warning(f'feature=request-metrics, event=hook-failed, error={ex}')
+
+    def record_retry(self, request: PreparedRequest) -> None:
+        """Record a retry of the request.
+
+        Args:
+            request: The request.
+        """
+        if self.enabled:
+            with self._lock:
+                self._endpoint_metrics(self.endpoint(request.method, request.url)).retries += 1
+
+    def reset(self) -> None:
+        """Reset all metrics."""
+        with self._lock:
+            self._endpoints = {}
+
+    def summary(self) -> dict:
+        """Return the request metrics, endpoints are sorted by total latency (descending)."""
+        with self._lock:
+            endpoints = {k: v.summary for k, v in self._endpoints.items()}
+
+        endpoints = dict(
+            sorted(endpoints.items(), key=lambda i: i[1].get('latency_total_ms'), reverse=True)
+        )
+        return {
+            'count': sum(e.get('count') for e in endpoints.values()),
+            'endpoints': endpoints,
+            'errors': sum(e.get('errors') for e in endpoints.values()),
+            'latency_total_ms': round(
+                sum(e.get('latency_total_ms') for e in endpoints.values()), 2
+            ),
+            'rate_limit_sleep_s': round(
+                sum(e.get('rate_limit_sleep_s') for e in endpoints.values()), 3
+            ),
+            'retries': sum(e.get('retries') for e in endpoints.values()),
+        }
@@ -0,0 +1,236 @@
+"""Process wide HTTP response cache for idempotent requests."""
+# standard library
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional
+
+# third-party
+from requests import Request, Response
+from requests.structures import CaseInsensitiveDict
+
+# first-party
+from tcex.pleb.singleton import Singleton
+
+# get tcex logger
+logger = logging.getLogger('tcex')
+
+
+class ResponseCache(metaclass=Singleton):
+    """Process wide HTTP response cache.
+
+    Responses of idempotent requests (e.g., the static metadata of the ThreatConnect API) are
+    cached for the TTL provided by the caller.  The cache is shared by all sessions, so new
+    instances of the objects that request the metadata do not send the same request again.
+    Expired entries with an ETag or Last-Modified header are revalidated with a conditional
+    request instead of downloading the response again.
+
+    Entries are optionally persisted to disk (path), so the cache is shared across App
+    executions.  The session request methods use the cache when the cache_ttl kwarg is provided.
+    Entries are keyed by the auth identity of the request, so responses are never shared between
+    credentials, and only the headers required to serve and revalidate the entry are stored.
+    """
+
+    # the methods that can be cached
+    methods = ['GET', 'HEAD', 'OPTIONS']
+
+    # the response headers stored with the entry (e.g., not Set-Cookie)
+    entry_headers = ['cache-control', 'content-type', 'etag', 'last-modified']
+
+    # the request headers that change the response
+    vary_headers = ['accept', 'content-type']
+
+    def __init__(self):
+        """Initialize Class properties."""
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self.log = logger
+        self.max_entries = 1_000
+        self.path: Optional[str] = None
+
+    def _entry(self, key: str) -> Optional[dict]:
+        """Return the cache entry from memory or disk."""
+        entry = self._entries.get(key)
+        if entry is None and self.path is not None:
+            try:
+                with open(os.path.join(self.path, f'{key}.json'), encoding='utf-8') as fh:
+                    entry = json.load(fh)
+            except (OSError, ValueError):
+                return None
+            self._set_entry(key, entry, persist=False)
+        return entry
+
+    @staticmethod
+    def _response(entry: dict, request: Request) -> Response:
+        """Return a response for the cache entry."""
+        content = base64.b64decode(entry['content'])
+        response = Response()
+        # raw allows iter_content/stream=True to read the cached content
+        response._content = content  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        response.elapsed = timedelta(0)
+        response.encoding = entry['encoding']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.raw = io.BytesIO(content)
+        response.reason = entry['reason']
+        response.request = request.prepare()
+        response.status_code = entry['status_code']
+        response.url = entry['url']
+        return response
+
+    def _set_entry(self, key: str, entry: dict, persist: bool = True) -> None:
+        """Add the entry to the cache, evicting the oldest entry when the cache is full."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+
+        if persist and self.path is not None:
+            fqfn = os.path.join(self.path, f'{key}.json')
+            try:
+                os.makedirs(self.path, exist_ok=True)
+                with open(f'{fqfn}.{threading.get_ident()}', 'w', encoding='utf-8') as fh:
+                    json.dump(entry, fh)
+                os.replace(f'{fqfn}.{threading.get_ident()}', fqfn)
+            except OSError as ex:
+                self.log.warning(f'feature=response-cache, event=persist-failed, error={ex}')
+
+    def clear(self) -> None:
+        """Remove all entries from the cache (memory and disk)."""
+        with self._lock:
+            self._entries = {}
+
+        if self.path is not None and os.path.isdir(self.path):
+            for filename in os.listdir(self.path):
+                if filename.endswith('.json'):
+                    try:
+                        os.unlink(os.path.join(self.path, filename))
+                    except OSError:  # pragma: no cover
+                        pass
+
+    @staticmethod
+    def identity(auth: Any = None, headers: Optional[dict] = None) -> Optional[str]:
+        """Return the identity (credentials) the request is sent with.
+
+        Args:
+            auth: The auth of the request or session.
+            headers: The request headers (including the session headers).
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        if headers.get('authorization') is not None:
+            return str(headers.get('authorization'))
+
+        if auth is None:
+            return None
+        if getattr(auth, 'tc_api_access_id', None) is not None:
+            return f'hmac:{auth.tc_api_access_id}'
+
+        tc_token = getattr(auth, 'tc_token', None)
+        if hasattr(tc_token, 'token'):
+            # Token Module - the token is selected by the current thread name or trigger id
+            return f'token:{tc_token.key}'
+        if tc_token is not None:
+            return auth._token_header()  # pylint: disable=protected-access
+        if isinstance(auth, tuple):
+            return f'basic:{auth[0]}'
+        return f'auth:{id(auth)}'
+
+    def key(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        auth: Any = None,
+    ) -> str:
+        """Return the cache key for the request.
+
+        Args:
+            method: The HTTP method.
+            url: The full URL.
+            params: The query parameters.
+            headers: The request headers (only the vary headers are part of the key).
+            auth: The auth of the request or session.
+        """
+        identity = self.identity(auth, headers)
+        params = params.items() if isinstance(params, dict) else params or []
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        data = {
+            'headers': [[h, str(headers.get(h))] for h in self.vary_headers if h in headers],
+            'identity': identity,
+            'method': method.upper(),
+            'params': sorted([str(k), str(v)] for k, v in params),
+            'url': url,
+        }
+        return hashlib.sha256(json.dumps(data).encode('utf-8')).hexdigest()
+
+    def send(
+        self,
+        send: Callable[[dict], Response],
+        method: str,
+        url: str,
+        ttl: float,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        auth: Any = None,
+    ) -> Response:
+        """Return the cached response or send the request and cache the response.
+
+        Args:
+            send: A callable that sends the request with the provided (conditional) headers.
+            method: The HTTP method.
+            url: The full URL.
+            ttl: The number of seconds the response is fresh.
+            params: The query parameters.
+            headers: The request headers (including the session headers).
+            auth: The auth of the request or session.
+        """
+        if method.upper() not in self.methods:
+            return send({})
+
+        key = self.key(method, url, params, headers, auth)
+        request = Request(method.upper(), url, headers=headers, params=params)
+        entry = self._entry(key)
+        if entry is not None and entry['expires'] > time.time():
+            self.log.debug(f'feature=response-cache, event=hit, method={method}, url={url}')
+            return self._response(entry, request)
+
+        # revalidate the expired entry using a conditional request
+        conditional_headers = {}
+        if entry is not None:
+            cached_headers = CaseInsensitiveDict(entry['headers'])
+            if cached_headers.get('ETag'):
+                conditional_headers['If-None-Match'] = cached_headers['ETag']
+            if cached_headers.get('Last-Modified'):
+                conditional_headers['If-Modified-Since'] = cached_headers['Last-Modified']
+
+        response = send(conditional_headers)
+        if response.status_code == 304 and entry is not None:
+            self.log.debug(f'feature=response-cache, event=revalidated, method={method}, url={url}')
+            entry = dict(entry, expires=time.time() + ttl)
+            self._set_entry(key, entry)
+            return self._response(entry, request)
+
+        if response.status_code == 200:
+            self._set_entry(
+                key,
+                {
+                    'content': base64.b64encode(response.content).decode('ascii'),
+                    'encoding': response.encoding,
+                    'expires': time.time() + ttl,
+                    'headers': {
+                        k: v for k, v in response.headers.items() if k.lower() in self.entry_headers
+                    },
+                    'reason': response.reason,
+                    'status_code': response.status_code,
+                    'url': response.url,
+                },
+            )
+        return response
@@ -0,0 +1,273 @@
+"""Session level retry policy for throttled (429) and unavailable (503) responses.
+
+Connection errors and 500/502/504 responses are retried by urllib3 in the session adapter.  The
+RetryPolicy retries the responses that indicate the server is overloaded, honoring the Retry-After
+header and using decorrelated jitter backoff (https://aws.amazon.com/blogs/architecture/
+exponential-backoff-and-jitter/) so that many threads or Apps do not retry in lock step.  An
+optional (opt-in) CircuitBreaker shared by all requests of the session stops sending requests when
+the upstream is down instead of retrying every request.
+"""
+# standard library
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+# third-party
+from requests import Response
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+# first-party
+from tcex.sessions.request_metrics import RequestMetrics
+
+# get tcex logger
+logger = logging.getLogger('tcex')
+
+
+def body_position(body: Any) -> Optional[int]:
+    """Return the position of a seekable request body (None if the body can't be rewound).
+
+    Args:
+        body: The request body (e.g., the data kwarg).
+    """
+    if hasattr(body, 'seek') and hasattr(body, 'tell'):
+        try:
+            if not hasattr(body, 'seekable') or body.seekable():
+                return body.tell()
+        except (OSError, ValueError):
+            pass
+    return None
+
+
+def rewind_body(body: Any, position: Optional[int]) -> bool:
+    """Rewind the request body so that it can be sent again, return False if not possible.
+
+    Bytes, str, and form data can always be sent again, seekable streams are rewound to the
+    position before the first send, generators and streams that can't seek can't be replayed.
+
+    Args:
+        body: The request body (e.g., the data kwarg).
+        position: The position of the body before the first send (see body_position).
+    """
+    if body is None or isinstance(body, (bytes, bytearray, dict, list, str, tuple)):
+        return True
+    if position is None:
+        return False
+    try:
+        body.seek(position)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+class CircuitBreakerOpenError(RequestsConnectionError):
+    """Request was not sent because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker.
+
+    The breaker opens after failure_threshold consecutive failures.  While open, requests fail
+    immediately with CircuitBreakerOpenError.  After recovery_timeout seconds a single trial
+    request is allowed (half-open), success closes the breaker and failure opens it again.
+
+    Args:
+        failure_threshold: The number of consecutive failures that open the breaker.
+        recovery_timeout: The number of seconds the breaker stays open before a trial request.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """Initialize Class properties."""
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        # properties
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._opened_at: Optional[float] = None
+        self._trial = False
+
+    def before_request(self) -> None:
+        """Raise CircuitBreakerOpenError if the request should not be sent."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+
+            remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+            if remaining > 0 or self._trial:
+                raise CircuitBreakerOpenError(
+                    f'Circuit breaker is open after {self._failures} consecutive failures, '
+                    f'retry in {max(remaining, 0):.1f} seconds.'
+                )
+
+            # half-open, allow a single trial request
+            self._trial = True
+
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial:
+                    logger.warning(
+                        f'feature=retry-policy, event=circuit-breaker-open, '
+                        f'failures={self._failures}, recovery-timeout={self.recovery_timeout}'
+                    )
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info('feature=retry-policy, event=circuit-breaker-closed')
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    @property
+    def state(self) -> str:
+        """Return the state of the breaker (closed, half-open, or open)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if self._trial or time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return 'half-open'
+            return 'open'
+
+
+class RetryPolicy:
+    """Retry policy for throttled and unavailable responses.
+
+    Args:
+        retries: The max number of retries for a request.
+        backoff_base: The min number of seconds to wait between retries.
+        backoff_max: The max number of seconds to wait between retries.
+        budget: The max total number of seconds a request can spend waiting for retries.
+        status_forcelist: The status codes to retry.
+        circuit_breaker: The circuit breaker (None to disable).
+    """
+
+    def __init__(
+        self,
+        retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 60.0,
+        budget: float = 120.0,
+        status_forcelist: tuple = (429, 503),
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
+        """Initialize Class properties."""
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget = budget
+        self.circuit_breaker = circuit_breaker
+        self.retries = retries
+        self.status_forcelist = status_forcelist
+
+    def backoff(self, previous: float) -> float:
+        """Return the decorrelated jitter backoff for the previous backoff.
+
+        Args:
+            previous: The previous backoff in seconds.
+        """
+        return min(self.backoff_max, random.uniform(self.backoff_base, previous * 3))  # nosec
+
+    @staticmethod
+    def retry_after(response: Response) -> Optional[float]:
+        """Return the number of seconds from the Retry-After header (delta seconds or HTTP date).
+
+        Args:
+            response: The response.
+        """
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+
+        try:
+            return max(float(value), 0.0)
+        except (TypeError, ValueError):
+            pass
+
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def send(
+        self,
+        send: Callable[[], Response],
+        retry_after_handler: Optional[Callable[[Response], float]] = None,
+        body: Any = None,
+    ) -> Response:
+        """Send the request, retrying throttled and unavailable responses.
+
+        The last response is returned when the retries or the budget are exhausted, or when
+        the request body can't be sent again (e.g., a generator or a stream that can't seek).
+
+        Args:
+            send: A callable that sends the request and returns the response.
+            retry_after_handler: An optional callable that returns the number of seconds to wait
+                for a response (defaults to the Retry-After header).
+            body: The request body, seekable bodies are rewound before each retry.
+        """
+        position = body_position(body)
+        backoff = self.backoff_base
+        waited = 0.0
+        retry_after_handler = retry_after_handler or self.retry_after
+
+        attempt = 0
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request()
+
+            try:
+                response = send()
+            except Exception:
+                # connection errors and 5xx responses were already retried by urllib3, any other
+                # error (e.g., a read timeout) must also be recorded to end a half-open trial
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                raise
+
+            if response.status_code not in self.status_forcelist:
+                if self.circuit_breaker is not None:
+                    if response.status_code >= 500:
+                        self.circuit_breaker.record_failure()
+                    else:
+                        self.circuit_breaker.record_success()
+                return response
+
+            # throttling (429) means the upstream is up, only unavailable trips the breaker
+            if self.circuit_breaker is not None:
+                if response.status_code == 429:
+                    self.circuit_breaker.record_success()
+                else:
+                    self.circuit_breaker.record_failure()
+
+            backoff = self.backoff(backoff)
+            delay = float(retry_after_handler(response) or backoff)
+            if attempt >= self.retries or waited + delay > self.budget:
+                logger.warning(
+                    f'feature=retry-policy, event=retries-exhausted, attempts={attempt + 1}, '
+                    f'status-code={response.status_code}, request-url={response.request.url}'
+                )
+                return response
+
+            if not rewind_body(body, position):
+                logger.warning(
+                    f'feature=retry-policy, event=body-not-replayable, '
+                    f'status-code={response.status_code}, request-url={response.request.url}'
+                )
+                return response
+
+            attempt += 1
+            logger.debug(
+                f'feature=retry-policy, event=retry, attempt={attempt}, delay={delay:.2f}, '
+                f'status-code={response.status_code}, request-url={response.request.url}'
+            )
+            RequestMetrics().record_retry(response.request)
+            time.sleep(delay)
+            waited += delay
@@ -0,0 +1,137 @@
+"""Request coalescing (single-flight) for concurrent identical requests."""
+# standard library
+import copy
+import logging
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Pattern, Union
+
+# third-party
+from requests import Response
+
+# first-party
+from tcex.sessions.response_cache import ResponseCache
+
+# get tcex logger
+logger = logging.getLogger('tcex')
+
+
+class _Call:
+    """An in-flight request."""
+
+    __slots__ = ['event', 'exception', 'response', 'waiters']
+
+    def __init__(self):
+        """Initialize Class properties."""
+        self.event = threading.Event()
+        self.exception: Optional[Exception] = None
+        self.response: Optional[Response] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent identical idempotent requests into a single request.
+
+    When a request matches one of the URL patterns and an identical request (method, URL,
+    params, vary headers, and auth identity) is already in-flight, the request waits for the
+    in-flight request and receives a copy of its response (or its exception) instead of sending
+    another request.  Requests sent with different credentials (e.g., the per thread tokens of
+    an API Service App) are never coalesced.
+
+    Args:
+        patterns: The URL patterns (regular expressions) of the requests to coalesce.
+    """
+
+    # the methods that can be coalesced
+    methods = ['GET', 'HEAD', 'OPTIONS']
+
+    def __init__(self, patterns: Optional[List[Union[str, Pattern]]] = None):
+        """Initialize Class properties."""
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.log = logger
+        self.patterns: List[Pattern] = []
+
+        for pattern in patterns or []:
+            self.add_pattern(pattern)
+
+    def add_pattern(self, pattern: Union[str, Pattern]) -> None:
+        """Add a URL pattern (regular expression) of the requests to coalesce.
+
+        Args:
+            pattern: The URL pattern (e.g., r'/v3/security/owners').
+        """
+        self.patterns.append(re.compile(pattern) if isinstance(pattern, str) else pattern)
+
+    @staticmethod
+    def identity(auth: Any = None, headers: Optional[dict] = None) -> Optional[str]:
+        """Return the identity (credentials) the request is sent with.
+
+        Args:
+            auth: The auth of the request or session.
+            headers: The request headers (including the session headers).
+        """
+        return ResponseCache.identity(auth, headers)
+
+    def match(self, method: str, url: str) -> bool:
+        """Return True if the request should be coalesced.
+
+        Args:
+            method: The HTTP method.
+            url: The full URL.
+        """
+        return method.upper() in self.methods and any(p.search(url) for p in self.patterns)
+
+    def send(
+        self,
+        send: Callable[[], Response],
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        auth: Any = None,
+    ) -> Response:
+        """Send the request or wait for an identical in-flight request.
+
+        Args:
+            send: A callable that sends the request and returns the response.
+            method: The HTTP method.
+            url: The full URL.
+            params: The query parameters.
+            headers: The request headers (including the session headers).
+            auth: The auth of the request or session.
+        """
+        if not self.match(method, url):
+            return send()
+
+        key = ResponseCache().key(method, url, params, headers, auth)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            # an identical request is in-flight, wait for the response
+            call.event.wait()
+            if call.exception is not None:
+                raise call.exception
+            return copy.copy(call.response)
+
+        try:
+            call.response = send()
+            return call.response
+        except Exception as ex:
+            call.exception = ex
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            if call.waiters:
+                self.log.debug(
+                    f'feature=single-flight, event=coalesced, waiters={call.waiters}, '
+                    f'method={method}, url={url}'
+                )
+            call.event.set()
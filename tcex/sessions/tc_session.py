@@ -1,14 +1,21 @@
 """ThreatConnect Requests Session"""
 # standard library
 import logging
+import time
 from typing import TYPE_CHECKING, Dict, Optional, Union
 
 # third-party
 import urllib3
-from requests import Session, adapters
+from requests import Session
 from urllib3.util.retry import Retry
 
 # first-party
+from tcex.sessions.http2_adapter import Http2Adapter
+from tcex.sessions.pool_adapter import PoolAdapter, PoolMetrics
+from tcex.sessions.request_metrics import RequestMetrics
+from tcex.sessions.response_cache import ResponseCache
+from tcex.sessions.retry_policy import CircuitBreaker, RetryPolicy, body_position, rewind_body
+from tcex.sessions.single_flight import SingleFlight
 from tcex.utils.requests_to_curl import RequestsToCurl
 from tcex.utils.utils import Utils
 
@@ -30,7 +37,23 @@ logger = logging.getLogger('tcex')
 
 
 class TcSession(Session):
-    """ThreatConnect REST API Requests Session"""
+    """ThreatConnect REST API Requests Session
+
+    Args:
+        auth: The ThreatConnect API authentication handler.
+        base_url: The base URL for all requests.
+        log_curl: If True, log all requests as curl commands.
+        proxies: The proxy settings.
+        proxies_enabled: If True, use the proxy settings.
+        user_agent: The User-Agent header.
+        verify: A boolean to enable/disable SSL verification or the path to a CA bundle.
+        pool_block: If True, block when all pooled connections are in use.
+        pool_connections: The number of per-host connection pools to cache.
+        pool_keep_alive: The number of seconds a pooled connection can be idle before it is closed.
+        pool_maxsize: The max number of connections to keep in each per-host pool.
+        http2: If True, send requests over multiplexed HTTP/2 connections (requires httpx).
+        circuit_breaker: If True, stop sending requests after consecutive failures.
+    """
 
     def __init__(
         self,
@@ -41,6 +64,12 @@ class TcSession(Session):
         proxies_enabled: Optional[bool] = False,
         user_agent: Optional[dict] = None,
         verify: Optional[Union[bool, str]] = True,
+        pool_block: Optional[bool] = False,
+        pool_connections: Optional[int] = 10,
+        pool_keep_alive: Optional[float] = None,
+        pool_maxsize: Optional[int] = 10,
+        http2: Optional[bool] = False,
+        circuit_breaker: Optional[bool] = False,
     ):
         """Initialize the Class properties."""
         super().__init__()
@@ -48,8 +77,23 @@ class TcSession(Session):
         self.log = logger
         self.log_curl = log_curl
 
+        # connection pool settings
+        self.http2 = http2
+        self.pool_block = pool_block
+        self.pool_connections = pool_connections
+        self.pool_keep_alive = pool_keep_alive
+        self.pool_maxsize = pool_maxsize
+
         # properties
+        self.request_metrics = RequestMetrics()
         self.requests_to_curl = RequestsToCurl()
+        self.response_cache = ResponseCache()
+        self.retry_policy = RetryPolicy(
+            circuit_breaker=CircuitBreaker() if circuit_breaker else None
+        )
+        self.single_flight = SingleFlight(
+            [r'/internal/variable/runtime/', r'/v2/types/', r'/v3/security/owners']
+        )
         self.utils = Utils()
 
         # configure auth
@@ -86,18 +130,30 @@ class TcSession(Session):
                 except Exception:  # nosec
                     pass  # logging curl command is best effort
 
-    def request(self, method, url, **kwargs):  # pylint: disable=arguments-differ
-        """Override request method disabling verify on token renewal if disabled on session."""
-        response = super().request(method, self.url(url), **kwargs)
-
-        # retry request in case we encountered a race condition with token renewal monitor
-        if response.status_code == 401:
+    @property
+    def pool_metrics(self) -> Optional[PoolMetrics]:
+        """Return the connection pool metrics (pool wait time and connection reuse)."""
+        return getattr(self.get_adapter('https://'), 'pool_metrics', None)
+
+    def _request(self, method: str, url: str, **kwargs) -> 'Response':
+        """Send the request, retrying throttled/unavailable responses and 401 responses."""
+        start = time.perf_counter()
+        send = super().request
+        body = kwargs.get('data')
+        position = body_position(body)
+        response = self.retry_policy.send(lambda: send(method, self.url(url), **kwargs), body=body)
+
+        # retry request in case we encountered a race condition with token renewal monitor,
+        # a request body that was already consumed (e.g., a generator) can't be sent again
+        if response.status_code == 401 and rewind_body(body, position):
             self.log.debug(
                 f'Unexpected response received while attempting to send a request using internal '
                 f'session object. Retrying request. feature=tc-session, '
                 f'request-url={response.request.url}, status-code={response.status_code}'
             )
-            response = super().request(method, self.url(url), **kwargs)
+            response = self.retry_policy.send(
+                lambda: send(method, self.url(url), **kwargs), body=body
+            )
 
         # optionally log the curl command
         self._log_curl(response)
@@ -108,8 +164,59 @@ class TcSession(Session):
             f'status-code={response.status_code}, elapsed={response.elapsed}'
         )
 
+        # record the request latency and payload (don't read the content of streamed responses)
+        self.request_metrics.record_response(
+            response,
+            time.perf_counter() - start,
+            int(response.headers.get('Content-Length') or 0) if kwargs.get('stream') else None,
+        )
+
         return response
 
+    def request(self, method, url, **kwargs):  # pylint: disable=arguments-differ
+        """Override request method disabling verify on token renewal if disabled on session.
+
+        Throttled (429) and unavailable (503) responses are retried using the retry policy.
+
+        Args:
+            method: The HTTP method.
+            url: The URL path or the full URL.
+            cache_ttl (kwargs): If provided, the response of an idempotent request is cached for
+                this number of seconds in the process wide response cache.
+        """
+        cache_ttl = kwargs.pop('cache_ttl', None)
+        params = kwargs.get('params')
+        headers = kwargs.get('headers')
+
+        def _send_conditional(conditional_headers: dict) -> 'Response':
+            request_headers = dict(headers or {}, **conditional_headers)
+            return self._request(method, url, **dict(kwargs, headers=request_headers))
+
+        def _send() -> 'Response':
+            if cache_ttl is None:
+                return self._request(method, url, **kwargs)
+            return self.response_cache.send(
+                _send_conditional,
+                method,
+                self.url(url),
+                cache_ttl,
+                params,
+                dict(self.headers, **(headers or {})),
+                kwargs.get('auth') or self.auth,
+            )
+
+        # concurrent identical requests matching the single flight patterns share one request
+        if kwargs.get('stream'):
+            return _send()
+        return self.single_flight.send(
+            _send,
+            method,
+            self.url(url),
+            params,
+            dict(self.headers, **(headers or {})),
+            kwargs.get('auth') or self.auth,
+        )
+
     def retry(self, retries=3, backoff_factor=0.3, status_forcelist=(500, 502, 504)):
         """Add retry to Requests Session
 
@@ -122,8 +229,20 @@ class TcSession(Session):
             backoff_factor=backoff_factor,
             status_forcelist=status_forcelist,
         )
+        if self.http2:
+            # concurrent requests are multiplexed over a single connection per host
+            adapter = Http2Adapter(max_retries=retries, pool_maxsize=self.pool_maxsize)
+        else:
+            adapter = PoolAdapter(
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                max_retries=retries,
+                pool_block=self.pool_block,
+                pool_keep_alive=self.pool_keep_alive,
+            )
+
         # mount all https requests
-        self.mount('https://', adapters.HTTPAdapter(max_retries=retries))
+        self.mount('https://', adapter)
 
     def url(self, url: str) -> str:
         """Return appropriate URL string.
@@ -0,0 +1,248 @@
+"""The TokenBucketRateLimitHandler implements proactive request throttling using token buckets.
+
+Requests are paced by one or more named token buckets (e.g., one per host or API path) that are
+shared by all threads using the session.  The rate of each bucket is calibrated from the
+X-RateLimit headers of the responses, spreading the remaining requests evenly over the time until
+the rate limit resets instead of sending a burst and then waiting for the whole window.
+"""
+# standard library
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# third-party
+from requests import PreparedRequest, Response
+
+# first-party
+from tcex.sessions.rate_limit_handler import RateLimitHandler
+from tcex.utils import Utils
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Each request takes a token from the bucket.  Tokens are added at the given rate up to the
+    bucket capacity (the allowed burst).  When the bucket is empty, a request reserves the next
+    token and waits until it is available, so concurrent threads are released one at a time at
+    the bucket rate instead of all at once.
+
+    Args:
+        rate: The number of tokens added per second (None for unlimited until calibrated).
+        capacity: The max number of tokens in the bucket (defaults to max(rate, 1)).
+    """
+
+    def __init__(self, rate: Optional[float] = None, capacity: Optional[float] = None):
+        """Initialize Class properties."""
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._updated = time.monotonic()
+        self.capacity = float(capacity or max(rate or 1, 1))
+        self.rate = rate
+        self.rate_limit = rate
+        self.tokens = self.capacity
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens for the time elapsed since the last update (lock must be held)."""
+        if self.rate:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take a token from the bucket and return the number of seconds to wait before sending.
+
+        The token is reserved immediately, the caller is responsible for sleeping (outside of the
+        bucket lock) for the returned number of seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            pause = max(0.0, self._paused_until - now)
+            if not self.rate:
+                return pause
+
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return pause
+            return max(pause, -self.tokens / self.rate)
+
+    def calibrate(self, remaining: int, reset: float, threshold: int = 0) -> None:
+        """Calibrate the bucket from the rate limit reported by the server.
+
+        Args:
+            remaining: The number of requests remaining in the current rate limit window.
+            reset: The number of seconds until the rate limit window resets.
+            threshold: The number of remaining requests to keep in reserve.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            reset = max(reset, 0.001)
+            available = remaining - threshold
+
+            if available <= 0:
+                # nothing left in this window, the next token is available after the reset
+                self.rate = 1 / reset
+                self.tokens = min(self.tokens, 0)
+                return
+
+            rate = available / reset
+            self.rate = min(rate, self.rate_limit) if self.rate_limit else rate
+            # the server is the authority on how many requests can be sent in this window
+            self.tokens = min(self.tokens, available)
+
+    def pause(self, seconds: float) -> None:
+        """Pause the bucket (e.g., for the Retry-After value of a 429 response).
+
+        Args:
+            seconds: The number of seconds to pause.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class TokenBucketRateLimitHandler(RateLimitHandler):
+    """Proactive, thread-safe rate-limiting using token buckets.
+
+    Buckets are selected per request using the routes added with add_bucket (the route with the
+    longest matching path prefix wins).  Requests that do not match a route use a bucket named
+    after the host of the request, created on first use with the default rate and capacity.
+
+    Usage:
+        rate_limit_handler = TokenBucketRateLimitHandler(rate=10)
+        rate_limit_handler.add_bucket('search', rate=2, host='api.example.com', path='/v1/search')
+        session.rate_limit_handler = rate_limit_handler
+
+    Args:
+        rate: The default requests per second for a bucket (None for unlimited until calibrated).
+        capacity: The default max burst for a bucket.
+        limit_remaining_header: Name of the header that has the limit remaining value.
+        limit_reset_header: Name of the header that contains the limit reset value.
+        remaining_threshold: Number of remaining requests to keep in reserve.
+    """
+
+    # reset values larger than this number of seconds are epoch timestamps
+    epoch_threshold = 1e9
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        capacity: Optional[float] = None,
+        limit_remaining_header: Optional[str] = 'X-RateLimit-Remaining',
+        limit_reset_header: Optional[str] = 'X-RateLimit-Reset',
+        remaining_threshold: Optional[int] = 0,
+    ):
+        """Initialize Class properties."""
+        super().__init__(limit_remaining_header, limit_reset_header, remaining_threshold)
+        self.capacity = capacity
+        self.rate = rate
+
+        # properties
+        self._lock = threading.Lock()
+        self._routes: List[Tuple[Optional[str], str, str]] = []  # (host, path, bucket name)
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.utils = Utils()
+
+    def _reset_seconds(self, value: str) -> float:
+        """Return the number of seconds until the rate limit resets.
+
+        The reset value can be delta seconds, an epoch timestamp, or an HTTP date. Numbers up to
+        1e9 (about 31 years) are delta seconds, larger numbers are epoch timestamps.
+        """
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            # not a number, parse the HTTP date
+            try:
+                seconds = self.utils.any_to_datetime(value).timestamp() - time.time()
+            except RuntimeError:
+                seconds = 0.0
+        else:
+            if seconds > self.epoch_threshold:
+                seconds -= time.time()
+        return max(seconds, 0.0)
+
+    def add_bucket(
+        self,
+        name: str,
+        rate: Optional[float] = None,
+        capacity: Optional[float] = None,
+        host: Optional[str] = None,
+        path: Optional[str] = '/',
+    ) -> TokenBucket:
+        """Add a named bucket and route the requests for the host and/or path prefix to it.
+
+        Multiple routes can share a bucket by using the same name.
+
+        Args:
+            name: The name of the bucket.
+            rate: The requests per second for the bucket.
+            capacity: The max burst for the bucket.
+            host: The host of the requests for the bucket (None for any host).
+            path: The path prefix of the requests for the bucket.
+        """
+        with self._lock:
+            if name not in self.buckets:
+                self.buckets[name] = TokenBucket(rate, capacity)
+            # longest path prefix first, host specific routes before any host routes (a new list
+            # is assigned so that concurrent lookups never see a partially sorted list)
+            self._routes = sorted(
+                self._routes + [(host, path or '/', name)],
+                key=lambda r: (len(r[1]), r[0] is not None),
+                reverse=True,
+            )
+            return self.buckets[name]
+
+    def bucket(self, request: PreparedRequest) -> TokenBucket:
+        """Return the bucket for the request.
+
+        Args:
+            request: The request to be sent.
+        """
+        parts = urlsplit(request.url or '')
+        path = parts.path or '/'
+        for host, prefix, name in self._routes:
+            if (host is None or host == parts.hostname) and path.startswith(prefix):
+                return self.buckets[name]
+
+        name = parts.hostname or ''
+        bucket = self.buckets.get(name)
+        if bucket is None:
+            with self._lock:
+                bucket = self.buckets.setdefault(name, TokenBucket(self.rate, self.capacity))
+        return bucket
+
+    def post_send(self, response: Response) -> None:
+        """Calibrate the bucket of the request from the rate-limit headers of the response.
+
+        Args:
+            response: The response from the request.  Should almost-never be modified.
+        """
+        if response.request is None:
+            return
+
+        bucket = self.bucket(response.request)
+        if response.status_code == 429 and 'Retry-After' in response.headers:
+            bucket.pause(self._reset_seconds(response.headers.get('Retry-After')))
+
+        if (
+            response.ok
+            and self.limit_remaining_header in response.headers
+            and self.limit_reset_header in response.headers
+        ):
+            remaining = int(response.headers.get(self.limit_remaining_header, 0))
+            reset = response.headers.get(self.limit_reset_header)
+            with self._last_limit_lock:
+                self._last_limit_remaining_value = remaining
+                self._last_limit_reset_value = reset
+            bucket.calibrate(remaining, self._reset_seconds(reset), self.remaining_threshold)
+
+    def pre_send(self, request: PreparedRequest) -> None:
+        """Wait for a token from the bucket of the request.
+
+        Args:
+            request: The request to be sent.  Should not be modified in any way.
+        """
+        seconds = self.bucket(request).acquire()
+        if seconds > 0:
+            time.sleep(seconds)
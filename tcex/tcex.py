@@ -31,8 +31,10 @@ from tcex.pleb.scoped_property import scoped_property
 from tcex.services.api_service import ApiService
 from tcex.services.common_service_trigger import CommonServiceTrigger
 from tcex.services.webhook_trigger_service import WebhookTriggerService
+from tcex.sessions.async_tc_session import AsyncTcSession
 from tcex.sessions.auth.tc_auth import TcAuth
 from tcex.sessions.external_session import ExternalSession
+from tcex.sessions.response_cache import ResponseCache
 from tcex.sessions.tc_session import TcSession
 from tcex.tokens import Tokens
 from tcex.utils import Utils
@@ -171,7 +173,10 @@ class TcEx:
         return ExitService(inputs)
 
     def get_playbook(
-        self, context: Optional[str] = None, output_variables: Optional[list] = None
+        self,
+        context: Optional[str] = None,
+        output_variables: Optional[list] = None,
+        binary_raw: Optional[bool] = False,
     ) -> Playbook:
         """Return a new instance of playbook module.
 
@@ -180,8 +185,9 @@ class TcEx:
                 startup, but for service Apps each request gets a different context.
             output_variables: The requested output variables. For PB Apps outputs are provided on
                 startup, but for service Apps each request gets different outputs.
+            binary_raw: If True, write Binary and BinaryArray variables as raw bytes (Redis only).
         """
-        return Playbook(self.key_value_store, context, output_variables)
+        return Playbook(self.key_value_store, context, output_variables, binary_raw)
 
     @staticmethod
     def get_redis_client(
@@ -231,6 +237,12 @@ class TcEx:
             tc_token=self.token,
         )
 
+        # optionally persist the cached API metadata responses across App executions
+        if self.inputs.model_unresolved.tc_session_cache_persist:
+            ResponseCache().path = os.path.join(
+                self.inputs.model_unresolved.tc_temp_path, 'response-cache'
+            )
+
         return TcSession(
             auth=auth,
             base_url=base_url or self.inputs.model_unresolved.tc_api_path,
@@ -239,11 +251,55 @@ class TcEx:
             proxies_enabled=proxies_enabled or self.inputs.model_unresolved.tc_proxy_tc,
             user_agent=self._user_agent,
             verify=verify or self.inputs.model_unresolved.tc_verify,
+            circuit_breaker=self.inputs.model_unresolved.tc_session_circuit_breaker,
+            http2=self.inputs.model_unresolved.tc_session_http2,
+            pool_block=self.inputs.model_unresolved.tc_session_pool_block,
+            pool_connections=self.inputs.model_unresolved.tc_session_pool_connections,
+            pool_keep_alive=self.inputs.model_unresolved.tc_session_pool_keep_alive,
+            pool_maxsize=self.inputs.model_unresolved.tc_session_pool_maxsize,
+        )
+
+    def get_session_tc_async(
+        self,
+        auth: Optional[Union['HmacAuth', 'TokenAuth', 'TcAuth']] = None,
+        base_url: Optional[str] = None,
+        log_curl: Optional[bool] = False,
+        proxies: Optional[Dict[str, str]] = None,  # pylint: disable=redefined-outer-name
+        proxies_enabled: Optional[bool] = False,
+        verify: Optional[Union[bool, str]] = True,
+    ) -> AsyncTcSession:
+        """Return an instance of asyncio Session configured for the ThreatConnect API.
+
+        The session has the same auth, retry, and logging behavior as the TC Session, but
+        requests are sent concurrently from a single event loop (requires aiohttp).
+        """
+        auth = auth or TcAuth(
+            tc_api_access_id=self.inputs.model_unresolved.tc_api_access_id,
+            tc_api_secret_key=self.inputs.model_unresolved.tc_api_secret_key,
+            tc_token=self.token,
+        )
+
+        return AsyncTcSession(
+            auth=auth,
+            base_url=base_url or self.inputs.model_unresolved.tc_api_path,
+            log_curl=log_curl or self.inputs.model_unresolved.tc_log_curl,
+            proxies=proxies or self.proxies,
+            proxies_enabled=proxies_enabled or self.inputs.model_unresolved.tc_proxy_tc,
+            user_agent=self._user_agent,
+            verify=verify or self.inputs.model_unresolved.tc_verify,
+            pool_maxsize=self.inputs.model_unresolved.tc_session_pool_maxsize,
         )
 
     def get_session_external(self) -> ExternalSession:
         """Return an instance of Requests Session configured for the ThreatConnect API."""
-        _session_external = ExternalSession(logger=self.log)
+        _session_external = ExternalSession(
+            circuit_breaker=self.inputs.model_unresolved.tc_session_circuit_breaker,
+            logger=self.log,
+            pool_block=self.inputs.model_unresolved.tc_session_pool_block,
+            pool_connections=self.inputs.model_unresolved.tc_session_pool_connections,
+            pool_keep_alive=self.inputs.model_unresolved.tc_session_pool_keep_alive,
+            pool_maxsize=self.inputs.model_unresolved.tc_session_pool_maxsize,
+        )
 
         # add User-Agent to headers
         _session_external.headers.update(self._user_agent)
@@ -274,7 +330,9 @@ class TcEx:
         while the Redis kvstore wraps a few other Redis methods.
         """
         if self.inputs.model_unresolved.tc_kvstore_type == 'Redis':
-            return KeyValueRedis(self.redis_client)
+            return KeyValueRedis(
+                self.redis_client, chunk_size=self.inputs.model_unresolved.tc_kvstore_chunk_size
+            )
 
         if self.inputs.model_unresolved.tc_kvstore_type == 'TCKeyValueAPI':
             return KeyValueApi(self.session_tc)
@@ -345,6 +403,7 @@ class TcEx:
         return self.get_playbook(
             context=self.inputs.model_unresolved.tc_playbook_kvstore_context,
             output_variables=self.inputs.model_unresolved.tc_playbook_out_variables,
+            binary_raw=self.inputs.model_unresolved.tc_playbook_binary_raw,
         )
 
     @cached_property
@@ -1,10 +1,12 @@
 """TcEx Framework Service module"""
 # standard library
+import heapq
+import itertools
 import logging
 import os
 import threading
 import time
-from typing import Optional
+from typing import List, Optional
 
 # third-party
 from requests import Session, exceptions
@@ -62,34 +64,124 @@ class Tokens:
             raise ValueError('A value for token_url is required.')
 
         # properties
-        #
-        # Threading event that is used as a barrier that determines whether a token can be retrieved
-        # from this module or not (via the token property). The barrier only blocks access to the
-        # token property whenever token renewal is taking place in order to keep from returning
-        # stale tokens.
-        self.barrier = threading.Event()
-        # Setting barrier event to True disables barrier, which makes the token property
-        # accessible (default behavior)
-        self.barrier.set()
-
         self.log = logger
         self.monitor_thread = None
         # session with retry for token renewal
         self.session: Session = retry_session()
         self.session.proxies = proxies  # add proxies to session
+        # max amount of time the renewal monitor waits before checking the schedule/shutdown flag
         self.sleep_interval = int(os.getenv('TC_TOKEN_SLEEP_INTERVAL', '150'))
         self.shutdown = False  # shutdown boolean
-        # token map for storing keys -> tokens -> threads
+        # token map for storing keys -> token data. The token data dict is never updated in place,
+        # a new dict is assigned on every change so that readers get a consistent snapshot of the
+        # token and expiration without locking.
         self.token_map = {}
-        # amount of time to wait before starting renewal process (after enabling barrier)
+        # amount of time to wait before starting renewal process (after fencing the key)
         # buffer allows any other threads using a token to possibly finish their work
         self.token_renewal_buffer_time = 5
         self.token_window = 600  # seconds to pad before token renewal
         self.utils = Utils
 
+        # Renewal schedule. The heap contains the expiration of every registered token, entries
+        # that no longer match the token map (e.g., renewed or unregistered tokens) are discarded
+        # when they reach the top of the heap.
+        self._deadlines = []  # heap of (token_expires, sequence, key)
+        self._sequence = itertools.count()  # tie breaker for keys of different types
+        self._schedule = threading.Condition()  # wakes the monitor when the schedule changes
+        # Threading events used as per key barriers. An event only exists for a key while the
+        # token for the key is being renewed, which keeps the token property from returning a
+        # stale token for that key without blocking access to the tokens for any other key.
+        self._fences = {}
+
         # start token renewal process
         self.token_renewal()
 
+    def _schedule_renewal(self, key: str, expires: int) -> None:
+        """Add the token expiration to the renewal schedule and wake the renewal monitor.
+
+        Args:
+            key: The key used to identify a token.
+            expires: The token expiration timestamp.
+        """
+        with self._schedule:
+            if len(self._deadlines) > 2 * len(self.token_map) + 100:
+                # rebuild the heap when it is mostly made up of discarded entries
+                self._deadlines = [
+                    (token_data.get('token_expires'), next(self._sequence), key_)
+                    for key_, token_data in list(self.token_map.items())
+                    if token_data.get('token_expires') is not None
+                ]
+                heapq.heapify(self._deadlines)
+            heapq.heappush(self._deadlines, (expires, next(self._sequence), key))
+            self._schedule.notify()
+
+    def _token_renew(self, key: str) -> None:
+        """Renew the token for the provided key, removing the token if renewal fails.
+
+        Args:
+            key: The key used to identify a token.
+        """
+        token_data = self.token_map.get(key)
+        if token_data is None:  # pragma: no cover
+            # token was unregistered while waiting for renewal
+            return
+
+        try:
+            api_token_data = self.renew_token(token_data.get('token'))
+            expires = int(api_token_data['apiTokenExpires'])
+            self.token_map[key] = {
+                'token': Sensitive(api_token_data['apiToken']),
+                'token_expires': expires,
+            }
+            self._schedule_renewal(key, expires)
+            self.log.info(
+                f'''feature=token, action=token-renewed, key={key}, '''
+                f'''token={api_token_data['apiToken']}, '''
+                f'''expires={api_token_data['apiTokenExpires']}'''
+            )
+        except RuntimeError as e:
+            self.log.error(e)
+            if self.token_map.pop(key, None) is not None:
+                self.log.error(f'feature=token, event=token-removal-failure, key={key}')
+
+    def _token_renewal_due(self) -> List[str]:
+        """Block until one or more tokens are due for renewal and return their keys."""
+        with self._schedule:
+            while not self.shutdown:
+                due = {}
+                now = time.time()
+                while self._deadlines:
+                    expires, _, key = self._deadlines[0]
+                    token_data = self.token_map.get(key)
+                    if token_data is None or token_data.get('token_expires') != expires:
+                        # discard entry for a renewed or unregistered token
+                        heapq.heappop(self._deadlines)
+                        continue
+
+                    # calculate the time left to sleep
+                    sleep_seconds = expires - now - self.token_window
+                    self.log.trace(
+                        '''feature=token, '''
+                        f'''event=token-status, key={key}, '''
+                        f'''token={token_data.get('token')}, '''
+                        f'''expires={expires}, '''
+                        f'''sleep-seconds={sleep_seconds}'''
+                    )
+                    if sleep_seconds > 0:
+                        break
+                    heapq.heappop(self._deadlines)
+                    due[key] = None
+
+                if due:
+                    return list(due)
+
+                # sleep until the next token is due for renewal or the schedule is updated
+                timeout = self.sleep_interval
+                if self._deadlines:
+                    timeout = min(timeout, self._deadlines[0][0] - now - self.token_window)
+                self._schedule.wait(timeout=max(timeout, 0))
+        return []
+
     @property
     def key(self) -> str:
         """Return the current key"""
@@ -116,6 +208,7 @@ class Tokens:
             return
 
         self.token_map[key] = {'token': Sensitive(token), 'token_expires': int(expires)}
+        self._schedule_renewal(key, int(expires))
         self.log.debug(
             f'feature=token, action=token-register, key={key}, '
             f'token={token}, expiration={expires}'
@@ -166,33 +259,41 @@ class Tokens:
 
     @property
     def token(self) -> Optional[Sensitive]:
-        """Return token for current thread."""
-        # wait until renewal barrier is set to True (meaning no renewal is in progress). If already
-        # true, then simply proceed.
+        """Return token for current thread.
+
+        The token is read from a snapshot of the token map without locking. Access is only
+        blocked while the token for the current key is being renewed.
+        """
+        if self.monitor_thread.exception is not None:
+            # tokens are no longer being renewed
+            raise RuntimeError(
+                'Token renewal monitor exited unexpectedly.'
+            ) from self.monitor_thread.exception
+
+        key = self.key
 
         # perform three attempts - safety net in case of heavily overloaded monitor. If we cannot
         # retrieve a token after three attempts, there must be an issue
         for i in range(3):
-            if self.barrier.wait(timeout=self.token_renewal_buffer_time + 10):
-                return self.token_map.get(self.key, {}).get('token')
+            fence = self._fences.get(key)
+            if fence is None or fence.wait(timeout=self.token_renewal_buffer_time + 10):
+                return self.token_map.get(key, {}).get('token')
 
             self.log.debug(
-                'Timeout expired while waiting for token renewal barrier to be disabled. '
-                f'Attempts: {i + 1}'
+                'Timeout expired while waiting for token renewal to complete. '
+                f'Key: {key}, Attempts: {i + 1}'
             )
 
             if not self.monitor_thread.is_alive():
                 break
 
         self.log.error(
-            'Could not retrieve TC token. Token renewal monitor did not disable token barrier. '
+            'Could not retrieve TC token. Token renewal monitor did not complete renewal. '
             f'Token renewal monitor thread alive: {self.monitor_thread.is_alive()}'
         )
 
         # timeout expired, monitor likely offline
-        exc = RuntimeError(
-            'Timeout expired while waiting for renewal thread to disable token barrier.'
-        )
+        exc = RuntimeError('Timeout expired while waiting for renewal thread to renew token.')
         if self.monitor_thread.exception is not None:
             raise exc from self.monitor_thread.exception
 
@@ -201,7 +302,8 @@ class Tokens:
     @token.setter
     def token(self, token: Sensitive) -> None:
         """Set token for current thread."""
-        self.token_map.setdefault(self.key, {})['token'] = Sensitive(token)
+        key = self.key
+        self.token_map[key] = {**self.token_map.get(key, {}), 'token': Sensitive(token)}
 
     @property
     def token_expires(self) -> Optional[int]:
@@ -211,7 +313,9 @@ class Tokens:
     @token_expires.setter
     def token_expires(self, expires) -> None:
         """Set token expires for current thread."""
-        self.token_map.setdefault(self.key, {})['token_expires'] = int(expires)
+        key = self.key
+        self.token_map[key] = {**self.token_map.get(key, {}), 'token_expires': int(expires)}
+        self._schedule_renewal(key, int(expires))
 
     def token_renewal(self) -> None:
         """Start token renewal monitor thread."""
@@ -221,53 +325,35 @@ class Tokens:
         self.monitor_thread.start()
 
     def token_renewal_monitor(self) -> None:
-        """Monitor token expiration and renew when required."""
-        self.log.debug('feature=token, event=renewal-monitor-started')
-        while True:
-            # Clear renewal barrier (setting it to False), which blocks access to token via
-            # the token property.
-            self.barrier.clear()
-            self.log.debug('Token renewal barrier enabled.')
-            time.sleep(self.token_renewal_buffer_time)
-            for key, token_data in dict(self.token_map).items():
-                # calculate the time left to sleep
-                sleep_seconds = (
-                    token_data.get('token_expires') - int(time.time()) - self.token_window
-                )
-                self.log.trace(
-                    '''feature=token, '''
-                    f'''event=token-status, key={key}, '''
-                    f'''token={token_data.get('token')}, '''
-                    f'''expires={token_data.get('token_expires')}, '''
-                    f'''sleep-seconds={sleep_seconds}'''
-                )
+        """Monitor token expiration and renew when required.
 
-                if sleep_seconds > 0:
-                    continue
-
-                # renew token data
-                try:
-                    api_token_data = self.renew_token(token_data.get('token'))
-                    self.token_map[key]['token'] = Sensitive(api_token_data['apiToken'])
-                    self.token_map[key]['token_expires'] = int(api_token_data['apiTokenExpires'])
-                    self.log.info(
-                        f'''feature=token, action=token-renewed, key={key}, '''
-                        f'''token={api_token_data['apiToken']}, '''
-                        f'''expires={api_token_data['apiTokenExpires']}'''
-                    )
-                except RuntimeError as e:
-                    self.log.error(e)
+        The monitor sleeps until the next token is due for renewal (as scheduled by expiration).
+        Only the keys being renewed are fenced, all other tokens remain accessible.
+        """
+        self.log.debug('feature=token, event=renewal-monitor-started')
+        while not self.shutdown:
+            keys = self._token_renewal_due()
+            if not keys:
+                continue
+
+            # block access to the tokens being renewed via the token property
+            fences = {key: threading.Event() for key in keys}
+            self._fences.update(fences)
+            self.log.debug(f'feature=token, event=renewal-fence-enabled, keys={keys}')
+            try:
+                time.sleep(self.token_renewal_buffer_time)
+                for key, fence in fences.items():
                     try:
-                        del self.token_map[key]
-                        self.log.error(f'feature=token, event=token-removal-failure, key={key}')
-                    except KeyError:  # pragma: no cover
-                        pass
-            # renewal loop is finished, grant access to token via token property once again
-            self.barrier.set()
-            self.log.debug('Token renewal barrier disabled.')
-            time.sleep(self.sleep_interval)
-            if self.shutdown:
-                break
+                        self._token_renew(key)
+                    finally:
+                        # renewal is finished, grant access to token via token property once again
+                        self._fences.pop(key, None)
+                        fence.set()
+            finally:
+                for key, fence in fences.items():
+                    self._fences.pop(key, None)
+                    fence.set()
+            self.log.debug(f'feature=token, event=renewal-fence-disabled, keys={keys}')
 
     @property
     def trigger_id(self) -> Optional[int]:
@@ -285,8 +371,5 @@ class Tokens:
         Args:
             key: The key used to identify a token.
         """
-        try:
-            del self.token_map[key]
+        if self.token_map.pop(key, None) is not None:
             self.log.debug(f'feature=token, action=token-unregister, key={key}')
-        except KeyError:
-            pass
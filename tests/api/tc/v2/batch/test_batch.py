@@ -4,6 +4,9 @@ import os
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
+# first-party
+from tcex.api.tc.v2.batch import Batch, BatchWriter
+
 if TYPE_CHECKING:
     # first-party
     from tcex import TcEx
@@ -124,3 +127,137 @@ class TestBatch:
             'b40930bbcf80744c86c46a12bc9da056641d722716c378f5659b9e555ef833e1'
         )
         assert batch._indicator_values(indicator_data) == indicator_data.split(' : ')
+
+    @staticmethod
+    def test_batch_submit_all_in_flight(request, tcex: 'TcEx'):
+        """Test pipelined batch submission with multiple batch jobs in flight"""
+        batch = tcex.v2.batch(owner=os.getenv('TC_OWNER'))
+        batch.max_in_flight = 3
+
+        # reduce max chunk size to ensure multiple batch jobs are submitted
+        batch._batch_max_chunk = 2
+
+        for i in range(6):
+            batch.address(
+                ip=f'1.1.1.{i}',
+                xid=batch.generate_xid(['pytest', 'address', request.node.name, str(i)]),
+            )
+
+        batch_status = batch.submit_all()
+        assert len(batch_status) == 3
+        for status in batch_status:
+            assert status.get('status') == 'Completed'
+            assert status.get('successCount') == 2
+
+    @staticmethod
+    def test_batch_group_file_stream(request, tcex: 'TcEx'):
+        """Test batch report creation with streamed file content"""
+        batch = tcex.v2.batch(owner=os.getenv('TC_OWNER'))
+        batch.file_max_workers = 2
+
+        def file_content(xid):
+            """Return dummy file content as a generator."""
+            yield f'file content for {request.node.name}, '.encode()
+            yield f'xid {xid}'.encode()
+
+        for i in range(3):
+            batch.report(
+                file_content=file_content,
+                file_name=f'{request.node.name}-{i}.txt',
+                name=f'{request.node.name}-{i}',
+                xid=batch.generate_xid(['pytest', 'report', request.node.name, str(i)]),
+            )
+
+        batch_status = batch.submit_all()
+        assert batch_status[0].get('status') == 'Completed'
+        batch.close()
+
+    @staticmethod
+    def test_batch_add_indicators_bulk(tcex: 'TcEx'):
+        """Test adding indicators in bulk with deduplication"""
+        batch = tcex.v2.batch(owner=os.getenv('TC_OWNER'))
+        batch.address(ip='1.1.1.1', xid=batch.generate_xid(['Address', '1.1.1.1']))
+
+        rows = [
+            ['1.1.1.1', '5', '50'],
+            ['2.2.2.2', '4', '40'],
+            ['2.2.2.2', '4', '40'],
+            [],
+            ['3.3.3.3', '', ''],
+            ['4.4.4.4', 'high', '40'],  # invalid rating, logged and skipped
+            ['6.6.6.6', '3', '40000'],  # out of range confidence, logged and skipped
+        ]
+        added = batch.add_indicators_bulk(
+            rows, indicator_type='Address', fields=['summary', 'rating', 'confidence']
+        )
+        assert added == 2
+        assert batch.indicator_len == 3
+
+        # singular and plural fields are merged
+        row = {
+            'summary': '5.5.5.5',
+            'attribute': {'type': 'Description', 'value': 'pytest'},
+            'attributes': [{'type': 'Source', 'value': 'pytest'}],
+            'tag': 'one',
+            'tags': ['two'],
+        }
+        assert batch.add_indicators_bulk([row], indicator_type='Address') == 1
+        assert 'tag' in row  # the provided dict is not updated
+
+        chunk = batch.data_chunk
+        assert chunk.indicator_count == 4
+        indicator = [i for i in chunk.data.get('indicator') if i.get('summary') == '5.5.5.5'][0]
+        assert [a.get('type') for a in indicator.get('attribute')] == ['Description', 'Source']
+        assert [t.get('name') for t in indicator.get('tag')] == ['one', 'two']
+
+    @staticmethod
+    def test_batch_data_chunk_max_size(tcex: 'TcEx'):
+        """Test entities that don't fit are carried over to the next chunk"""
+        batch = tcex.v2.batch(owner=os.getenv('TC_OWNER'))
+        batch._batch_max_size = 400
+        batch.report(name='pytest-report', file_name='pytest.txt', file_content=b'x', xid='r1')
+        for i in range(20):
+            batch.address(ip=f'1.1.1.{i}', xid=f'i{i}')
+        batch.add_indicators_bulk([f'2.2.2.{i}' for i in range(10)], indicator_type='Address')
+
+        chunks = []
+        while True:
+            chunk = batch.data_chunk
+            if not chunk:
+                break
+            assert chunk.size <= 400
+            chunks.append(chunk)
+
+        assert len(chunks) > 1
+        assert sum(c.group_count for c in chunks) == 1
+        assert sum(c.indicator_count for c in chunks) == 30
+        assert chunks[0].file.get('r1', {}).get('fileName') == 'pytest.txt'
+        assert len(batch) == 0
+
+    @staticmethod
+    def test_batch_generate_xids():
+        """Test batched xid generation matches generate_xid"""
+        identifiers = [['pytest', 'address', f'1.1.1.{i}'] for i in range(10)] + ['pytest-xid']
+        xids = BatchWriter.generate_xids(identifiers)
+        assert xids == [BatchWriter.generate_xid(i) for i in identifiers]
+
+        # xid values must be stable across releases
+        assert BatchWriter.generate_xid(['pytest', 'address', '1.1.1.1']) == (
+            'e8cb1e52faaa7e7117fe50cd194b6ed72b9b14aada17916f91926e49dc7f9e26'
+        )
+
+    @staticmethod
+    def test_batch_file_body(tmp_path):
+        """Test Path file content is read from the file and str file content is literal"""
+        fqfn = tmp_path / 'report.txt'
+        fqfn.write_bytes(b'file content')
+
+        body = Batch._file_body(fqfn)
+        try:
+            assert body.read() == b'file content'
+        finally:
+            body.close()
+
+        # a str is always the file content, even if it names an existing file
+        assert Batch._file_body('file content') == b'file content'
+        assert Batch._file_body(str(fqfn)) == str(fqfn).encode()
@@ -0,0 +1,86 @@
+"""Test the TcEx Batch Chunk Module."""
+# standard library
+import gzip
+import json
+
+# first-party
+from tcex.api.tc.v2.batch.batch_chunk import BatchChunk
+
+
+class TestBatchChunk:
+    """Test the TcEx Batch Chunk Module."""
+
+    @staticmethod
+    def test_batch_chunk_content():
+        """Test serialized content and exact size tracking."""
+        chunk = BatchChunk()
+        assert not chunk
+        assert json.loads(chunk.content) == {'group': [], 'indicator': []}
+        assert chunk.size == len(chunk.content)
+
+        chunk.add_group({'name': 'pytest-group', 'type': 'Adversary', 'xid': 'g1'})
+        chunk.add_indicator({'summary': '1.1.1.1', 'type': 'Address', 'xid': 'i1'})
+        chunk.add_indicator({'summary': 'ünïcode.com', 'type': 'Host', 'xid': 'i2'})
+
+        content = chunk.content
+        assert chunk.size == len(content)
+        assert chunk.count == len(chunk) == 3
+        assert chunk.group_count == 1
+        assert chunk.indicator_count == 2
+        assert json.loads(content) == {
+            'group': [{'name': 'pytest-group', 'type': 'Adversary', 'xid': 'g1'}],
+            'indicator': [
+                {'summary': '1.1.1.1', 'type': 'Address', 'xid': 'i1'},
+                {'summary': 'ünïcode.com', 'type': 'Host', 'xid': 'i2'},
+            ],
+        }
+
+    @staticmethod
+    def test_batch_chunk_compressed():
+        """Test the compressed content is cached until the chunk is updated."""
+        chunk = BatchChunk()
+        chunk.add_indicator({'summary': '1.1.1.1', 'type': 'Address', 'xid': 'i1'})
+
+        compressed = chunk.compressed()
+        assert gzip.decompress(compressed) == chunk.content
+        assert chunk.compressed() is compressed
+        assert BatchChunk.from_data(chunk.data).compressed() == compressed
+
+        chunk.add_group({'name': 'pytest-group', 'type': 'Adversary', 'xid': 'g1'})
+        assert gzip.decompress(chunk.compressed(compresslevel=1)) == chunk.content
+
+    @staticmethod
+    def test_batch_chunk_from_data():
+        """Test building a chunk from a legacy dict."""
+        data = {
+            'file': {'g1': {'fileName': 'pytest.pdf'}},
+            'group': [{'name': 'pytest-group', 'type': 'Report', 'xid': 'g1'}],
+            'indicator': [],
+        }
+        chunk = BatchChunk.from_data(data)
+        assert chunk.file == data['file']
+        assert chunk.data == data
+
+    @staticmethod
+    def test_batch_chunk_is_full():
+        """Test the max count and max size limits."""
+        chunk = BatchChunk(max_count=2)
+        chunk.add_indicator({'xid': 'i1'})
+        assert not chunk.is_full
+        chunk.add_indicator({'xid': 'i2'})
+        assert chunk.is_full
+
+        chunk = BatchChunk(max_size=50)
+        assert chunk.add_indicator({'xid': 'i1'})
+        assert not chunk.is_full
+
+        # the size is checked before the entity is added
+        assert not chunk.add_indicator({'summary': 'x' * 50, 'xid': 'i2'})
+        assert chunk.is_full
+        assert chunk.indicator_count == 1
+        assert chunk.size <= 50
+        assert chunk.size == len(chunk.content)
+
+        # the first entity is always added (e.g., an entity larger than the max size)
+        chunk = BatchChunk(max_size=50)
+        assert chunk.add_indicator({'summary': 'x' * 50, 'xid': 'i2'})
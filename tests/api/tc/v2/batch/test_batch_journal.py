@@ -0,0 +1,42 @@
+"""Test the TcEx Batch Journal Module."""
+# standard library
+import os
+
+# first-party
+from tcex.api.tc.v2.batch.batch_journal import BatchJournal
+
+
+class TestBatchJournal:
+    """Test the TcEx Batch Journal Module."""
+
+    @staticmethod
+    def test_batch_journal_resume(tmp_path):
+        """Test replaying the chunk and file state of an existing journal."""
+        fqfn = os.path.join(tmp_path, 'batch-journal.jsonl')
+        settings = {'action': 'Create', 'owner': 'TCI'}
+        digest_1 = BatchJournal.digest(b'{"group":[],"indicator":[1]}', settings)
+        digest_2 = BatchJournal.digest(b'{"group":[],"indicator":[2]}', settings)
+        assert digest_1 != digest_2
+        assert digest_1 != BatchJournal.digest(b'{"group":[],"indicator":[1]}', {'owner': 'A'})
+
+        journal = BatchJournal(fqfn)
+        journal.submitted(digest_1, 1)
+        journal.completed(digest_1, 1, {'id': 1, 'status': 'Completed'})
+        journal.submitted(digest_2, 2)
+        journal.file('report-001')
+
+        # simulate the App being terminated while writing an entry
+        with open(fqfn, 'a', encoding='utf-8') as fh:
+            fh.write('{"batch_id": 3, "dig')
+
+        journal = BatchJournal(fqfn)
+        assert journal.chunk(digest_1).get('event') == 'completed'
+        assert journal.chunk(digest_1).get('batch_status') == {'id': 1, 'status': 'Completed'}
+        assert journal.chunk(digest_2) == {'batch_id': 2, 'digest': digest_2, 'event': 'submitted'}
+        assert journal.chunk('missing') is None
+        assert journal.file_uploaded('report-001') is True
+        assert journal.file_uploaded('report-002') is False
+
+        journal.remove()
+        assert not os.path.isfile(fqfn)
+        assert journal.chunk(digest_1) is None
@@ -0,0 +1,64 @@
+"""Test the TcEx Batch Poll Scheduler Module."""
+# first-party
+from tcex.api.tc.v2.batch.batch_poll_scheduler import BatchPollScheduler
+
+
+class TestBatchPollScheduler:
+    """Test the TcEx Batch Poll Scheduler Module."""
+
+    @staticmethod
+    def test_batch_poll_scheduler(monkeypatch):
+        """Test scheduling polls from the reported batch progress."""
+        now = [1_000.0]
+        monkeypatch.setattr('tcex.api.tc.v2.batch.batch_poll_scheduler.time.time', lambda: now[0])
+
+        scheduler = BatchPollScheduler()
+        assert scheduler is BatchPollScheduler()
+        monkeypatch.setattr(scheduler, 'overhead', 5.0)
+        monkeypatch.setattr(scheduler, 'rate', 300.0)
+
+        # initial interval: overhead + count / rate
+        scheduler.register(1, count=3_000)
+        assert scheduler.interval(1) == 15
+
+        # first progress, predicted completion from the learned rate
+        now[0] += 15
+        assert scheduler.update(1, {'successCount': 600, 'status': 'Running'}) == 8
+
+        # second progress provides a rate sample of 100 entities per second
+        now[0] += 8
+        interval = scheduler.update(1, {'successCount': 1_400, 'errorCount': 0})
+        assert scheduler.rate < 300
+        assert interval == 16
+
+        # the job is overdue, back off from the min interval
+        now[0] += 16
+        assert scheduler.update(1, {'successCount': 1_400}) == scheduler.min_interval
+
+        now[0] += 2
+        scheduler.complete(1, {'successCount': 3_000, 'status': 'Completed'})
+        # the job completed later than the processing rate predicts
+        assert scheduler.overhead > 5
+
+    @staticmethod
+    def test_batch_poll_scheduler_back_off(monkeypatch):
+        """Test the back off multiplier of overdue jobs and discarding jobs."""
+        now = [1_000.0]
+        monkeypatch.setattr('tcex.api.tc.v2.batch.batch_poll_scheduler.time.time', lambda: now[0])
+
+        scheduler = BatchPollScheduler()
+        monkeypatch.setattr(scheduler, 'overhead', 5.0)
+        monkeypatch.setattr(scheduler, 'rate', 300.0)
+
+        scheduler.register(2, count=300)
+        assert scheduler.interval(2, back_off=3) == 6
+
+        # the job is overdue, back off from the min interval using the provided multiplier
+        now[0] += 6
+        assert scheduler.update(2, {'status': 'Running'}) == scheduler.min_interval
+        assert scheduler.update(2, {'status': 'Running'}) == scheduler.min_interval * 3
+
+        # discarded jobs don't update the learned rate and overhead
+        scheduler.discard(2)
+        assert 2 not in scheduler._jobs
+        assert scheduler.overhead == 5.0
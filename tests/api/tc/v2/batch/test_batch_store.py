@@ -0,0 +1,77 @@
+"""Test the TcEx Batch Store Module."""
+# standard library
+import glob
+import json
+import os
+
+# first-party
+from tcex.api.tc.v2.batch.batch_store import BatchStore
+from tcex.api.tc.v2.batch.group import Campaign, Report
+from tcex.api.tc.v2.batch.indicator import Address
+
+
+class TestBatchStore:
+    """Test the TcEx Batch Store Module."""
+
+    @staticmethod
+    def test_batch_store_entities(tmp_path):
+        """Test storing and rebuilding dict and object entities."""
+        store = BatchStore(os.path.join(tmp_path, 'groups'))
+
+        def file_content(xid):
+            """Return dummy file content."""
+            return f'file content for xid {xid}'
+
+        campaign = Campaign('pytest-campaign', first_seen='2021-01-01', xid='campaign-001')
+        campaign.tag('PyTest')
+        store['campaign-001'] = campaign
+        store['report-001'] = Report(
+            'pytest-report', file_name='pytest.pdf', file_content=file_content, xid='report-001'
+        )
+        store['address-001'] = Address('1.1.1.1', confidence=42, rating=5, xid='address-001')
+        store['dict-001'] = {'name': 'pytest-dict', 'type': 'Adversary', 'xid': 'dict-001'}
+
+        assert len(store) == 4
+        assert 'campaign-001' in store
+        assert store.get('missing') is None
+
+        ti = store.get('campaign-001')
+        assert isinstance(ti, Campaign)
+        assert ti.first_seen == '2021-01-01T00:00:00Z'
+        assert ti.data == campaign.data
+
+        ti = store['address-001']
+        assert isinstance(ti, Address)
+        assert ti.confidence == 42
+        assert ti.rating == 5.0
+
+        assert store['report-001'].file_data.get('fileContent') is file_content
+        assert store['dict-001'] == {'name': 'pytest-dict', 'type': 'Adversary', 'xid': 'dict-001'}
+
+        content, file_content_ = store.pop_content('report-001')
+        assert json.loads(content).get('fileName') == 'pytest.pdf'
+        assert file_content_ is file_content
+        assert 'report-001' not in store
+        store.remove()
+
+    @staticmethod
+    def test_batch_store_reclaim_and_replay(tmp_path):
+        """Test reclaiming consumed segment files and replaying an existing store."""
+        fqfn = os.path.join(tmp_path, 'indicators')
+        store = BatchStore(fqfn, segment_size=100)
+        for i in range(10):
+            store[f'address-{i}'] = {'summary': f'1.1.1.{i}', 'type': 'Address'}
+        segments = len(glob.glob(f'{fqfn}-*.seg'))
+        assert segments > 1
+
+        for i in range(8):
+            del store[f'address-{i}']
+        assert len(glob.glob(f'{fqfn}-*.seg')) < segments
+        store.close()
+
+        store = BatchStore(fqfn)
+        assert store.keys() == ['address-8', 'address-9']
+        assert store['address-9'] == {'summary': '1.1.1.9', 'type': 'Address'}
+
+        store.remove()
+        assert not glob.glob(f'{fqfn}-*.seg')
@@ -0,0 +1,75 @@
+"""Test the TcEx Batch Bulk Indicator Module."""
+# third-party
+import pytest
+
+# first-party
+from tcex.api.tc.v2.batch.bulk_indicator import BulkIndicators
+from tcex.api.tc.v2.batch.indicator import Address
+
+
+class TestBulkIndicators:
+    """Test the TcEx Batch Bulk Indicator Module."""
+
+    @staticmethod
+    def test_bulk_indicators_data():
+        """Test that bulk indicator data matches the Indicator object data."""
+        ti = Address(
+            '1.1.1.1',
+            confidence=42,
+            date_added='2021-01-01T00:00:00Z',
+            rating=5,
+            xid='address-001',
+        )
+        ti.attribute('Description', 'Example #1', displayed=True)
+        ti.security_label('PYTEST', 'Pytest Label Description', 'ffc0cb')
+        ti.tag('PyTest')
+
+        bulk = BulkIndicators()
+        assert bulk.add(
+            'Address',
+            '1.1.1.1',
+            xid='address-001',
+            rating=5,
+            confidence=42,
+            attributes=[{'type': 'Description', 'value': 'Example #1', 'displayed': True}],
+            labels=[
+                {'name': 'PYTEST', 'description': 'Pytest Label Description', 'color': 'ffc0cb'}
+            ],
+            tags=['PyTest', ''],
+            date_added='2021-01-01T00:00:00Z',
+        )
+        assert bulk.add('Host', 'pytest.com', xid='host-001')
+
+        # duplicate xid is not added
+        assert not bulk.add('Address', '1.1.1.1', xid='address-001')
+
+        # out of range confidence is rejected without updating the container
+        with pytest.raises(ValueError):
+            bulk.add('Address', '2.2.2.2', xid='address-002', confidence=40_000)
+
+        assert len(bulk) == 2
+        assert 'address-001' in bulk
+        assert bulk.keys() == ['address-001', 'host-001']
+        assert bulk.get('address-001') == ti.data
+        assert bulk.get('host-001') == {'summary': 'pytest.com', 'type': 'Host', 'xid': 'host-001'}
+
+        assert bulk.popleft() == ti.data
+        assert 'address-001' not in bulk
+        assert bulk.pop('host-001').get('summary') == 'pytest.com'
+        assert not bulk
+
+    @staticmethod
+    def test_bulk_indicators_popleft():
+        """Test consuming indicators in order with compaction of the columns."""
+        bulk = BulkIndicators()
+        for i in range(1_000):
+            bulk.add('Address', f'1.1.{i // 256}.{i % 256}', xid=f'address-{i}', rating=i % 5)
+
+        for i in range(900):
+            assert bulk.popleft().get('xid') == f'address-{i}'
+
+        # re-adding consumed xids is allowed
+        assert bulk.add('Address', '1.1.1.1', xid='address-0')
+        assert len(bulk) == 101
+        assert bulk.get('address-950').get('rating') == 0
+        assert [bulk.popleft().get('xid') for _ in range(101)][-1] == 'address-0'
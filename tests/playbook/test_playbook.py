@@ -190,6 +190,32 @@ class TestUtils:
         playbook.delete.variable(variable)
         assert playbook.read.variable(variable) is None
 
+    def test_playbook_create_batch(self, playbook_app: 'MockApp'):
+        """Test playbook variables are written in a single batch on exit of the context."""
+        tcex: 'TcEx' = playbook_app(
+            config_data={'tc_playbook_out_variables': self.tc_playbook_out_variables}
+        ).tcex
+        playbook: 'Playbook' = tcex.playbook
+
+        variables = {
+            '#App:0001:s1!String': '1',
+            '#App:0001:sa1!StringArray': ['a', 'b', 'c'],
+            '#App:0001:kv1!KeyValue': {'key': 'one', 'value': '1'},
+        }
+        with playbook.create.batch():
+            for variable, value in variables.items():
+                playbook.create.variable(variable, value)
+
+            # staged variables are not written until the batch is flushed
+            assert playbook.read.variable('#App:0001:s1!String') is None
+
+        for variable, value in variables.items():
+            result = playbook.read.variable(variable)
+            assert result == value, f'result of ({result}) does not match ({value})'
+
+            playbook.delete.variable(variable)
+            assert playbook.read.variable(variable) is None
+
     @pytest.mark.parametrize(
         'variable,value',
         [
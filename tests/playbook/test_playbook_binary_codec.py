@@ -0,0 +1,58 @@
+"""Tests for TcEx Playbook Binary Codec Module."""
+# standard library
+from typing import List, Optional
+
+# third-party
+import pytest
+
+# first-party
+from tcex.playbook.binary_codec import BinaryCodec
+
+
+# pylint: disable=no-self-use
+class TestBinaryCodec:
+    """Tests for TcEx Playbook Binary Codec Module."""
+
+    @pytest.mark.parametrize('value', [b'', b'binary data', b'\x00\xff' * 1_024])
+    def test_binary_codec_binary(self, value: bytes):
+        """Test raw Binary values."""
+        data = BinaryCodec.encode(value)
+        assert BinaryCodec.is_raw(data)
+        assert not BinaryCodec.is_raw_array(data)
+
+        result = BinaryCodec.decode(data)
+        assert isinstance(result, memoryview)
+        assert result.obj is data  # no copy of the stored data
+        assert result == value
+
+    @pytest.mark.parametrize(
+        'values',
+        [
+            [],
+            [b'one', b'two', b'three'],
+            [b'one', None, b''],
+            [memoryview(b'view'), bytearray(b'array')],
+        ],
+    )
+    def test_binary_codec_binary_array(self, values: List[Optional[bytes]]):
+        """Test raw BinaryArray values."""
+        data = BinaryCodec.encode_array(values)
+        assert BinaryCodec.is_raw_array(data)
+        assert not BinaryCodec.is_raw(data)
+
+        result = BinaryCodec.decode_array(data)
+        assert result == [None if v is None else memoryview(v) for v in values]
+
+    def test_binary_codec_truncated(self):
+        """Test a truncated BinaryArray value raises an error."""
+        data = BinaryCodec.encode_array([b'one', b'two'])
+        with pytest.raises(RuntimeError) as ex:
+            BinaryCodec.decode_array(data[:-1])
+
+        assert 'Invalid' in str(ex.value)
+
+    @pytest.mark.parametrize('data', [None, '"b2xk"', b'"b2xk"', b'["b25l", null]'])
+    def test_binary_codec_not_raw(self, data):
+        """Test base64 encoded JSON values are not raw values."""
+        assert not BinaryCodec.is_raw(data)
+        assert not BinaryCodec.is_raw_array(data)
@@ -0,0 +1,74 @@
+"""Tests for TcEx Playbook Output Variable Index Module."""
+# standard library
+from typing import Optional
+
+# third-party
+import pytest
+
+# first-party
+from tcex.playbook.output_variable_index import OutputVariableIndex
+from tcex.playbook.playbook_create import PlaybookCreate
+
+
+# pylint: disable=no-self-use
+class TestOutputVariableIndex:
+    """Tests for TcEx Playbook Output Variable Index Module."""
+
+    output_variables = [
+        '#App:0001:b1!Binary',
+        '#App:0001:dup.name!String',
+        '#App:0001:dup.name!StringArray',
+        '#App:0001:kv1!KeyValue',
+    ]
+
+    @pytest.mark.parametrize(
+        'key,variable_type,expected',
+        [
+            ('b1', None, '#App:0001:b1!Binary'),
+            ('dup.name', None, '#App:0001:dup.name!String'),
+            ('dup.name', 'StringArray', '#App:0001:dup.name!StringArray'),
+            ('kv1', 'String', None),
+            ('unknown', None, None),
+        ],
+    )
+    def test_output_variable_index_get(
+        self, key: str, variable_type: Optional[str], expected: Optional[str]
+    ):
+        """Test lookup of the variable for a key."""
+        index = OutputVariableIndex(self.output_variables)
+        assert index.get(key, variable_type) == expected
+
+    def test_output_variable_index_requested(self):
+        """Test requested variables and keys."""
+        output_variables = list(self.output_variables)
+        index = OutputVariableIndex(output_variables)
+        assert '#App:0001:kv1!KeyValue' in index
+        assert '#App:0001:kv1!String' not in index
+        assert index.has_key('kv1')
+        assert not index.has_key('s1')
+
+        # the index is a snapshot of the output variables
+        output_variables.append('#App:0001:s1!String')
+        assert not index.has_key('s1')
+
+    def test_output_variable_index_assignment(self):
+        """Test the index is rebuilt when the output variables are assigned."""
+        create = PlaybookCreate('context', None, list(self.output_variables))
+        assert not create.is_requested('#App:0001:s1!String')
+
+        create.output_variables = ['#App:0001:s1!String']
+        assert create.is_requested('#App:0001:s1!String')
+        assert create.output_variable_index.get('s1') == '#App:0001:s1!String'
+        assert create.output_variable_index.get('kv1') is None
+
+    @pytest.mark.parametrize(
+        'variable,expected',
+        [
+            ('#App:0001:kv1!KeyValue', 'KeyValue'),
+            ('#App:0002:not.requested!TCEntity', 'TCEntity'),
+            ('not a variable', 'String'),
+        ],
+    )
+    def test_output_variable_index_variable_type(self, variable: str, expected: str):
+        """Test the type of a variable."""
+        assert OutputVariableIndex(self.output_variables).variable_type(variable) == expected
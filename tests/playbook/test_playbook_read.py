@@ -1,10 +1,14 @@
 """Test the TcEx Batch Module."""
 # standard library
+import json
 from typing import TYPE_CHECKING, Union
 
 # third-party
 import pytest
 
+# first-party
+from tcex.playbook.playbook_read import PlaybookRead
+
 if TYPE_CHECKING:
     # first-party
     from tcex import TcEx
@@ -86,3 +90,88 @@ class TestUtils:
     def test_playbook_read_decode_binary(self, data: bytes, expected: str, playbook: 'Playbook'):
         """Test playbook variables."""
         assert playbook.read._decode_binary(data) == expected
+
+    def test_playbook_read_prefetch(self, playbook_app: 'MockApp'):
+        """Test playbook variables (and embedded variables) are read from the prefetched data."""
+        tcex: 'TcEx' = playbook_app(
+            config_data={'tc_playbook_out_variables': self.tc_playbook_out_variables}
+        ).tcex
+        playbook: 'Playbook' = tcex.playbook
+
+        playbook.create.string('#App:0001:s1!String', 'one')
+        playbook.create.key_value_array(
+            '#App:0001:kva1!KeyValueArray',
+            [{'key': 'embedded', 'value': 'embedded #App:0001:s1!String'}],
+        )
+
+        with playbook.read.prefetch(['#App:0001:kva1!KeyValueArray', 'text']):
+            assert '#App:0001:kva1!KeyValueArray' in playbook.read._prefetched
+            # embedded variables in the prefetched data are prefetched (one level deep)
+            assert '#App:0001:s1!String' in playbook.read._prefetched
+
+            result = playbook.read.variable('#App:0001:kva1!KeyValueArray')
+            assert result == [{'key': 'embedded', 'value': 'embedded one'}]
+        assert playbook.read._prefetched is None
+
+        for variable in ['#App:0001:kva1!KeyValueArray', '#App:0001:s1!String']:
+            playbook.delete.variable(variable)
+
+    @pytest.mark.parametrize(
+        'data,chunk_size',
+        [
+            ([], 1),
+            (['one', 'two', 'three'], 1),
+            ([1, -1.5e10, True, None, {'key': 'one', 'value': 'ünï'}], 1),
+            ([1, -1.5e10, True, None, {'key': 'one', 'value': 'ünï'}], 7),
+            ([{'id': '001', 'type': 'Address', 'value': '1.1.1.1'}] * 100, 1_024),
+        ],
+    )
+    def test_playbook_read_iter_json_array(self, data: list, chunk_size: int):
+        """Test the elements of a serialized array are parsed across chunk boundaries."""
+        serialized = json.dumps(data).encode()
+        chunks = []
+        while serialized:
+            chunks.append(serialized[:chunk_size])
+            serialized = serialized[chunk_size:]
+        assert list(PlaybookRead._iter_json_array(chunks)) == data
+
+    def test_playbook_read_iter_array_chunked(self, playbook: 'Playbook'):
+        """Test a chunked array variable is read incrementally."""
+        variable = '#App:0001:sa1!StringArray'
+        data = [f'value {i}' for i in range(1_000)]
+
+        playbook.key_value_store.chunk_size = 1_024
+        try:
+            playbook.create.string_array(variable, data, when_requested=False)
+            assert playbook.read.variable(variable) == data
+
+            chunks = list(playbook.key_value_store.read_chunks(playbook.context, variable))
+            assert len(chunks) > 1
+            assert list(playbook.read.iter_array(variable)) == data
+        finally:
+            playbook.key_value_store.chunk_size = None
+            playbook.delete.variable(variable)
+
+    def test_playbook_read_chunked_overwrite(self, playbook: 'Playbook'):
+        """Test overwriting a chunked value deletes the previous chunks."""
+        key_value_store = playbook.key_value_store
+        variable = '#App:0001:s1!String'
+        chunk_field = f'{variable}:chunk:2'.encode()
+
+        key_value_store.chunk_size = 4
+        try:
+            # the chunk size is in bytes (10 characters, 20 bytes)
+            key_value_store.create(playbook.context, variable, 'ü' * 10)
+            assert chunk_field in key_value_store._redis_client.hgetall(playbook.context)
+
+            key_value_store.create(playbook.context, variable, 'abcdefgh')
+            assert chunk_field not in key_value_store._redis_client.hgetall(playbook.context)
+            assert key_value_store.read(playbook.context, variable) == b'abcdefgh'
+
+            # hgetall joins the chunks
+            data = key_value_store.hgetall(playbook.context)
+            assert data.get(variable.encode()) == b'abcdefgh'
+            assert f'{variable}:chunk:0'.encode() not in data
+        finally:
+            key_value_store.chunk_size = None
+            playbook.delete.variable(variable)
@@ -0,0 +1,115 @@
+"""Test the TcEx Async TC Session Module."""
+# standard library
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# third-party
+import pytest
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+# first-party
+from tcex.input.field_types.sensitive import Sensitive
+from tcex.sessions.auth.hmac_auth import HmacAuth
+
+aiohttp = pytest.importorskip('aiohttp')
+
+# first-party
+from tcex.sessions.async_tc_session import AsyncTcSession  # noqa: E402
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 request handler that returns the queued status codes."""
+
+    protocol_version = 'HTTP/1.1'
+    requests = []
+    status_codes = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET requests."""
+        self.requests.append((self.path, self.headers.get('Authorization')))
+        status_code = self.status_codes.pop(0) if self.status_codes else 200
+        body = b'{"status": "Success"}'
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Suppress request logging."""
+
+
+class TestAsyncTcSession:
+    """Test the TcEx Async TC Session Module."""
+
+    @staticmethod
+    @pytest.fixture
+    def server_url():
+        """Return the URL of a local HTTP server."""
+        StatusHandler.requests = []
+        StatusHandler.status_codes = []
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StatusHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+        server.shutdown()
+        server.server_close()
+
+    @staticmethod
+    def test_async_tc_session_request(server_url):
+        """Test concurrent signed requests and the status code and 401 retries."""
+        # first request: 500 is retried with backoff, 401 is retried once
+        StatusHandler.status_codes = [500, 401]
+
+        async def _run():
+            auth = HmacAuth('123', Sensitive('secret'))
+            async with AsyncTcSession(auth, server_url, backoff_factor=0.01) as session:
+                responses = [await session.get('/v3/groups', params={'resultLimit': 1})]
+                responses.extend(
+                    await asyncio.gather(*[session.get(f'/v3/groups/{i}') for i in range(5)])
+                )
+            return responses
+
+        responses = asyncio.run(_run())
+        assert all(r.status_code == 200 for r in responses)
+        assert responses[0].json() == {'status': 'Success'}
+        assert responses[0].encoding == 'utf-8'
+        assert responses[0].request.path_url == '/v3/groups?resultLimit=1'
+
+        paths = [p for p, _ in StatusHandler.requests]
+        assert paths.count('/v3/groups?resultLimit=1') == 3
+        assert len(paths) == 8
+        assert all(a.startswith('TC 123:') for _, a in StatusHandler.requests)
+
+    @staticmethod
+    def test_async_tc_session_connection_error():
+        """Test connection errors are raised as requests exceptions after the retries."""
+
+        async def _run():
+            auth = HmacAuth('123', Sensitive('secret'))
+            async with AsyncTcSession(
+                auth, 'http://127.0.0.1:9', retries=1, backoff_factor=0.01
+            ) as session:
+                await session.get('/v3/groups')
+
+        with pytest.raises(RequestsConnectionError):
+            asyncio.run(_run())
+
+    @staticmethod
+    def test_async_tc_session_auth_thread(server_url):
+        """Test the (blocking) auth is not called on the event loop thread."""
+        auth_threads = []
+
+        def _auth(request):
+            auth_threads.append(threading.get_ident())
+            request.headers['Authorization'] = 'TC-Token pytest'
+            return request
+
+        async def _run():
+            async with AsyncTcSession(_auth, server_url) as session:
+                await session.get('/v3/groups')
+
+        asyncio.run(_run())
+        assert auth_threads and threading.get_ident() not in auth_threads
+        assert StatusHandler.requests == [('/v3/groups', 'TC-Token pytest')]
@@ -0,0 +1,81 @@
+"""Test the TcEx HMAC Auth Module."""
+# standard library
+import hmac
+import os
+import timeit
+from base64 import b64encode
+from hashlib import sha256
+
+# third-party
+import pytest
+from requests import Request
+
+# first-party
+from tcex.input.field_types.sensitive import Sensitive
+from tcex.sessions.auth.hmac_auth import HmacAuth
+
+
+def _hmac_header(secret_key: str, path_url: str, method: str, timestamp: int) -> str:
+    """Return the HMAC header value using a new HMAC object (the previous implementation)."""
+    signature = f'{path_url}:{method}:{timestamp}'
+    digest = hmac.new(secret_key.encode(), signature.encode(), digestmod=sha256).digest()
+    return f'TC 123:{b64encode(digest).decode()}'
+
+
+class TestHmacAuth:
+    """Test the TcEx HMAC Auth Module."""
+
+    @staticmethod
+    def test_hmac_auth_header():
+        """Test the header of the keyed HMAC copy and the signature cache."""
+        auth = HmacAuth('123', Sensitive('secret'))
+        r = Request('GET', 'https://tc.example.com/api/v3/groups', params={'resultStart': 0})
+        r = r.prepare()
+
+        expected = _hmac_header('secret', r.path_url, 'GET', 1_600_000_000)
+        assert auth._hmac_header(r, 1_600_000_000) == expected
+        assert auth._signature_cache[1]  # memoized for the current timestamp
+        assert auth._hmac_header(r, 1_600_000_000) == expected
+        assert auth._hmac_header(r, 1_600_000_001) == _hmac_header(
+            'secret', r.path_url, 'GET', 1_600_000_001
+        )
+
+        # changing the secret key resets the keyed HMAC and the signature cache
+        auth.tc_api_secret_key = Sensitive('other')
+        assert auth._hmac_header(r, 1_600_000_001) == _hmac_header(
+            'other', r.path_url, 'GET', 1_600_000_001
+        )
+
+    @staticmethod
+    @pytest.mark.skipif(not os.getenv('TCEX_BENCHMARK'), reason='set TCEX_BENCHMARK=1 to run')
+    def test_hmac_auth_benchmark():
+        """Benchmark the auth header generation (run with TCEX_BENCHMARK=1 and -s)."""
+        auth = HmacAuth('123', Sensitive('secret'))
+        prepared_requests = [
+            Request('GET', f'https://tc.example.com/api/v3/indicators?resultStart={i}').prepare()
+            for i in range(100)
+        ]
+        number = 200
+
+        def new_hmac():
+            for r in prepared_requests:
+                _hmac_header('secret', r.path_url, r.method, 1_600_000_000)
+
+        def keyed_hmac():
+            for i, r in enumerate(prepared_requests):
+                auth._hmac_header(r, i)  # a new timestamp for every request (no cache hits)
+
+        def memoized():
+            for r in prepared_requests:
+                auth._hmac_header(r, 1_600_000_000)
+
+        results = {
+            name: min(timeit.repeat(fn, number=number, repeat=3))
+            / (number * len(prepared_requests))
+            for name, fn in [('new', new_hmac), ('keyed', keyed_hmac), ('memoized', memoized)]
+        }
+        print('\nHMAC header generation (usec per request):')
+        for name, seconds in results.items():
+            print(f'  {name:<10}{seconds * 1_000_000:8.2f}')
+
+        assert results['memoized'] < results['new']
@@ -0,0 +1,175 @@
+"""Test the TcEx Session HTTP/2 Adapter Module."""
+# standard library
+import io
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# third-party
+import pytest
+from requests import Session
+from requests.exceptions import RetryError
+from urllib3.util.retry import Retry
+
+# first-party
+from tcex.input.field_types.sensitive import Sensitive
+from tcex.sessions.auth.hmac_auth import HmacAuth
+from tcex.sessions.tc_session import TcSession
+
+h2_config = pytest.importorskip('h2.config')
+h2_connection = pytest.importorskip('h2.connection')
+h2_events = pytest.importorskip('h2.events')
+pytest.importorskip('httpx')
+
+# first-party
+from tcex.sessions.http2_adapter import Http2Adapter  # noqa: E402
+
+
+class H2Server:
+    """Minimal HTTP/2 (h2c prior knowledge) server that echos the request path and headers."""
+
+    def __init__(self):
+        """Initialize Class properties."""
+        self.connections = 0
+        self.sock = socket.create_server(('127.0.0.1', 0))
+        self.url = f'http://127.0.0.1:{self.sock.getsockname()[1]}'
+        threading.Thread(target=self.accept, daemon=True).start()
+
+    def accept(self):
+        """Accept connections."""
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self.serve, args=(conn,), daemon=True).start()
+
+    @staticmethod
+    def serve(conn: socket.socket):
+        """Serve the streams of a connection."""
+        h2 = h2_connection.H2Connection(config=h2_config.H2Configuration(client_side=False))
+        h2.initiate_connection()
+        conn.sendall(h2.data_to_send())
+        headers = {}
+        while True:
+            data = conn.recv(65535)
+            if not data:
+                break
+            for event in h2.receive_data(data):
+                if isinstance(event, h2_events.RequestReceived):
+                    headers[event.stream_id] = {
+                        k.decode()
+                        if isinstance(k, bytes)
+                        else k: v.decode()
+                        if isinstance(v, bytes)
+                        else v
+                        for k, v in event.headers
+                    }
+                elif isinstance(event, h2_events.StreamEnded):
+                    request_headers = headers.pop(event.stream_id)
+                    body = json.dumps(
+                        {
+                            'authorization': request_headers.get('authorization'),
+                            'path': request_headers.get(':path'),
+                            'stream_id': event.stream_id,
+                        }
+                    ).encode()
+                    status = '500' if request_headers.get(':path') == '/error' else '200'
+                    h2.send_headers(
+                        event.stream_id,
+                        [
+                            (':status', status),
+                            ('content-type', 'application/json'),
+                            ('content-length', str(len(body))),
+                        ],
+                    )
+                    h2.send_data(event.stream_id, body, end_stream=True)
+            conn.sendall(h2.data_to_send())
+        conn.close()
+
+    def close(self):
+        """Close the server socket."""
+        self.sock.close()
+
+
+class TestHttp2Adapter:
+    """Test the TcEx Session HTTP/2 Adapter Module."""
+
+    @staticmethod
+    @pytest.fixture
+    def server():
+        """Return a local HTTP/2 server."""
+        server = H2Server()
+        yield server
+        server.close()
+
+    @staticmethod
+    def test_http2_adapter_multiplexed(server):
+        """Test concurrent signed requests are multiplexed over a single connection."""
+        adapter = Http2Adapter(http1=False)
+        session = Session()
+        session.auth = HmacAuth('123', Sensitive('secret'))
+        session.mount('http://', adapter)
+
+        # establish the connection
+        r = session.get(f'{server.url}/v3/groups', params={'resultStart': 0})
+        assert r.status_code == 200
+        assert r.http_version == 'HTTP/2'
+        assert r.json().get('path') == '/v3/groups?resultStart=0'
+        assert r.json().get('authorization').startswith('TC 123:')
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(
+                executor.map(lambda i: session.get(f'{server.url}/v3/groups/{i}'), range(16))
+            )
+        assert all(r.ok for r in responses)
+        assert len({r.json().get('stream_id') for r in responses}) == 16
+        assert server.connections == 1
+        adapter.close()
+
+    @staticmethod
+    def test_http2_adapter_retry(server):
+        """Test the retry configuration is applied to status codes and replayable bodies."""
+        session = Session()
+        session.mount(
+            'http://',
+            Http2Adapter(
+                max_retries=Retry(total=1, backoff_factor=0, status_forcelist=[500]), http1=False
+            ),
+        )
+        with pytest.raises(RetryError):
+            session.get(f'{server.url}/error')
+
+        # a seekable body is rewound and sent again
+        with pytest.raises(RetryError):
+            session.put(f'{server.url}/error', data=io.BytesIO(b'body'))
+
+        # a generator body can't be sent again, the first response is returned
+        r = session.put(f'{server.url}/error', data=(c for c in [b'a', b'b']))
+        assert r.status_code == 500
+
+    @staticmethod
+    def test_http2_adapter_stream(server):
+        """Test streamed responses can be iterated and closed."""
+        adapter = Http2Adapter(http1=False)
+        session = Session()
+        session.mount('http://', adapter)
+
+        with session.get(f'{server.url}/v3/groups', stream=True) as r:
+            assert r.status_code == 200
+            content = b''.join(r.iter_content(chunk_size=8))
+        assert json.loads(content).get('path') == '/v3/groups'
+        assert r.raw.read() == content
+        assert r.json().get('path') == '/v3/groups'
+        adapter.close()
+
+    @staticmethod
+    def test_tc_session_http2():
+        """Test the TC session mounts the HTTP/2 adapter when enabled."""
+        session = TcSession(
+            HmacAuth('123', Sensitive('secret')), 'https://tc.example.com', http2=True
+        )
+        assert isinstance(session.get_adapter('https://tc.example.com'), Http2Adapter)
+        assert session.pool_metrics is None
@@ -0,0 +1,75 @@
+"""Test the TcEx Session Pool Adapter Module."""
+# standard library
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# third-party
+import pytest
+from requests import Session
+
+# first-party
+from tcex.sessions.pool_adapter import PoolAdapter
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 request handler that keeps connections alive."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET requests."""
+        body = b'ok'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Suppress request logging."""
+
+
+class TestPoolAdapter:
+    """Test the TcEx Session Pool Adapter Module."""
+
+    @staticmethod
+    @pytest.fixture
+    def server_url():
+        """Return the URL of a local keep-alive HTTP server."""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+        server.shutdown()
+        server.server_close()
+
+    @staticmethod
+    def test_pool_adapter_metrics(server_url):
+        """Test connection reuse metrics."""
+        adapter = PoolAdapter(pool_maxsize=2, pool_block=True)
+        session = Session()
+        session.mount('http://', adapter)
+        for _ in range(3):
+            assert session.get(server_url).ok
+
+        summary = adapter.pool_metrics.summary
+        assert summary.get('checkouts') == 3
+        assert summary.get('connections_new') == 1
+        assert summary.get('connections_reused') == 2
+        assert adapter.pool_metrics.reuse_rate == pytest.approx(2 / 3)
+
+        adapter.pool_metrics.reset()
+        assert adapter.pool_metrics.summary.get('checkouts') == 0
+
+    @staticmethod
+    def test_pool_adapter_keep_alive(server_url):
+        """Test idle connections are closed after the keep-alive timeout."""
+        adapter = PoolAdapter(pool_keep_alive=0)
+        session = Session()
+        session.mount('http://', adapter)
+        for _ in range(3):
+            assert session.get(server_url).ok
+
+        summary = adapter.pool_metrics.summary
+        assert summary.get('connections_new') == 3
+        assert summary.get('connections_expired') == 2
+        assert summary.get('connections_reused') == 0
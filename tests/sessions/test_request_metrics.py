@@ -0,0 +1,87 @@
+"""Test the TcEx Session Request Metrics Module."""
+# standard library
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# third-party
+import pytest
+
+# first-party
+from tcex.sessions.external_session import ExternalSession
+from tcex.sessions.request_metrics import LatencyHistogram, RequestMetrics
+
+
+class JsonHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 request handler that returns a small JSON body."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Handle POST requests."""
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = b'{"status": "Success"}'
+        self.send_response(404 if self.path.endswith('/missing') else 201)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Suppress request logging."""
+
+
+class TestRequestMetrics:
+    """Test the TcEx Session Request Metrics Module."""
+
+    @staticmethod
+    @pytest.fixture
+    def server_url():
+        """Return the URL of a local HTTP server."""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), JsonHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+        server.shutdown()
+        server.server_close()
+
+    @staticmethod
+    def test_latency_histogram():
+        """Test the histogram percentiles."""
+        histogram = LatencyHistogram()
+        for ms in [1, 2, 3, 4, 20, 20, 20, 20, 20, 70_000]:
+            histogram.add(ms)
+        assert histogram.percentile(40) == 5
+        assert histogram.percentile(90) == 25
+        assert histogram.percentile(100) == 70_000
+
+    @staticmethod
+    def test_request_metrics(server_url):
+        """Test the per endpoint metrics recorded by the session."""
+        request_metrics = RequestMetrics()
+        request_metrics.reset()
+        events = []
+        request_metrics.add_hook(events.append)
+
+        session = ExternalSession()
+        for group_id in [1, 2, 3]:
+            session.post(f'{server_url}/v3/groups/{group_id}', data=b'12345')
+        session.post(f'{server_url}/v3/groups/missing', json={})
+
+        host = server_url.split('//')[1]
+        summary = request_metrics.summary()
+        assert summary.get('count') == 4
+        assert summary.get('errors') == 1
+
+        endpoint = summary.get('endpoints').get(f'POST {host}/v3/groups/{{id}}')
+        assert endpoint.get('count') == 3
+        assert endpoint.get('request_bytes') == 15
+        assert endpoint.get('response_bytes') == 63
+        assert endpoint.get('latency_total_ms') > 0
+        assert len(events) == 4
+        assert events[0].get('status_code') == 201
+
+        heartbeat_metrics = request_metrics.heartbeat_metrics(top=1)
+        assert heartbeat_metrics.get('HTTP Requests') == 4
+        assert 'HTTP Top 1' in heartbeat_metrics
+
+        request_metrics._hooks.clear()
+        request_metrics.reset()
@@ -0,0 +1,109 @@
+"""Test the TcEx Session Response Cache Module."""
+# standard library
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# third-party
+import pytest
+
+# first-party
+from tcex.sessions.external_session import ExternalSession
+from tcex.sessions.response_cache import ResponseCache
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 request handler that supports ETag revalidation."""
+
+    protocol_version = 'HTTP/1.1'
+    requests = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle GET requests."""
+        self.requests.append((self.path, self.headers.get('If-None-Match')))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = b'{"data": {"indicatorType": []}}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', '"v1"')
+        self.send_header('Set-Cookie', 'session=secret')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Suppress request logging."""
+
+
+class TestResponseCache:
+    """Test the TcEx Session Response Cache Module."""
+
+    @staticmethod
+    @pytest.fixture
+    def server_url():
+        """Return the URL of a local HTTP server."""
+        ETagHandler.requests = []
+        server = ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+        server.shutdown()
+        server.server_close()
+
+    @staticmethod
+    @pytest.fixture
+    def response_cache(tmp_path):
+        """Return the process wide response cache persisted to a temp directory."""
+        response_cache = ResponseCache()
+        response_cache.path = str(tmp_path)
+        yield response_cache
+        response_cache.clear()
+        response_cache.path = None
+
+    @staticmethod
+    def test_response_cache(server_url, response_cache):
+        """Test cached responses, ETag revalidation, and disk persistence."""
+        session = ExternalSession()
+        url = f'{server_url}/v2/types/indicatorTypes'
+
+        r = session.get(url, params={'a': 1}, cache_ttl=60)
+        assert r.json() == {'data': {'indicatorType': []}}
+        assert session.get(url, params={'a': 1}, cache_ttl=60).json() == r.json()
+        assert len(ETagHandler.requests) == 1
+
+        # cached responses can be streamed
+        with session.get(url, params={'a': 1}, cache_ttl=60, stream=True) as cached:
+            assert b''.join(cached.iter_content(chunk_size=8)) == r.content
+        assert len(ETagHandler.requests) == 1
+
+        # different params, different credentials, and uncached requests are sent
+        session.get(url, params={'a': 2}, cache_ttl=60)
+        session.get(url, params={'a': 1}, headers={'Authorization': 'Bearer abc'}, cache_ttl=60)
+        session.get(url, params={'a': 1})
+        assert len(ETagHandler.requests) == 4
+
+        # only the headers required to serve and revalidate the entry are persisted
+        for filename in os.listdir(response_cache.path):
+            with open(os.path.join(response_cache.path, filename), encoding='utf-8') as fh:
+                assert set(json.load(fh)['headers']) == {'Content-Type', 'ETag'}
+
+        # entries are loaded from disk (e.g., by a new App execution)
+        response_cache._entries.clear()
+        assert ExternalSession().get(url, params={'a': 1}, cache_ttl=60).json() == r.json()
+        assert len(ETagHandler.requests) == 4
+
+        # expired entries are revalidated with a conditional request
+        session.get(url, params={'a': 3}, cache_ttl=0)
+        r = session.get(url, params={'a': 3}, cache_ttl=0)
+        assert ETagHandler.requests[-2:] == [
+            ('/v2/types/indicatorTypes?a=3', None),
+            ('/v2/types/indicatorTypes?a=3', '"v1"'),
+        ]
+        assert r.status_code == 200
+        assert r.json() == {'data': {'indicatorType': []}}
@@ -0,0 +1,159 @@
+"""Test the TcEx Session Retry Policy Module."""
+# standard library
+import io
+import time
+from unittest.mock import MagicMock, patch
+
+# third-party
+import pytest
+from requests import Request, Response
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import Timeout
+
+# first-party
+from tcex.sessions.retry_policy import CircuitBreaker, CircuitBreakerOpenError, RetryPolicy
+
+
+def _response(status_code: int, headers: dict = None) -> Response:
+    """Return a response with the provided status code and headers."""
+    response = Response()
+    response.headers = headers or {}
+    response.request = Request('GET', 'https://api.example.com/v1').prepare()
+    response.status_code = status_code
+    return response
+
+
+class TestRetryPolicy:
+    """Test the TcEx Session Retry Policy Module."""
+
+    @staticmethod
+    @patch('time.sleep', MagicMock(return_value=None))
+    def test_retry_policy_retry_after():
+        """Test 429 and 503 responses are retried honoring Retry-After."""
+        responses = [_response(429, {'Retry-After': '7'}), _response(503), _response(200)]
+        policy = RetryPolicy(backoff_base=1, backoff_max=2)
+
+        response = policy.send(lambda: responses.pop(0))
+        assert response.status_code == 200
+        delays = [c.args[0] for c in time.sleep.call_args_list]  # pylint: disable=no-member
+        assert delays[0] == 7
+        assert 1 <= delays[1] <= 2
+
+        # HTTP date values
+        response = _response(429, {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+        assert RetryPolicy.retry_after(response) == 0
+        assert RetryPolicy.retry_after(_response(429)) is None
+
+    @staticmethod
+    @patch('time.sleep', MagicMock(return_value=None))
+    def test_retry_policy_exhausted():
+        """Test the last response is returned when the retries or the budget are exhausted."""
+        calls = []
+
+        def send():
+            calls.append(1)
+            return _response(429, {'Retry-After': '10'})
+
+        assert RetryPolicy(retries=2).send(send).status_code == 429
+        assert len(calls) == 3
+
+        calls.clear()
+        assert RetryPolicy(retries=5, budget=25).send(send).status_code == 429
+        assert len(calls) == 3
+
+    @staticmethod
+    @patch('time.sleep', MagicMock(return_value=None))
+    def test_retry_policy_circuit_breaker():
+        """Test the circuit breaker opens on consecutive failures and recovers."""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+        policy = RetryPolicy(retries=0, circuit_breaker=breaker)
+
+        def fail():
+            raise RequestsConnectionError('down')
+
+        for _ in range(2):
+            with pytest.raises(RequestsConnectionError):
+                policy.send(fail)
+        assert breaker.state == 'open'
+
+        send = MagicMock(return_value=_response(200))
+        with pytest.raises(CircuitBreakerOpenError):
+            policy.send(send)
+        send.assert_not_called()
+
+        # after the recovery timeout a single trial request closes the breaker
+        with patch('time.monotonic', MagicMock(return_value=time.monotonic() + 31)):
+            assert breaker.state == 'half-open'
+            assert policy.send(send).status_code == 200
+        assert breaker.state == 'closed'
+
+        # 429 responses do not open the breaker
+        assert policy.send(lambda: _response(429)).status_code == 429
+        assert policy.send(lambda: _response(429)).status_code == 429
+        assert breaker.state == 'closed'
+
+    @staticmethod
+    def test_retry_policy_circuit_breaker_trial_exception():
+        """Test a trial request that raises a non connection error reopens the breaker."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        policy = RetryPolicy(retries=0, circuit_breaker=breaker)
+
+        def timeout():
+            raise Timeout('read timeout')
+
+        with pytest.raises(Timeout):
+            policy.send(timeout)
+        assert breaker.state == 'open'
+
+        # the failed trial request opens the breaker again (instead of staying half-open)
+        now = time.monotonic()
+        with patch('time.monotonic', MagicMock(return_value=now + 31)):
+            with pytest.raises(Timeout):
+                policy.send(timeout)
+        assert breaker.state == 'open'
+
+        # after the next recovery timeout another trial request is allowed
+        with patch('time.monotonic', MagicMock(return_value=now + 62)):
+            assert policy.send(lambda: _response(200)).status_code == 200
+        assert breaker.state == 'closed'
+
+    @staticmethod
+    @patch('time.sleep', MagicMock(return_value=None))
+    def test_retry_policy_body():
+        """Test seekable bodies are rewound and bodies that can't be replayed are not retried."""
+        policy = RetryPolicy(retries=2)
+
+        def sender(body):
+            sent = []
+            responses = [_response(429), _response(200)]
+
+            def send():
+                sent.append(body.read() if hasattr(body, 'read') else b''.join(body))
+                return responses.pop(0)
+
+            return send, sent
+
+        # a seekable stream is rewound before the retry
+        body = io.BytesIO(b'file content')
+        send, sent = sender(body)
+        assert policy.send(send, body=body).status_code == 200
+        assert sent == [b'file content', b'file content']
+
+        # a generator can't be sent again, the first response is returned
+        body = (c for c in [b'a', b'b'])
+        send, sent = sender(body)
+        assert policy.send(send, body=body).status_code == 429
+        assert sent == [b'ab']
+
+    @staticmethod
+    def test_retry_policy_keyboard_interrupt():
+        """Test KeyboardInterrupt is not recorded as a circuit breaker failure."""
+        breaker = CircuitBreaker(failure_threshold=1)
+        policy = RetryPolicy(retries=0, circuit_breaker=breaker)
+
+        def interrupt():
+            raise KeyboardInterrupt()
+
+        with pytest.raises(KeyboardInterrupt):
+            policy.send(interrupt)
+        assert breaker.state == 'closed'
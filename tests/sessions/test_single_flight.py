@@ -0,0 +1,100 @@
+"""Test the TcEx Session Single Flight Module."""
+# standard library
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# third-party
+from requests import Response
+
+# first-party
+from tcex.input.field_types.sensitive import Sensitive
+from tcex.sessions.auth.hmac_auth import HmacAuth
+from tcex.sessions.auth.token_auth import TokenAuth
+from tcex.sessions.single_flight import SingleFlight
+
+
+def _sender(release: threading.Event, exception: Exception = None):
+    """Return a send callable that blocks until released and the list of calls."""
+    calls = []
+
+    def send() -> Response:
+        calls.append(1)
+        release.wait(5)
+        if exception is not None:
+            raise exception
+        response = Response()
+        response._content = b'{"data": "value"}'
+        response.status_code = 200
+        return response
+
+    return send, calls
+
+
+def _run(single_flight: SingleFlight, url: str, exception: Exception = None, auths: list = None):
+    """Send 8 concurrent identical requests, releasing the sender once all threads are waiting."""
+    auths = auths or [None] * 8
+    release = threading.Event()
+    send, calls = _sender(release, exception)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(single_flight.send, send, 'GET', url, {'a': 1}, None, auth)
+            for auth in auths
+        ]
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            waiters = sum(c.waiters for c in list(single_flight._calls.values()))
+            if len(calls) + waiters == 8:
+                break
+            time.sleep(0.01)
+        release.set()
+        return [f.exception() or f.result() for f in futures], calls
+
+
+class TestSingleFlight:
+    """Test the TcEx Session Single Flight Module."""
+
+    @staticmethod
+    def test_single_flight_coalesced():
+        """Test concurrent identical requests share one request."""
+        single_flight = SingleFlight([r'/internal/variable/runtime/'])
+        results, calls = _run(
+            single_flight, 'https://tc.example.com/internal/variable/runtime/text/key'
+        )
+        assert len(calls) == 1
+        assert all(r.json() == {'data': 'value'} for r in results)
+        assert len({id(r) for r in results}) == 8  # each caller gets its own response copy
+        assert not single_flight._calls
+
+    @staticmethod
+    def test_single_flight_exception():
+        """Test the exception of the in-flight request is raised for all callers."""
+        single_flight = SingleFlight([r'/v2/types/'])
+        results, calls = _run(
+            single_flight, 'https://tc.example.com/v2/types/x', RuntimeError('failed')
+        )
+        assert len(calls) == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @staticmethod
+    def test_single_flight_no_match():
+        """Test requests that don't match a pattern are not coalesced."""
+        single_flight = SingleFlight([r'/v2/types/'])
+        _, calls = _run(single_flight, 'https://tc.example.com/v3/groups')
+        assert len(calls) == 8
+        assert not single_flight.match('POST', 'https://tc.example.com/v2/types/x')
+
+    @staticmethod
+    def test_single_flight_identity():
+        """Test requests sent with different credentials are not coalesced."""
+        single_flight = SingleFlight([r'/v3/security/owners'])
+        auths = [TokenAuth(Sensitive('token-1')), TokenAuth(Sensitive('token-2'))] * 4
+        results, calls = _run(
+            single_flight, 'https://tc.example.com/v3/security/owners', auths=auths
+        )
+        assert len(calls) == 2
+        assert all(r.json() == {'data': 'value'} for r in results)
+
+        assert SingleFlight.identity(HmacAuth('123', Sensitive('secret'))) == 'hmac:123'
+        assert SingleFlight.identity(None, {'Authorization': 'Bearer abc'}) == 'Bearer abc'
+        assert SingleFlight.identity() is None
@@ -0,0 +1,100 @@
+"""Test the TokenBucketRateLimitHandler"""
+# standard library
+import time
+from unittest.mock import MagicMock, patch
+
+# third-party
+import pytest
+from requests import Request, Response
+
+# first-party
+from tcex.sessions.token_bucket_rate_limit_handler import TokenBucket, TokenBucketRateLimitHandler
+
+
+class TestTokenBucketRateLimitHandler:
+    """Test the TokenBucketRateLimitHandler"""
+
+    @staticmethod
+    def _response(url: str, status_code: int = 200, headers: dict = None) -> Response:
+        """Return a response for a request to the provided URL."""
+        response = Response()
+        response.headers = headers or {}
+        response.request = Request('GET', url).prepare()
+        response.status_code = status_code
+        return response
+
+    @staticmethod
+    @patch('time.monotonic', MagicMock(return_value=100))
+    def test_token_bucket_acquire():
+        """Test requests are paced at the bucket rate once the burst is used."""
+        bucket = TokenBucket(rate=10, capacity=2)
+        assert [bucket.acquire() for _ in range(4)] == pytest.approx([0, 0, 0.1, 0.2])
+
+        # unlimited until calibrated
+        assert TokenBucket().acquire() == 0
+
+    @staticmethod
+    @patch('time.monotonic', MagicMock(return_value=100))
+    def test_token_bucket_calibrate():
+        """Test the bucket rate is calibrated from the remaining requests and reset."""
+        bucket = TokenBucket(capacity=5)
+        bucket.calibrate(remaining=20, reset=10)
+        assert bucket.rate == pytest.approx(2)
+
+        # the window is exhausted, the next request waits for the reset
+        bucket.calibrate(remaining=0, reset=10)
+        assert bucket.acquire() == pytest.approx(10)
+
+        # the configured rate is the upper bound
+        bucket = TokenBucket(rate=1)
+        bucket.calibrate(remaining=100, reset=10)
+        assert bucket.rate == 1
+
+    @staticmethod
+    @patch('time.sleep', MagicMock(return_value=None))
+    @patch('time.time', MagicMock(return_value=1600283000))
+    @patch('time.monotonic', MagicMock(return_value=100))
+    def test_token_bucket_rate_limit_handler():
+        """Test bucket routing and calibration from the response headers."""
+        handler = TokenBucketRateLimitHandler()
+        search = handler.add_bucket('search', rate=5, host='api.example.com', path='/v1/search')
+
+        url = 'https://api.example.com/v1/search?q=1'
+        assert handler.bucket(Request('GET', url).prepare()) is search
+        other = handler.bucket(Request('GET', 'https://api.example.com/v1/other').prepare())
+        assert other is handler.buckets.get('api.example.com')
+        assert other is not search
+
+        handler.post_send(
+            TestTokenBucketRateLimitHandler._response(
+                'https://api.example.com/v1/other',
+                headers={'X-RateLimit-Remaining': 0, 'X-RateLimit-Reset': 1600283030},
+            )
+        )
+        assert handler.last_limit_remaining_value == 0
+        handler.pre_send(Request('GET', 'https://api.example.com/v1/other').prepare())
+        time.sleep.assert_called_once_with(pytest.approx(30))  # pylint: disable=no-member
+
+        # 429 responses pause the bucket for the Retry-After value
+        handler.post_send(
+            TestTokenBucketRateLimitHandler._response(url, 429, headers={'Retry-After': '7'})
+        )
+        assert search.acquire() == pytest.approx(7)
+
+    @staticmethod
+    @patch('time.time', MagicMock(return_value=1_600_283_000))
+    @pytest.mark.parametrize(
+        'value,expected',
+        [
+            ('3600', 3600),
+            ('0', 0),
+            ('1600286600', 3600),  # epoch timestamp
+            ('1600000000', 0),  # epoch timestamp in the past
+            ('Wed, 16 Sep 2020 20:03:20 GMT', 3600),
+            ('invalid', 0),
+        ],
+    )
+    def test_token_bucket_reset_seconds(value: str, expected: float):
+        """Test delta seconds, epoch timestamps, and HTTP dates reset values."""
+        handler = TokenBucketRateLimitHandler()
+        assert handler._reset_seconds(value) == pytest.approx(expected)
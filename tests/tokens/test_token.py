@@ -1,5 +1,6 @@
 """Test the TcEx Batch Module."""
 # standard library
+import logging
 import threading
 import time
 
@@ -10,17 +11,20 @@ import pytest
 from tcex.backports import cached_property
 from tcex.input.field_types import Sensitive
 from tcex.pleb.scoped_property import scoped_property
+from tcex.tokens import Tokens
 
 
-def await_token_renewal_cycle(token_service):
-    """Await for a token renewal cycle to take place and finish"""
-    # wait until renewal monitor has enabled the barrier (is_set == False), which
-    # means that renewal monitor has started renewal process
-    while token_service.barrier.is_set():
-        time.sleep(1)
+def await_token_renewal(token_service, key):
+    """Await for the renewal of the token for the provided key to take place and finish"""
+    # wait until renewal monitor has fenced the key, which means that renewal monitor has
+    # started renewal process for the token
+    fence = None
+    while fence is None:
+        fence = getattr(token_service, '_fences').get(key)
+        time.sleep(0.1)
 
-    # wait until renewal monitor has disabled the barrier, meaning that renewal is done
-    token_service.barrier.wait()
+    # wait until renewal monitor has released the fence, meaning that renewal is done
+    fence.wait()
 
 
 # pylint: disable=no-self-argument, no-self-use
@@ -120,20 +124,15 @@ class TestToken:
 
         # get clean instance of tcex
         tcex = service_app().tcex
-        # Initialize Tokens module, which starts token renewal monitor and immediately kicks off
-        # first renewal cycle. Wait until initial cycle is finished before staging test token
-
-        await_token_renewal_cycle(tcex.token)
 
         token = 'JOB:3:ksKNpI:1567352558827:220:null:YPSaVFIGVbIkt1cfi4DzoG2bjWwsLBfwv9fJbeEx68A='
         # register expired token
         tcex.token.register_token(
             key=self.thread_name,
             token=token,
-            # expire token immediately. Note this by itself does not expire the token. This merely
-            # tells the renewal monitor that the token is expired. The token used in this test is
-            # a very old token which is expired.
-            expires=int(time.time()) - 999,
+            # the token used in this test is a very old token which is expired, but the renewal
+            # monitor is told that the token is not yet due for renewal.
+            expires=int(time.time()) + tcex.token.token_window + 60,
         )
 
         # ensure token was registered
@@ -156,10 +155,6 @@ class TestToken:
         # get clean instance of tcex
         tcex = service_app().tcex
 
-        # Initialize Tokens module, which starts token renewal monitor and immediately kicks off
-        # first renewal cycle. Wait until initial cycle is finished before staging test token
-        await_token_renewal_cycle(tcex.token)
-
         token = 'JOB:3:ksKNpI:1567352558827:220:null:YPSaVFIGVbIkt1cfi4DzoG2bjWwsLBfwv9fJbeEx68A='
         # register expired token
         tcex.token.register_token(
@@ -171,11 +166,11 @@ class TestToken:
             expires=int(time.time()) - 999,
         )
 
-        # ensure token was registered
-        assert tcex.token.token.value == token
+        # ensure token was registered (without waiting on the renewal in progress)
+        assert tcex.token.token_map[self.thread_name]['token'].value == token
 
         # await a renewal attempt. Should fail, as token is very old and cannot be renewed
-        await_token_renewal_cycle(tcex.token)
+        await_token_renewal(tcex.token, self.thread_name)
 
         # renewal failed, token removed from tokens module
         assert tcex.token.token is None
@@ -194,10 +189,6 @@ class TestToken:
         # get clean instance of tcex
         tcex = service_app().tcex
 
-        # Initialize Tokens module, which starts token renewal monitor and immediately kicks off
-        # first renewal cycle. Wait until initial cycle is finished before staging test token
-        await_token_renewal_cycle(tcex.token)
-
         # get token from fixture
         tc_token = service_app().service_token
         # Token itself is valid, but we tell tokens.py that it is now expired
@@ -205,10 +196,10 @@ class TestToken:
 
         tcex.token.register_token(key=self.thread_name, token=tc_token, expires=tc_token_expires)
 
-        # "expired" token registered successfully.
-        assert tcex.token.token.value == tc_token
+        # "expired" token registered successfully (without waiting on the renewal in progress).
+        assert tcex.token.token_map[self.thread_name]['token'].value == tc_token
 
-        await_token_renewal_cycle(tcex.token)
+        await_token_renewal(tcex.token, self.thread_name)
 
         assert tcex.token.token.value != tc_token, 'Token not was not renewed'
         assert tcex.session_tc.get('/v2/owners').ok, 'API call failed after token renewal'
@@ -226,26 +217,21 @@ class TestToken:
 
         # get clean instance of tcex
         tcex = service_app().tcex
-        # Initialize Tokens module, which starts token renewal monitor and immediately kicks off
-        # first renewal cycle. Wait until initial cycle is finished before intentionally
-        # corrupting monitor thread state. Otherwise, test executes too fast and the
-        # corrupted state is never used, as everything happens within the initial renewal cycle
-        await_token_renewal_cycle(tcex.token)
-        tc_token = service_app().service_token
-        tc_token_expires = int(time.time()) - 999
-        # stage token to give renewal monitor some work
-        tcex.token.register_token(key=self.thread_name, token=tc_token, expires=tc_token_expires)
 
         # set token_window to a value that is not an integer to cause an exception
         # within the renewal monitor on purpose
         tcex.token.token_window = 'not an integer'
 
-        # wait until renewal monitor enters a renewal cycle. Monitor should enable the barrier
-        # but the exception will cause it to exit before it disables the barrier.
-        while tcex.token.barrier.is_set():
-            time.sleep(1)
+        # stage token to give renewal monitor some work
+        tc_token = service_app().service_token
+        tc_token_expires = int(time.time()) - 999
+        tcex.token.register_token(key=self.thread_name, token=tc_token, expires=tc_token_expires)
+
+        # wait until renewal monitor exits on the exception
+        tcex.token.monitor_thread.join(timeout=30)
+        assert not tcex.token.monitor_thread.is_alive()
 
-        # attempt to retrieve token. Barrier await timeout should expire. RuntimeError expected
+        # attempt to retrieve token. Tokens are no longer renewed, RuntimeError expected
         with pytest.raises(RuntimeError):
             _ = tcex.token.token
 
@@ -276,16 +262,12 @@ class TestToken:
         # get clean instance of tcex
         tcex = service_app().tcex
 
-        # Initialize Tokens module, which starts token renewal monitor and immediately kicks off
-        # first renewal cycle. Wait until initial cycle is finished before staging test token
-        await_token_renewal_cycle(tcex.token)
-
         # get new API token
         tc_token = Sensitive(service_app().service_token)
 
-        # register new token with expiration time in the past, so that renewal monitor
-        # renews this token upon next execution of token renewal logic
-        tc_token_expires = int(time.time()) - 999
+        # register new token with an expiration time that is due for renewal in a few seconds,
+        # so that the token header is generated before the renewal monitor renews this token
+        tc_token_expires = int(time.time()) + tcex.token.token_window + 3
 
         # The goal is to prepare a token header but wait until it is no longer valid before it is
         # used. The token header is no longer valid because the renewal monitor would have
@@ -318,8 +300,8 @@ class TestToken:
                 # monitor has already renewed the staged token, which corrupts test state
                 assert tc_token.value in header, 'Original token has been unexpectedly renewed.'
 
-                # await for renewal cycle, which should renew the token
-                await_token_renewal_cycle(tcex.token)
+                # await for renewal, which should renew the token
+                await_token_renewal(tcex.token, threading.current_thread().name)
 
                 # ensure token has been renewed
                 assert tc_token.value != tcex.token.token.value, 'Original token not renewed'
@@ -336,8 +318,8 @@ class TestToken:
 
         monkeypatch.setattr(tcex.session_tc.auth, '_token_header', mock_token_header)
 
-        # register "expired" token for the current thread. Note: Token is actually good,
-        # but we are setting a bad expiration time on the token service so that the
+        # register "expiring" token for the current thread. Note: Token is actually good,
+        # but we are setting a near expiration time on the token service so that the
         # renewal monitor knows to renew it.
         tcex.token.register_token(
             key=threading.current_thread().name, token=tc_token, expires=tc_token_expires
@@ -350,3 +332,48 @@ class TestToken:
             assert False, f'API call failed {r.text}'
 
         tcex.token.unregister_token(threading.current_thread().name)
+
+    @staticmethod
+    def test_token_renewal_fences_key(monkeypatch):
+        """Test that only the key being renewed is blocked during renewal.
+
+        Args:
+            monkeypatch (_pytest.monkeypatch.MonkeyPatch): Pytest monkeypatch
+        """
+        monkeypatch.setattr(logging.getLogger('tcex'), 'trace', lambda *args: None, raising=False)
+        tokens = Tokens('https://localhost/api')
+        tokens.token_renewal_buffer_time = 1
+
+        def renew_token(token):
+            """Return renewed token data."""
+            return {'apiToken': f'renewed-{token.value}', 'apiTokenExpires': 4_000_000_000}
+
+        monkeypatch.setattr(tokens, 'renew_token', renew_token)
+
+        # a token that is not due for renewal and a token that is due for renewal
+        tokens.register_token(key='pytest-fresh', token='fresh', expires=4_000_000_000)
+        tokens.register_token(key='MainThread', token='expiring', expires=int(time.time()))
+        fence = None
+        while fence is None:
+            fence = getattr(tokens, '_fences').get('MainThread')
+            time.sleep(0.05)
+
+        # the token for the key that is not being renewed is available immediately
+        results = {}
+
+        def read_token():
+            """Read the token for the fresh key."""
+            results['token'] = tokens.token.value
+            results['fenced'] = not fence.is_set()
+
+        thread = threading.Thread(name='pytest-fresh', target=read_token)
+        thread.start()
+        thread.join()
+        assert results == {'token': 'fresh', 'fenced': True}
+
+        # the token for the key being renewed is only returned after renewal
+        assert threading.current_thread().name == 'MainThread'
+        assert tokens.token.value == 'renewed-expiring'
+        assert tokens.token_expires == 4_000_000_000
+
+        tokens.shutdown = True